@@ -0,0 +1,57 @@
+#!/bin/bash
+
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This simulation compares the d-choices garbage collector (random sampling of d blocks) with the exhaustive simple
+garbage collector, on the same NAND geometries of the nand_parameters_test simulation. Write policy is default.
+"""
+
+# IMPORTS
+from simulator.Simulation import Simulation, SIM_SAMPLING_HOST_WRITE
+from simulator.NAND.NANDFactory import get_instance, GARBAGECOLLECTOR_SIMPLE, GARBAGECOLLECTOR_DCHOICES
+
+
+def main():
+    # create the simulation
+    demo = Simulation(simulation_name="dchoices_gc_test",
+                      sample_size=10 ** 5, sampling_type=SIM_SAMPLING_HOST_WRITE)
+    demo.init_simulation(base_path="./simulations/RESULTS/")
+
+    # create various disks with different gc parameters
+    for name, blocks, pages in (
+            # the size is kept constant (128 MiB)
+            ("2x16384", 2, 16384),  # 128 MiB
+            ("16x2048", 16, 2048),  # 128 MiB
+            ("32x1024", 32, 1024),  # 128 MiB
+            ("64x512", 64, 512),  # 128 MiB
+            ("128x256", 128, 256),  # 128 MiB
+            ("256x128", 256, 128),  # original parameters (128 MiB)
+            ("512x64", 512, 64),  # 128 MiB
+            ("1024x32", 1024, 32)):  # 128 MiB
+        # the reference: every block is checked
+        demo.add_disk(name + "_simple", get_instance(garbagecollector=GARBAGECOLLECTOR_SIMPLE,
+                                                     total_blocks=blocks, pages_per_block=pages, trusted=True))
+
+        # d random blocks are checked.
+        # The simple gc never updates its last run time: after the first mintime it's always executed, so here the
+        # mintime is zero (the same dirtiness of the simple gc default parameters)
+        for d in (2, 8):
+            demo.add_disk("{}_d{}".format(name, d), get_instance(garbagecollector=GARBAGECOLLECTOR_DCHOICES,
+                                                                 total_blocks=blocks, pages_per_block=pages,
+                                                                 gc_params={'mintime': 0,
+                                                                            'dirtiness': '0.4',
+                                                                            'choices': d,
+                                                                            'seed': 0}, trusted=True))
+
+    # run the simulation
+    demo.run()
+
+#
+# MAIN ENTRY POINT
+#
+if __name__ == "__main__":
+    # execute only if run as a script
+    main()
@@ -22,11 +22,12 @@ def main():
     demo.init_simulation(base_path="./simulations/RESULTS/")
 
     # create the disks and attach to the simulation
-    demo.add_disk("base", get_instance())
+    demo.add_disk("base", get_instance(trusted=True))
     demo.add_disk("basegc", get_instance(garbagecollector=GARBAGECOLLECTOR_SIMPLE, gc_params={'mintime': 500,
-                                                                                              'dirtiness': '0.1'}))
-    demo.add_disk("wpgc", get_instance(WRITEPOLICY_INPLACE, GARBAGECOLLECTOR_SIMPLE))
-    demo.add_disk("wpnegc", get_instance(WRITEPOLICY_INPLACE_NOERASE, GARBAGECOLLECTOR_SIMPLE))
+                                                                                              'dirtiness': '0.1'},
+                                         trusted=True))
+    demo.add_disk("wpgc", get_instance(WRITEPOLICY_INPLACE, GARBAGECOLLECTOR_SIMPLE, trusted=True))
+    demo.add_disk("wpnegc", get_instance(WRITEPOLICY_INPLACE_NOERASE, GARBAGECOLLECTOR_SIMPLE, trusted=True))
 
     # run the simulation
     demo.run()
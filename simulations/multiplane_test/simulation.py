@@ -0,0 +1,41 @@
+#!/bin/bash
+
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This simulation compares the number of planes of every die (2 channels x 2 dies): the striped write frontier and the
+garbage collector relocations issue multi-plane programs, so the IOPS grow and the garbage collector pauses (gc_*
+latency columns) shrink. Write policy is log-structured (page mapping), garbage collector is greedy.
+"""
+
+# IMPORTS
+from simulator.Simulation import Simulation, SIM_SAMPLING_HOST_WRITE
+from simulator.NAND.NANDFactory import get_instance, WRITEPOLICY_LOGSTRUCTURED, GARBAGECOLLECTOR_GREEDY
+
+
+def main():
+    # create the simulation
+    demo = Simulation(simulation_name="multiplane_test",
+                      sample_size=5 * 10 ** 4, sampling_type=SIM_SAMPLING_HOST_WRITE)
+    demo.init_simulation(base_path="./simulations/RESULTS/")
+
+    # the planes of every die
+    for planes in (1, 2, 4):
+        demo.add_disk("planes_{}".format(planes),
+                      get_instance(writepolicy=WRITEPOLICY_LOGSTRUCTURED, garbagecollector=GARBAGECOLLECTOR_GREEDY,
+                                   total_blocks=1024, pages_per_block=32, over_provisioning='0.2',
+                                   gc_params={'mintime': 0, 'dirtiness': '0.1'},
+                                   channels=2, dies=2, planes=planes, latency_histograms=True, trusted=True),
+                      precondition={'valid': 1, 'overwrites': 40000, 'seed': 1})
+
+    # run the simulation
+    demo.run()
+
+#
+# MAIN ENTRY POINT
+#
+if __name__ == "__main__":
+    # execute only if run as a script
+    main()
@@ -34,7 +34,7 @@ def main():
             # ("4096x8", 4096, 8),  # 128 MiB Simulation too expensive (anyway no improvements in results)
             # ("16384x2", 16384, 2),  # 128 MiB Simulation too expensive (anyway no improvements in results)
         demo.add_disk(name, get_instance(garbagecollector=GARBAGECOLLECTOR_SIMPLE,
-                                         total_blocks=blocks, pages_per_block=pages))
+                                         total_blocks=blocks, pages_per_block=pages, trusted=True))
 
     # run the simulation
     demo.run()
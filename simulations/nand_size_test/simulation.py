@@ -7,11 +7,13 @@
 """
 This simulation evaluates the different performances varying the NAND total size, keeping the same
 write policy (default) and simple gc and a ratio of 2:1 between blocks and page per blocks.
+The terabyte-class disks have a memory mapped FTL and the greedy gc, which never scans the whole disk.
 """
 
 # IMPORTS
+from shutil import rmtree
 from simulator.Simulation import Simulation, SIM_SAMPLING_HOST_WRITE
-from simulator.NAND.NANDFactory import get_instance, GARBAGECOLLECTOR_SIMPLE
+from simulator.NAND.NANDFactory import get_instance, GARBAGECOLLECTOR_SIMPLE, GARBAGECOLLECTOR_GREEDY
 
 
 def main():
@@ -29,7 +31,18 @@ def main():
             ("8G", 2048, 1024),  # 8 GiB
             ):
         demo.add_disk(name, get_instance(garbagecollector=GARBAGECOLLECTOR_SIMPLE,
-                                         total_blocks=blocks, pages_per_block=pages))
+                                         total_blocks=blocks, pages_per_block=pages, trusted=True))
+
+    for name, blocks, pages in (
+            # Terabyte-class
+            ("1T", 2 ** 20, 256),  # 1 TiB
+            ("4T", 2 ** 21, 512),  # 4 TiB
+            ):
+        # a new FTL every run (an existing directory would be restored)
+        ftl_path = demo.sim_path.joinpath(name + "_ftl")
+        rmtree(str(ftl_path), ignore_errors=True)
+        demo.add_disk(name, get_instance(garbagecollector=GARBAGECOLLECTOR_GREEDY,
+                                         total_blocks=blocks, pages_per_block=pages, ftl_path=ftl_path, trusted=True))
 
     # run the simulation
     demo.run()
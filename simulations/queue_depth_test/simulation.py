@@ -0,0 +1,47 @@
+#!/bin/bash
+
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This simulation compares the host queue depths of a parallel disk (4 channels x 2 dies): with a deeper queue the
+requests overlap on the dies, so the IOPS grow up to the disk parallelism while the latency of a request grows with
+the queue (the latency percentiles show the garbage collector stalls). Write policy is log-structured (page mapping),
+garbage collector is greedy.
+The queue depths are compared with a closed loop host (a new request as soon as one completes) and with an open loop
+host (Poisson arrivals at about 80% of the peak IOPS, as fio with a rate limit). The throughput against the queue depth
+is in queue_depth.csv.
+"""
+
+# IMPORTS
+from simulator.Simulation import Simulation, SIM_SAMPLING_HOST_WRITE
+from simulator.NAND.NANDFactory import get_instance, WRITEPOLICY_LOGSTRUCTURED, GARBAGECOLLECTOR_GREEDY
+
+
+def main():
+    # the closed loop host, then the open loop host (requests per second)
+    for name, arrival_rate in (("queue_depth_test", None), ("queue_depth_test_open", 1700)):
+        # create the simulation
+        demo = Simulation(simulation_name=name, sample_size=5 * 10 ** 4, sampling_type=SIM_SAMPLING_HOST_WRITE,
+                          arrival_rate=arrival_rate)
+        demo.init_simulation(base_path="./simulations/RESULTS/")
+
+        # the queue depth (outstanding requests)
+        for depth in (1, 2, 4, 8, 16, 32, 64):
+            demo.add_disk("qd_{}".format(depth),
+                          get_instance(writepolicy=WRITEPOLICY_LOGSTRUCTURED, garbagecollector=GARBAGECOLLECTOR_GREEDY,
+                                       total_blocks=1024, pages_per_block=32, over_provisioning='0.2',
+                                       gc_params={'mintime': 0, 'dirtiness': '0.1'},
+                                       channels=4, dies=2, queue_depth=depth, latency_histograms=True, trusted=True),
+                          precondition={'valid': 1, 'overwrites': 40000, 'seed': 1})
+
+        # run the simulation
+        demo.run()
+
+#
+# MAIN ENTRY POINT
+#
+if __name__ == "__main__":
+    # execute only if run as a script
+    main()
@@ -0,0 +1,42 @@
+#!/bin/bash
+
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This simulation compares the controller read cache policies on a read-heavy workload: 90% of the host operations are
+reads of Zipf distributed pages, mixed with uniform random writes. Write policy is log-structured (page mapping),
+garbage collector is greedy.
+"""
+
+# IMPORTS
+from simulator.Simulation import Simulation, SIM_SAMPLING_HOST_WRITE
+from simulator.NAND.NANDFactory import get_instance, WRITEPOLICY_LOGSTRUCTURED, GARBAGECOLLECTOR_GREEDY, \
+    READCACHE_LRU, READCACHE_ARC
+
+
+def main():
+    # create the simulation
+    demo = Simulation(simulation_name="read_cache_test", sample_size=10 ** 4, sampling_type=SIM_SAMPLING_HOST_WRITE,
+                      read_ratio='0.9', read_skew=1.2)
+    demo.init_simulation(base_path="./simulations/RESULTS/")
+
+    # no cache, then a cache of 1024 pages (about 3% of the host pages) with every policy
+    for name, pages, policy in (('no_cache', 0, READCACHE_LRU), ('lru', 1024, READCACHE_LRU),
+                                ('arc', 1024, READCACHE_ARC)):
+        demo.add_disk(name,
+                      get_instance(writepolicy=WRITEPOLICY_LOGSTRUCTURED, garbagecollector=GARBAGECOLLECTOR_GREEDY,
+                                   over_provisioning='0.07', gc_params={'mintime': 0, 'dirtiness': '0.1'},
+                                   read_cache_pages=pages, read_cache_policy=policy, trusted=True),
+                      precondition={'valid': 1, 'overwrites': 10 ** 5, 'seed': 1})
+
+    # run the simulation
+    demo.run()
+
+#
+# MAIN ENTRY POINT
+#
+if __name__ == "__main__":
+    # execute only if run as a script
+    main()
@@ -32,7 +32,7 @@ def main():
             ("d100", 500, '1.0')):  # run only if a block is fully dirty
         demo.add_disk(name, get_instance(garbagecollector=GARBAGECOLLECTOR_SIMPLE,
                                          gc_params={'mintime': mintime,
-                                                    'dirtiness': dirtiness}))
+                                                    'dirtiness': dirtiness}, trusted=True))
 
     # run the simulation
     demo.run()
@@ -33,7 +33,7 @@ def main():
             ("t1000000", 1000000, '0.4')):  # 1000000 microseconds (1 second)
         demo.add_disk(name, get_instance(garbagecollector=GARBAGECOLLECTOR_SIMPLE,
                                          gc_params={'mintime': mintime,
-                                                    'dirtiness': dirtiness}))
+                                                    'dirtiness': dirtiness}, trusted=True))
 
     # run the simulation
     demo.run()
@@ -0,0 +1,45 @@
+#!/bin/bash
+
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This simulation compares workloads with an increasing fraction of trims (8 pages each) mixed with the random writes:
+the discarded pages are not copied by the garbage collector, so the write amplification drops and the IOPS grow.
+Every trim ratio is a separate simulation. Write policy is log-structured (page mapping), garbage collector is
+watermark (foreground only).
+"""
+
+# IMPORTS
+from simulator.Simulation import Simulation, SIM_SAMPLING_HOST_WRITE
+from simulator.NAND.NANDFactory import get_instance, WRITEPOLICY_LOGSTRUCTURED, GARBAGECOLLECTOR_WATERMARK
+
+
+def main():
+    # the fraction of the host operations that are trims
+    for ratio in ('0', '0.1', '0.3'):
+        # create the simulation
+        demo = Simulation(simulation_name="trim_test_{}".format(ratio.replace('.', '')),
+                          sample_size=10 ** 5, sampling_type=SIM_SAMPLING_HOST_WRITE,
+                          trim_ratio=ratio, trim_size=8)
+        demo.init_simulation(base_path="./simulations/RESULTS/")
+
+        # over provisioning of 7% and 20%
+        for op in ('0.07', '0.2'):
+            demo.add_disk("op_{}".format(op.replace('.', '')),
+                          get_instance(writepolicy=WRITEPOLICY_LOGSTRUCTURED,
+                                       garbagecollector=GARBAGECOLLECTOR_WATERMARK, over_provisioning=op,
+                                       gc_params={'low': 2, 'high': 4, 'interval': None, 'dirtiness': '0.4'},
+                                       trusted=True),
+                          precondition={'valid': 1, 'overwrites': 10 ** 5, 'seed': 1})
+
+        # run the simulation
+        demo.run()
+
+#
+# MAIN ENTRY POINT
+#
+if __name__ == "__main__":
+    # execute only if run as a script
+    main()
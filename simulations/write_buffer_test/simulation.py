@@ -0,0 +1,43 @@
+#!/bin/bash
+
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This simulation compares the in place write policy with and without a controller write buffer (LRU and FIFO flush
+policies): the buffered updates of a block are merged in a single block rewrite. Garbage collector is simple.
+"""
+
+# IMPORTS
+from simulator.Simulation import Simulation, SIM_SAMPLING_HOST_WRITE
+from simulator.NAND.NANDFactory import get_instance, WRITEPOLICY_INPLACE, GARBAGECOLLECTOR_SIMPLE, \
+    WRITEBUFFER_LRU, WRITEBUFFER_FIFO
+
+
+def main():
+    # create the simulation
+    demo = Simulation(simulation_name="write_buffer_test",
+                      sample_size=10 ** 5, sampling_type=SIM_SAMPLING_HOST_WRITE)
+    demo.init_simulation(base_path="./simulations/RESULTS/")
+
+    # the reference: no write buffer
+    demo.add_disk("none", get_instance(writepolicy=WRITEPOLICY_INPLACE, garbagecollector=GARBAGECOLLECTOR_SIMPLE,
+                                       trusted=True))
+
+    # the buffer size (pages) and the flush policy
+    for pages in (128, 1024, 8192):
+        for policy in (WRITEBUFFER_LRU, WRITEBUFFER_FIFO):
+            demo.add_disk("{}_{}".format(policy.lower(), pages),
+                          get_instance(writepolicy=WRITEPOLICY_INPLACE, garbagecollector=GARBAGECOLLECTOR_SIMPLE,
+                                       write_buffer_pages=pages, write_buffer_policy=policy, trusted=True))
+
+    # run the simulation
+    demo.run()
+
+#
+# MAIN ENTRY POINT
+#
+if __name__ == "__main__":
+    # execute only if run as a script
+    main()
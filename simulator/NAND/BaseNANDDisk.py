@@ -7,10 +7,15 @@ This is the base class to handle a single NAND cell in a very naive and basic im
 """
 
 # IMPORTS
-from decimal import Decimal, getcontext
+from decimal import Decimal, getcontext, ROUND_CEILING
+from itertools import repeat
+import numpy as np
 from simulator.NAND.NANDInterface import NANDInterface
-from simulator.NAND.common import PAGE_EMPTY, PAGE_IN_USE, PAGE_DIRTY, DECIMAL_PRECISION, bytes_to_mib, pages_to_mib, \
-    OPERATION_SUCCESS, OPERATION_FAILED_DIRTY, OPERATION_FAILED_DISKFULL
+from simulator.NAND.FTLState import FTLState
+from simulator.NAND.common import PAGE_EMPTY_CODE, PAGE_IN_USE_CODE, PAGE_DIRTY_CODE, DECIMAL_PRECISION, \
+    bytes_to_mib, pages_to_mib, OPERATION_SUCCESS, OPERATION_FAILED_DIRTY, OPERATION_FAILED_DISKFULL, \
+    OPERATION_STATUS_TO_CODE, microseconds_to_seconds, compute_write_amplification, compute_iops, compute_bandwidth, \
+    WEARLEVELING_NONE, WEARLEVELING_STATIC
 from simulator.NAND.common import get_quantized_decimal as qd, check_block, check_page
 from simulator.NAND.common import get_integer_decimal as qz
 
@@ -21,11 +26,35 @@ class BaseNANDDisk(NANDInterface):
     This class ...
     """
 
+    _STATE_ATTRIBUTES = ('_elapsed_time', '_host_page_write_request', '_page_write_executed', '_page_write_failed',
+                         '_host_page_read_request', '_page_read_executed', '_block_erase_executed', '_gc_forced_count',
+                         '_open_block', '_wear_leveling_moves', '_host_page_trim_request')
+    """ The integer attributes saved by save_state together with the FTL. Every write policy, garbage collector
+        or component can define its own _STATE_ATTRIBUTES.
+    """
+
+    queue_depth = None
+    """ The maximum number of outstanding host requests, None for the synchronous host interface (see
+        ComponentHostQueue).
+    """
+
     # CONSTRUCTOR
     def __init__(self, total_blocks=256, pages_per_block=128, page_size=4096,
-                 write_page_time=40, read_page_time=20, erase_block_time=1500):
+                 write_page_time=40, read_page_time=20, erase_block_time=1500, over_provisioning=None,
+                 ftl_path=None, wear_leveling=WEARLEVELING_NONE, wear_leveling_threshold=32, channels=1, dies=1,
+                 planes=1, transfer_page_time=0):
         """
 
+        :param over_provisioning: if not None, enable the page mapping mode (see self.page_mapping) reserving
+                                  this fraction of the blocks as spare (not addressable by the host).
+        :param ftl_path: if not None, the directory of the memory mapped FTL (see FTLState.path). If the directory
+                         contains a checkpoint of a disk with the same geometry, the disk state is restored.
+        :param wear_leveling: the wear leveling mode (see self.wear_leveling).
+        :param wear_leveling_threshold: the erase count gap of the static wear leveling.
+        :param channels: the number of channels (see self.channels).
+        :param dies: the number of dies of every channel.
+        :param planes: the number of planes of every die.
+        :param transfer_page_time: the time to transfer a page on a channel.
         :return:
         """
         super().__init__()
@@ -79,6 +108,84 @@ class BaseNANDDisk(NANDInterface):
             This is an integer value. Must be greater than zero.
         """
 
+        self.transfer_page_time = transfer_page_time
+        """ The time to transfer a single page between the controller and a die on its channel in [microseconds].
+            This is an integer value, zero if the transfer time is included in the read and write times.
+        """
+
+        # PARALLELISM
+        self.channels = channels
+        """ The number of channels. The block b is on the die b % self.total_dies, the die d is on the channel
+            d % self.channels (see ComponentTimeline).
+            This is an integer value. Must be greater than zero.
+        """
+
+        self.dies_per_channel = dies
+        """ The number of dies of every channel.
+            This is an integer value. Must be greater than zero.
+        """
+
+        self.planes_per_die = planes
+        """ The number of planes of every die (see ComponentTimeline.charge_operation).
+            This is an integer value. Must be greater than zero.
+        """
+
+        self.total_dies = self.channels * self.dies_per_channel
+        """ The total number of dies.
+        """
+
+        self.total_planes = self.total_dies * self.planes_per_die
+        """ The total number of planes: the block b is on the plane b % self.total_planes.
+        """
+
+        if self.channels < 1 or self.dies_per_channel < 1 or self.planes_per_die < 1:
+            raise ValueError("Invalid parallelism: at least one channel, one die and one plane needed.")
+
+        # PAGE MAPPING
+        self.page_mapping = over_provisioning is not None
+        """ If True the host addresses are logical and mapped to the physical pages by the FTL.
+            If False the host addresses are the physical pages.
+        """
+
+        self.over_provisioning = Decimal(over_provisioning) if self.page_mapping else Decimal('0')
+        """ The fraction of blocks reserved as spare area in page mapping mode.
+            It's a Decimal value, must be greater than 0 and less than 1.
+        """
+
+        self.host_blocks = self.total_blocks
+        """ The number of blocks addressable by the host.
+        """
+
+        self.spare_blocks = 0
+        """ The number of blocks not addressable by the host (the over provisioning).
+        """
+
+        if self.page_mapping:
+            self.spare_blocks = int((self.over_provisioning * self.total_blocks).to_integral_value(
+                rounding=ROUND_CEILING))
+            if self.spare_blocks < 1 or self.spare_blocks >= self.total_blocks:
+                raise ValueError("Invalid over provisioning: at least one spare block and one host block needed.")
+            self.host_blocks = self.total_blocks - self.spare_blocks
+
+            # the open block of every plane can hold up to a block of empty pages (see
+            # WritePolicyInterface.get_write_frontier): with one more spare block the gc always finds a dirty page
+            if self.spare_blocks < self.total_planes + 1:
+                raise ValueError("Invalid over provisioning: at least one spare block for every plane plus one "
+                                 "needed.")
+
+        # WEAR LEVELING
+        self.wear_leveling = wear_leveling
+        """ The wear leveling mode (see WEARLEVELING_* in common):
+                none:    the first fully erased block is used;
+                dynamic: the fully erased block with the lowest erase count is used;
+                static:  as dynamic, and the cold data is moved in page mapping mode (see run_static_wear_leveling).
+        """
+
+        self.wear_leveling_threshold = wear_leveling_threshold
+        """ The maximum gap between the highest erase count and the lowest one before moving cold data.
+            This is an integer value greater than zero.
+        """
+
         # INTERNAL STATISTICS
         self._elapsed_time = 0
         """ Keep track of the total elapsed time for the requested operations [microseconds].
@@ -110,6 +217,11 @@ class BaseNANDDisk(NANDInterface):
             This is an integer value.
         """
 
+        self._host_page_trim_request = 0
+        """ Number of page discarded as requested by the host (see host_trim_page).
+            This is an integer value.
+        """
+
         self._block_erase_executed = 0
         """ Total number of block erase executed.
             This is an integer value.
@@ -120,30 +232,49 @@ class BaseNANDDisk(NANDInterface):
             This is an integer value.
         """
 
+        self._wear_leveling_moves = 0
+        """ Total number of blocks moved by the static wear leveling.
+            This is an integer value.
+        """
+
         # INTERNAL STATE
-        self._ftl = dict()
-        """ This is the full state of the flash memory.
-            It's an array of blocks. Every block is an array of page.
-            For every page we keep the status of the page.
-            Furthermore, every block has the following extra information:
-                empty:  total number of empty pages in the given block;
-                dirty:  total number of dirty pages in the given block.
+        self._ftl = FTLState(self.total_blocks, self.pages_per_block, ftl_path)
+        """ This is the full state of the flash memory (see FTLState).
         """
 
-        # set the decimal context
-        getcontext().prec = DECIMAL_PRECISION
+        self._open_block = -1
+        """ The write frontier: the block where the new data is appended, -1 if there is no open block.
+        """
 
-        # initialize the FTL
-        for b in range(0, self.total_blocks):
-            # for every block initialize the page structure
-            self._ftl[b] = dict()
-            for p in range(0, self.pages_per_block):
-                # for every page set the empty status
-                self._ftl[b][p] = PAGE_EMPTY
+        self._host_stream = None
+        """ The stream ID supplied by the host for the current write, None if not supplied.
+        """
 
-            # for every block initialize the internal data
-            self._ftl[b]['empty'] = self.pages_per_block  # all pages are empty
-            self._ftl[b]['dirty'] = 0  # no dirty pages at the beginning
+        self._plane_open_blocks = None
+        """ The open block of every plane with more than one plane in page mapping mode, None until the first write
+            (see WritePolicyInterface.get_write_frontier).
+        """
+
+        self._frontier_plane = -1
+        """ The plane of the last striped write (see self.total_planes).
+        """
+
+        self._wear_leveling_running = False
+        """ True while the static wear leveling is moving a block (the erases of the move don't start a new one).
+        """
+
+        self._ftl.clock = self.elapsed_time
+        if self.page_mapping:
+            self._ftl.enable_page_mapping(self.host_blocks * self.pages_per_block)
+        if self.wear_leveling != WEARLEVELING_NONE:
+            self._ftl.enable_wear_index()
+
+        # restore the attributes of a checkpoint (the FTL arrays are already restored)
+        if self._ftl.restored and self._get_checkpoint_path().exists():
+            self._load_state_attributes(self._get_checkpoint_path())
+
+        # set the decimal context
+        getcontext().prec = DECIMAL_PRECISION
 
     # METHODS
     # PYTHON UTILITIES
@@ -190,7 +321,82 @@ class BaseNANDDisk(NANDInterface):
                          qd(pages_to_mib(self._page_write_failed, self.page_size)),
                          self._gc_forced_count,
                          qd(self.elapsed_time_seconds()), qz(self.IOPS()), qd(self.bandwidth_host()),
-                         qd(self.write_amplification()))
+                         qd(self.write_amplification())) + self.get_page_mapping_description() + \
+            self.get_write_buffer_description() + self.get_wear_leveling_description() + \
+            self.get_parallelism_description() + self.get_queue_description() + self.get_latency_description() + \
+            self.get_trim_description() + self.get_read_cache_description()
+
+    def get_page_mapping_description(self):
+        """
+
+        :return: the description of the page mapping, empty if not enabled.
+        """
+        if not self.page_mapping:
+            return ""
+
+        return "Page mapping: {} host blocks, {} spare blocks (over provisioning {})\n" \
+               "".format(self.host_blocks, self.spare_blocks, self.over_provisioning)
+
+    def get_queue_description(self):
+        """
+
+        :return: the description of the host queue and of the request latencies, empty if not enabled (see
+                 ComponentHostQueue).
+        """
+        return ""
+
+    def get_trim_description(self):
+        """
+
+        :return: the description of the host trims, empty if the host never discarded a page.
+        """
+        if self._host_page_trim_request <= 0:
+            return ""
+
+        return "Host trim: {}\{} ([pages]\[MiB])\n" \
+               "".format(self._host_page_trim_request, qd(pages_to_mib(self._host_page_trim_request, self.page_size)))
+
+    def get_latency_description(self):
+        """
+
+        :return: the description of the latency histograms, empty if not enabled (see ComponentLatencyHistograms).
+        """
+        return ""
+
+    def get_parallelism_description(self):
+        """
+
+        :return: the description of the channels and dies, empty if there is no timeline (see ComponentTimeline).
+        """
+        return ""
+
+    def get_wear_leveling_description(self):
+        """
+
+        :return: the description of the wear leveling and of the erase counts, empty if not enabled.
+        """
+        if self.wear_leveling == WEARLEVELING_NONE:
+            return ""
+
+        erase_max, erase_min, erase_stddev = self._ftl.get_erase_count_stats()
+        return "Wear leveling: {} (threshold {}), moved blocks: {}\n" \
+               "Erase count max: {}, min: {}, stddev: {}\n" \
+               "".format(self.wear_leveling, self.wear_leveling_threshold, self._wear_leveling_moves,
+                         erase_max, erase_min, qd(Decimal(erase_stddev)))
+
+    def get_write_buffer_description(self):
+        """
+
+        :return: the description of the write buffer, empty if not enabled (see ComponentWriteBuffer).
+        """
+        return ""
+
+    def get_read_cache_description(self):
+        """
+
+        :return: the description of the read cache, empty if not enabled (see ComponentReadCache).
+        """
+        return ""
 
     # STATISTICAL UTILITIES
     def write_amplification(self):
@@ -198,38 +404,35 @@ class BaseNANDDisk(NANDInterface):
 
         :return:
         """
-        # avoid divide by zero errors
-        if self._host_page_write_request <= 0:
-            return Decimal('0')
+        return compute_write_amplification(self._page_write_executed, self._host_page_write_request)
 
-        return Decimal(self._page_write_executed) / Decimal(self._host_page_write_request)
+    def number_of_trimmed_pages(self):
+        """
+
+        :return: the number of pages discarded by the host (see host_trim_page).
+        """
+        return self._host_page_trim_request
 
     def number_of_empty_pages(self):
         """
 
         :return:
         """
-        tot = 0
-        for b in range(0, self.total_blocks):
-            tot += self._ftl[b]['empty']
-        return tot
+        return self._ftl.number_of_empty_pages()
 
     def number_of_dirty_pages(self):
         """
 
         :return:
         """
-        tot = 0
-        for b in range(0, self.total_blocks):
-            tot += self._ftl[b]['dirty']
-        return tot
+        return self._ftl.number_of_dirty_pages()
 
     def number_of_in_use_pages(self):
         """
 
         :return:
         """
-        return self.total_pages - (self.number_of_empty_pages() + self.number_of_dirty_pages())
+        return self._ftl.number_of_in_use_pages()
 
     def failure_rate(self):
         """
@@ -254,43 +457,103 @@ class BaseNANDDisk(NANDInterface):
 
         :return:
         """
-        return Decimal(self._elapsed_time) / Decimal(10 ** 6)
+        return microseconds_to_seconds(self._elapsed_time)
 
     def IOPS(self):
         """
 
         :return:
         """
-        # avoid divide by zero errors
-        if self._elapsed_time <= 0:
-            return Decimal('0')
-
-        ops = self._page_write_executed + self._page_read_executed
-        return Decimal(ops) / self.elapsed_time_seconds()
+        return compute_iops(self._page_write_executed + self._page_read_executed, self._elapsed_time)
 
     def bandwidth_host(self):
         """
 
         :return:
         """
-        # avoid divide by zero errors
-        if self._elapsed_time <= 0:
-            return Decimal('0')
-
-        # in MiB
-        return pages_to_mib((self._host_page_write_request + self._host_page_read_request),
-                            self.page_size) / Decimal(self.elapsed_time_seconds())
+        return compute_bandwidth(self._host_page_write_request + self._host_page_read_request,
+                                 self._elapsed_time, self.page_size)
 
     def get_stats(self):
         """
+        The raw integer counters of the disk (see the compute_* functions in common).
 
-        :return:
+        :return: a tuple with elapsed time, host write, host read, disk write, disk read, erased blocks,
+                 failures, dirty pages, followed by the extra counters (see get_extra_stats).
         """
-        return self._elapsed_time, qz(self.IOPS()), qd(self.bandwidth_host()), \
-            qd(self.write_amplification()), self._host_page_write_request, self._host_page_read_request, \
+        stats = self._elapsed_time, self._host_page_write_request, self._host_page_read_request, \
             self._page_write_executed, self._page_read_executed, self._block_erase_executed,\
             self._page_write_failed, self.number_of_dirty_pages()
 
+        extra = self.get_extra_stats()
+        if extra:
+            stats += tuple(value for name, value in extra)
+        return stats
+
+    def get_extra_stats(self):
+        """
+        The raw integer counters of the write policy and of the garbage collector (see get_write_policy_stats and
+        get_gc_stats), appended to the get_stats tuple in the same order.
+
+        :return: a list of tuples (name, value), empty if there are no extra counters.
+        """
+        return self.get_write_policy_stats() + self.get_gc_stats() + self.get_write_buffer_stats() + \
+            self.get_wear_leveling_stats() + self.get_queue_stats() + self.get_latency_stats() + \
+            self.get_multiplane_stats() + self.get_read_cache_stats()
+
+    def get_multiplane_stats(self):
+        """
+
+        :return: the multi-plane counters as a list of tuples (name, value), empty without the parallel timing model
+                 (see ComponentTimeline).
+        """
+        return []
+
+    def get_latency_stats(self):
+        """
+
+        :return: the latency percentiles as a list of tuples (name, value), empty if not enabled (see
+                 ComponentLatencyHistograms).
+        """
+        return []
+
+    def get_queue_stats(self):
+        """
+
+        :return: the counters of the host queue as a list of tuples (name, value), empty if not enabled (see
+                 ComponentHostQueue).
+        """
+        return []
+
+    def get_wear_leveling_stats(self):
+        """
+
+        :return: the erase counts as a list of tuples (name, value): erase_max, erase_min, erase_stddev (a Decimal)
+                 and wl_moves (blocks moved by the static wear leveling). Empty if not enabled.
+        """
+        if self.wear_leveling == WEARLEVELING_NONE:
+            return []
+
+        erase_max, erase_min, erase_stddev = self._ftl.get_erase_count_stats()
+        return [('erase_max', erase_max), ('erase_min', erase_min), ('erase_stddev', qd(Decimal(erase_stddev))),
+                ('wl_moves', self._wear_leveling_moves)]
+
+    def get_read_cache_stats(self):
+        """
+
+        :return: the counters of the read cache as a list of tuples (name, value), empty if not enabled (see
+                 ComponentReadCache).
+        """
+        return []
+
+    def get_write_buffer_stats(self):
+        """
+
+        :return: the counters of the write buffer as a list of tuples (name, value), empty if not enabled (see
+                 ComponentWriteBuffer).
+        """
+        return []
+
     # DISK OPERATIONS UTILITIES
     def is_write_failing(self):
         """
@@ -307,30 +570,169 @@ class BaseNANDDisk(NANDInterface):
         :return:
         """
         # first check availability
-        if self._ftl[block]['empty'] <= 0:
+        if self._ftl.empty[block] <= 0:
             raise ValueError("No empty pages available in this block.")
 
         # get the first empty page available in the provided block
-        for p in range(0, self.pages_per_block):
-            if self._ftl[block][p] == PAGE_EMPTY:
-                return p
+        p = self._ftl.find_empty_page(block)
+        if p >= 0:
+            return p
 
         # should not be reachable
         raise ValueError("No empty pages available in this block.")
 
-    def get_empty_block(self):
+    def get_empty_block(self, plane=-1):
         """
 
+        :param plane: if not negative, a block of this plane is preferred (ignored with wear leveling), see
+                      self.total_planes.
         :return:
         """
-        # get the first empty block available
-        for b in range(0, self.total_blocks):
-            if self._ftl[b]['empty'] == self.pages_per_block:
-                return True, b
-
-        # should not be reachable
+        # get the first empty block available (from the free-block pool), the least worn one with wear leveling
+        if self.wear_leveling != WEARLEVELING_NONE:
+            b = self._ftl.find_least_worn_empty_block()
+        else:
+            b = self._ftl.find_empty_block(plane, self.total_planes)
+        if b >= 0:
+            return True, b
+
+        # no empty blocks
         return False, 0
 
+    def get_frontier_page(self, reserve=0, plane=-1):
+        """
+        The next page of the write frontier: the data is appended to the open block. When the open block is full
+        a fresh block is taken from the free-block pool.
+
+        :param reserve: the number of free blocks that cannot be used to open a new block.
+        :param plane: if not negative, the new block is preferably taken from this plane (see self.total_planes).
+        :return: a tuple (res, block, page), res is False if there is no space left.
+        """
+        block = self._open_block
+        if block < 0 or self._ftl.empty[block] <= 0:
+            # open a new block
+            res, block = self.get_empty_block(plane)
+            if not res or self._ftl.free_block_count <= reserve:
+                self._open_block = -1
+                return False, 0, 0
+            self._open_block = block
+
+        return True, block, self._ftl.find_empty_page(block)
+
+    def frontier_free_pages(self):
+        """
+
+        :return: the number of pages that can be appended to the write frontiers before running out of space: the
+                 empty pages of the open blocks and of the free blocks. A frontier opens a fresh block only when its
+                 block is full, and with no free blocks left the writes go to the frontiers with empty pages (see
+                 WritePolicyInterface.get_write_frontier), so no empty page is lost.
+        """
+        # the empty pages of the open blocks (a fresh open block is still in the free-block pool)
+        pages = 0
+        for b in self.get_write_frontiers():
+            empty = int(self._ftl.empty[b]) if b >= 0 else 0
+            pages += empty if empty < self.pages_per_block else 0
+        return pages + self._ftl.free_block_count * self.pages_per_block
+
+    def relocate_block(self, block=0):
+        """
+        Page mapping garbage collection of a block: the valid pages are moved to the write frontier, then the block
+        is erased.
+
+        :param block:
+        :return: True if the block was relocated and erased.
+        """
+        if block in self.get_open_blocks():
+            return False
+
+        valid = self._ftl.get_mapped_pages(block).tolist()
+        if len(valid) > self.frontier_free_pages():
+            return False
+
+        # move the valid pages: all of them are read, then written (so the programs can be multi-plane operations)
+        lbas = self._ftl.p2l[block * self.pages_per_block + np.asarray(valid, dtype=np.int64)].tolist()
+        for p in valid:
+            self.raw_read_page(block=block, page=p)
+        for lba in lbas:
+            self.raw_write_lba(lba=lba, relocation=True)
+
+        # now the block has no valid data
+        self.raw_erase_block(block=block)
+        return True
+
+    # TIMING
+    def get_block_die(self, block=0):
+        """
+
+        :param block:
+        :return: the die of the block (see self.channels).
+        """
+        return block % self.total_dies
+
+    def get_block_plane(self, block=0):
+        """
+
+        :param block:
+        :return: the plane of the block in its die (see self.channels).
+        """
+        return (block // self.total_dies) % self.planes_per_die
+
+    def charge_operation(self, block=0, duration=0, transfer=False, multiplane=False):
+        """
+        Account the time of a flash operation on a block: the operations are serial, the elapsed time is the sum of
+        their durations (see ComponentTimeline for the parallel timing model).
+
+        :param block:
+        :param duration: the time of the operation on the die.
+        :param transfer: if True, a page is transferred on the channel (reads and writes).
+        :param multiplane: if True, the operation can be a part of a multi-plane operation (programs and erases).
+        :return:
+        """
+        if transfer:
+            duration += self.transfer_page_time
+        self._elapsed_time += duration
+
+    def charge_dram_access(self, duration=0):
+        """
+        Account the time of an access to the controller memory, ie: a read cache hit.
+
+        :param duration:
+        :return:
+        """
+        self._elapsed_time += duration
+
+    def reset_timeline(self):
+        """
+        All the dies and channels are free at the current elapsed time (see ComponentTimeline).
+
+        :return:
+        """
+        pass
+
+    def begin_request(self):
+        """
+        The start of a host request (or of a garbage collector pause), see ComponentHostRequests.
+
+        :return: the start time.
+        """
+        return self._elapsed_time
+
+    def get_request_end(self):
+        """
+
+        :return: the completion time of the last operation of the current request.
+        """
+        return self._elapsed_time
+
+    def resume_request(self, end=0):
+        """
+        Go back to a request after a nested pause, ie: a garbage collector run (see begin_request).
+
+        :param end: the completion time of the request before the pause.
+        :return:
+        """
+        pass
+
     # RAW DISK OPERATIONS
     @check_block
     @check_page
@@ -342,51 +744,30 @@ class BaseNANDDisk(NANDInterface):
         :return: True if the write is successful, false otherwise (the write is discarded)
         """
         # read the FTL to check the current status
-        s = self._ftl[block][page]
+        s = self._ftl.get_page(block, page)
 
         # if status is EMPTY => WRITE OK
-        if s == PAGE_EMPTY:
-            # change the status of this page
-            self._ftl[block][page] = PAGE_IN_USE
+        if s == PAGE_EMPTY_CODE:
+            # change the status of this page (we lost one empty page in this block)
+            self._ftl.program_page(block, page)
 
             # we need to update the statistics
-            self._ftl[block]['empty'] -= 1  # we lost one empty page in this block
-            self._elapsed_time += self.write_page_time  # time spent to write the data
+            self.charge_operation(block, self.write_page_time, True, True)  # time spent to write the data
             self._page_write_executed += 1  # one page written
             return True, OPERATION_SUCCESS
 
         # if status is IN USE => we consider a data change,
         # we use the current disk policy to find a new page to write the new data. In case of success we invalidate
         # the current page, otherwise the operation fails.
-        if s == PAGE_IN_USE:
-            # is the block full?
-            if self._ftl[block]['empty'] <= 0:
-                # yes, we need a policy to decide how to write
-                if self.full_block_write_policy(block=block, page=page):
-                    # all statistic MUST BE updated inside the policy method
-                    return True, OPERATION_SUCCESS
-                else:
-                    # we didn't found a suitable place to write the new data, the write request failed
-                    # this is a disk error: the garbage collector was unable to make room for new data
-                    self._page_write_failed += 1
-                    return False, OPERATION_FAILED_DISKFULL
-            else:
-                # no, we still have space, we just need a new empty page on this block
-                # find and write the new page
-                newpage = self.get_empty_page(block=block)
-
-                # change the status of this page
-                self._ftl[block][page] = PAGE_DIRTY
-
-                # change the status of the new page
-                self._ftl[block][newpage] = PAGE_IN_USE
-
-                # we need to update the statistics
-                self._ftl[block]['empty'] -= 1  # we lost one empty page in this block
-                self._ftl[block]['dirty'] += 1  # we have one more dirty page in this block
-                self._elapsed_time += self.write_page_time  # time spent to write the data
-                self._page_write_executed += 1  # one page written
+        if s == PAGE_IN_USE_CODE:
+            if self.update_page_write_policy(block=block, page=page):
+                # all statistic MUST BE updated inside the policy method
                 return True, OPERATION_SUCCESS
+            else:
+                # we didn't found a suitable place to write the new data, the write request failed
+                # this is a disk error: the garbage collector was unable to make room for new data
+                self._page_write_failed += 1
+                return False, OPERATION_FAILED_DISKFULL
 
         # if status is DIRTY => we discard this write operation
         # (it's not a disk error, it's a bad random value)
@@ -402,17 +783,47 @@ class BaseNANDDisk(NANDInterface):
         :return:
         """
         # read the FTL to check the current status
-        s = self._ftl[block][page]
+        s = self._ftl.get_page(block, page)
 
-        if s == PAGE_IN_USE:
+        if s == PAGE_IN_USE_CODE:
             # update statistics
-            self._elapsed_time += self.read_page_time  # time spent to read the data
+            self.charge_operation(block, self.read_page_time, True)  # time spent to read the data
             self._page_read_executed += 1  # we executed a read of a page
             return True, OPERATION_SUCCESS
 
         # no valid data to read
         return False, OPERATION_FAILED_DIRTY  # always fail to dirty read (empty or dirty page)
 
+    def raw_write_lba(self, lba=0, relocation=False):
+        """
+        Page mapping write: the data of the logical page is appended to the write frontier and the previous
+        physical copy (if any) is invalidated.
+
+        :param lba: the logical page.
+        :param relocation: True if the write is a garbage collector relocation (it can use the reserved block).
+        :return: True if the write is successful, false otherwise (the write is discarded)
+        """
+        # where to write (the write policy chooses the frontier)
+        res, block, page = self.get_write_frontier(lba=lba, reserve=0 if relocation else 1, relocation=relocation)
+        if not res:
+            # no space left: the garbage collector was unable to make room for new data
+            self._page_write_failed += 1
+            return False, OPERATION_FAILED_DISKFULL
+
+        # invalidate the old copy
+        old = self._ftl.unmap_page(lba)
+        if old >= 0:
+            self._ftl.invalidate_page(old // self.pages_per_block, old % self.pages_per_block)
+
+        # write the new copy
+        self._ftl.program_page(block, page)
+        self._ftl.map_page(lba, block, page)
+
+        # we need to update the statistics
+        self.charge_operation(block, self.write_page_time, True, True)  # time spent to write the data
+        self._page_write_executed += 1  # one page written
+        return True, OPERATION_SUCCESS
+
     @check_block
     def raw_erase_block(self, block=0):
         """
@@ -421,34 +832,100 @@ class BaseNANDDisk(NANDInterface):
         :return:
         """
         # should mark the full block as dirty and then erase it
-        # as we are in a simulation, we directly erase it
-        for p in range(0, self.pages_per_block):
-            # for every page set the empty status
-            self._ftl[block][p] = PAGE_EMPTY
-
-        # for every block initialize the internal data
-        self._ftl[block]['empty'] = self.pages_per_block  # all pages are empty
-        self._ftl[block]['dirty'] = 0  # fresh as new
+        # as we are in a simulation, we directly erase it: all pages are empty, fresh as new
+        self._ftl.erase_block(block)
+        self.invalidate_block_caches(block=block)
 
         # update the statistics
         self._block_erase_executed += 1  # new erase operation
-        self._elapsed_time += self.erase_block_time  # time spent to erase a block
+        self.charge_operation(block, self.erase_block_time, False, True)  # time spent to erase a block
+
+        if self.wear_leveling == WEARLEVELING_STATIC:
+            self.run_static_wear_leveling()
         return True
 
+    def run_static_wear_leveling(self):
+        """
+        Move the data of the least worn block if the erase count gap is over the threshold (see
+        self.wear_leveling). The moved block goes back to the free-block pool, where it's the next one to be used.
+
+        :return: True if a block was moved.
+        """
+        if not self.page_mapping or self._wear_leveling_running:
+            return False
+
+        block = self._ftl.get_least_worn_block()
+        if self._ftl.max_erase_count - self._ftl.erase_count[block] <= self.wear_leveling_threshold or \
+                self._ftl.empty[block] == self.pages_per_block:
+            # no gap, or the block is already free (and it will be used soon)
+            return False
+
+        self._wear_leveling_running = True
+        moved = self.relocate_block(block=block)
+        self._wear_leveling_running = False
+
+        if moved:
+            self._wear_leveling_moves += 1
+        return moved
+
+    def check_host_block(self, block=0):
+        """
+        Validate a host address before any operation is executed: in page mapping mode only the first
+        self.host_blocks blocks are addressable (the check_block decorator validates the physical range).
+
+        :param block:
+        :return:
+        """
+        if self.page_mapping and block >= self.host_blocks:
+            raise ValueError("block parameter out of range.")
+
     @check_block
     @check_page
-    def host_write_page(self, block=0, page=0, gc_was_forced=False):
+    def host_write_page(self, block=0, page=0, gc_was_forced=False, stream=None, arrival=None):
+        """
+
+        :param block:
+        :param page:
+        :param stream: an optional stream ID supplied by the host (see self._host_stream).
+        :param arrival: the arrival time of the request, only with a host queue (see ComponentHostQueue).
+        :return:
+        """
+        self.check_host_block(block=block)
+        return self.execute_host_write(block=block, page=page, gc_was_forced=gc_was_forced, stream=stream)
+
+    def execute_host_write(self, block=0, page=0, gc_was_forced=False, stream=None):
         """
+        The host write with no parameters validation (see host_write_page and host_write_pages).
 
         :param block:
         :param page:
+        :param stream: an optional stream ID supplied by the host (see self._host_stream).
         :return:
         """
-        # check if we need to run the garbage collector
-        self.run_gc(force_run=gc_was_forced)
+        self._host_stream = stream
+
+        # check if we need to run the garbage collector (see the gc scheduling in GarbageCollectorInterface)
+        if gc_was_forced or self._elapsed_time >= self._gc_next_run or \
+                self._ftl.free_block_count < self._gc_low_watermark:
+            self.run_gc(force_run=gc_was_forced)
 
         # execute the write
-        res, status = self.raw_write_page(block=block, page=page)
+        return self.store_host_write(block=block, page=page, gc_was_forced=gc_was_forced, stream=stream)
+
+    def store_host_write(self, block=0, page=0, gc_was_forced=False, stream=None):
+        """
+        Write the data of a host write to the flash memory (see ComponentWriteBuffer for the buffered writes).
+
+        :param block:
+        :param page:
+        :param gc_was_forced:
+        :param stream:
+        :return:
+        """
+        if self.page_mapping:
+            res, status = self.raw_write_lba(lba=block * self.pages_per_block + page)
+        else:
+            res, status = self.raw_write_page(block=block, page=page)
         if res:
             # update statistics
             self._host_page_write_request += 1  # the host actually asked to write a page
@@ -458,26 +935,464 @@ class BaseNANDDisk(NANDInterface):
 
             # force a gc run and retry
             self._gc_forced_count += 1
-            return self.host_write_page(block=block, page=page, gc_was_forced=True)
+            return self.execute_host_write(block=block, page=page, gc_was_forced=True, stream=stream)
 
         return res, status
 
+    def flush_write_buffer(self):
+        """
+        Write all the buffered pages to the flash memory, ie: before save_state and checkpoint. Nothing to do
+        without a write buffer (see ComponentWriteBuffer).
+
+        :return:
+        """
+        pass
+
+    def clear_cached_pages(self):
+        """
+        Discard the pages of the controller memory (see ComponentWriteBuffer and ComponentReadCache), ie: when the
+        flash memory is replaced. Nothing to do by default.
+
+        :return:
+        """
+        pass
+
+    def invalidate_block_caches(self, block=0):
+        """
+        Drop the cached copies of the pages of an erased block (see ComponentReadCache). Nothing to do by default.
+
+        :param block:
+        :return:
+        """
+        pass
+
     @check_block
     @check_page
-    def host_read_page(self, block=0, page=0):
+    def host_read_page(self, block=0, page=0, arrival=None):
         """
 
         :param block:
         :param page:
+        :param arrival: the arrival time of the request, only with a host queue (see ComponentHostQueue).
         :return:
         """
-        # check if we need to run the garbage collector
-        self.run_gc()
+        self.check_host_block(block=block)
+        return self.execute_host_read(block=block, page=page)
 
-        # execute the write
+    def execute_host_read(self, block=0, page=0):
+        """
+        The host read with no parameters validation (see host_read_page).
+
+        :param block:
+        :param page:
+        :return:
+        """
+        # check if we need to run the garbage collector (see the gc scheduling in GarbageCollectorInterface)
+        if self._elapsed_time >= self._gc_next_run or self._ftl.free_block_count < self._gc_low_watermark:
+            self.run_gc()
+
+        return self.read_host_data(block=block, page=page)
+
+    def read_host_data(self, block=0, page=0):
+        """
+        Read the data of a host address (see ComponentWriteBuffer for the buffered data).
+
+        :param block:
+        :param page:
+        :return:
+        """
+        # page mapping: find the physical copy of the logical page
+        if self.page_mapping:
+            ppn = int(self._ftl.l2p[block * self.pages_per_block + page])
+            if ppn < 0:
+                # never written
+                return False, OPERATION_FAILED_DIRTY
+            block, page = divmod(ppn, self.pages_per_block)
+
+        return self.read_physical_page(block=block, page=page)
+
+    def read_physical_page(self, block=0, page=0):
+        """
+        Read the physical copy of the data of a host read (see ComponentReadCache for the cached pages).
+
+        :param block:
+        :param page:
+        :return:
+        """
         res, status = self.raw_read_page(block=block, page=page)
         if res:
             # update statistics
             self._host_page_read_request += 1  # the host actually asked to read a page
 
         return res, status
+
+    @check_block
+    @check_page
+    def host_trim_page(self, block=0, page=0):
+        """
+        The host discards the data of a page (TRIM): the page becomes dirty without any program operation, so the
+        garbage collector will not copy it. It's a change of the mapping tables only, so no time is spent.
+
+        :param block:
+        :param page:
+        :return: True if the page was holding data.
+        """
+        self.check_host_block(block=block)
+        return self.execute_host_trim(block=block, page=page)
+
+    def execute_host_trim(self, block=0, page=0):
+        """
+        The host trim with no parameters validation (see host_trim_page).
+
+        :param block:
+        :param page:
+        :return: True if the page was holding data.
+        """
+        self._host_page_trim_request += 1
+
+        # page mapping: find the physical copy of the logical page
+        if self.page_mapping:
+            ppn = self._ftl.unmap_page(block * self.pages_per_block + page)
+            if ppn < 0:
+                # never written (or already discarded)
+                return False
+            block, page = divmod(ppn, self.pages_per_block)
+        elif self._ftl.pages[block, page] != PAGE_IN_USE_CODE:
+            return False
+
+        self.discard_page_write_policy(block=block, page=page)
+        self._ftl.invalidate_page(block, page)
+        return True
+
+    # BATCH HOST OPERATIONS
+    def host_trim_pages(self, blocks, pages):
+        """
+        Execute a sequence of host trims in a single call (see host_trim_page).
+        The parameters are validated once for the whole batch.
+
+        :param blocks: the array of block indexes.
+        :param pages: the array of page indexes, the same length of blocks.
+        :return: the number of pages that were holding data.
+        """
+        blocks = np.asarray(blocks)
+        pages = np.asarray(pages)
+
+        # validate the parameters
+        if blocks.shape != pages.shape or blocks.ndim != 1:
+            raise ValueError("blocks and pages must be one dimensional arrays of the same length.")
+        if blocks.size > 0:
+            if blocks.min() < 0 or blocks.max() >= self.host_blocks:
+                raise ValueError("block parameter out of range.")
+            if pages.min() < 0 or pages.max() >= self.pages_per_block:
+                raise ValueError("page parameter out of range.")
+
+        discarded = 0
+        for block, page in zip(blocks.tolist(), pages.tolist()):
+            if self.execute_host_trim(block=block, page=page):
+                discarded += 1
+        return discarded
+
+    def host_trim_range(self, start=0, count=1):
+        """
+        The host discards a range of consecutive pages (see host_trim_page), ie: a deleted file.
+        The host page index is block * pages_per_block + page, the range is clipped to the host pages.
+
+        :param start: the index of the first host page.
+        :param count: the number of pages.
+        :return: the number of pages that were holding data.
+        """
+        total = self.host_blocks * self.pages_per_block
+        if start < 0 or start >= total or count < 0:
+            raise ValueError("Invalid trim range.")
+
+        discarded = 0
+        for p in range(start, min(start + count, total)):
+            if self.execute_host_trim(*divmod(p, self.pages_per_block)):
+                discarded += 1
+        return discarded
+
+    def host_write_pages(self, blocks, pages, stop_time=None, streams=None, arrivals=None):
+        """
+        Execute a sequence of host writes in a single call.
+        The parameters are validated once for the whole batch, then every write is executed as host_write_page.
+
+        :param blocks: the array of block indexes.
+        :param pages: the array of page indexes, the same length of blocks.
+        :param stop_time: if not None, the batch stops as soon as the elapsed time reaches this value
+                          (at least one write is always executed).
+        :param streams: an optional array of stream IDs supplied by the host, the same length of blocks.
+        :param arrivals: an optional array of arrival times, the same length of blocks, only with a host queue
+                         (see ComponentHostQueue).
+        :return: a tuple (codes, delta) where codes is the uint8 array with the result code of every executed write
+                 (see OPERATION_*_CODE in common) and delta is the difference of get_stats after and before the batch.
+        """
+        blocks = np.asarray(blocks)
+        pages = np.asarray(pages)
+
+        # validate the parameters
+        if blocks.shape != pages.shape or blocks.ndim != 1:
+            raise ValueError("blocks and pages must be one dimensional arrays of the same length.")
+        if blocks.size > 0:
+            if blocks.min() < 0 or blocks.max() >= self.host_blocks:
+                raise ValueError("block parameter out of range.")
+            if pages.min() < 0 or pages.max() >= self.pages_per_block:
+                raise ValueError("page parameter out of range.")
+        if streams is not None:
+            streams = np.asarray(streams)
+            if streams.shape != blocks.shape:
+                raise ValueError("streams must be an array of the same length of blocks.")
+            streams = streams.tolist()
+        else:
+            streams = repeat(None)
+        if arrivals is not None:
+            arrivals = np.asarray(arrivals)
+            if arrivals.shape != blocks.shape:
+                raise ValueError("arrivals must be an array of the same length of blocks.")
+            arrivals = arrivals.tolist()
+        else:
+            arrivals = repeat(None)
+
+        before = self.get_stats()
+        codes = self.execute_host_writes(blocks.tolist(), pages.tolist(), streams, arrivals, stop_time)
+        after = self.get_stats()
+        return codes, tuple(a - b for a, b in zip(after, before))
+
+    def execute_host_writes(self, blocks, pages, streams, arrivals, stop_time=None):
+        """
+        The loop of host_write_pages (see ComponentHostRequests for the measured requests).
+
+        :param blocks: the list of block indexes.
+        :param pages: the list of page indexes.
+        :param streams: the stream IDs, an iterable as long as blocks.
+        :param arrivals: the arrival times, an iterable as long as blocks (ignored without a host queue).
+        :param stop_time: see host_write_pages.
+        :return: the uint8 array with the result code of every executed write.
+        """
+        codes = np.empty(len(blocks), dtype=np.uint8)
+        executed = 0
+        for block, page, stream in zip(blocks, pages, streams):
+            res, status = self.execute_host_write(block=block, page=page, stream=stream)
+            codes[executed] = OPERATION_STATUS_TO_CODE[status]
+            executed += 1
+
+            if stop_time is not None and self._elapsed_time >= stop_time:
+                break
+
+        return codes[:executed]
+
+    # PRECONDITIONING
+    def reset_stats(self):
+        """
+        Reset all the internal statistics (and the elapsed time), keeping the state of the flash memory.
+        The garbage collector schedule restarts from the time zero (see reset_gc_schedule).
+
+        :return:
+        """
+        self._elapsed_time = 0
+        self._host_page_write_request = 0
+        self._page_write_executed = 0
+        self._page_write_failed = 0
+        self._host_page_read_request = 0
+        self._page_read_executed = 0
+        self._host_page_trim_request = 0
+        self._block_erase_executed = 0
+        self._gc_forced_count = 0
+        self.reset_gc_schedule()
+        self._wear_leveling_moves = 0
+        self.reset_timeline()
+
+    def precondition(self, valid=1, dirty=0, overwrites=0, seed=None, reset_stats=True):
+        """
+        Bring the disk near to a steady state without simulating the fill phase, every previous data is lost.
+
+        :param valid: the fraction of the host addressable pages to be written.
+        :param dirty: the fraction of the physical pages to be left dirty.
+        :param overwrites: the number of random overwrites of the written pages.
+        :param seed: the seed of the random generator, None for a random one.
+        :param reset_stats: if True, reset the statistics at the end (see reset_stats).
+        :return:
+        """
+        rng = np.random.RandomState(seed)
+        ppb = self.pages_per_block
+        valid_pages = int(Decimal(valid) * self.host_blocks * ppb)
+        dirty_pages = int(Decimal(dirty) * self.total_pages)
+        written = valid_pages + dirty_pages
+
+        # in page mapping mode a free block of every plane is kept (see WritePolicyInterface.get_write_frontier)
+        limit = self.total_pages - ppb * self.total_planes if self.page_mapping else self.total_pages
+        if valid_pages < 0 or dirty_pages < 0 or written > limit:
+            raise ValueError("The requested distribution doesn't fit in the disk.")
+        if overwrites > 0 and valid_pages <= 0:
+            raise ValueError("No valid pages to overwrite.")
+
+        # STEP 1: sequential fill, then the dirty pages
+        self._ftl.clear()
+        self.clear_write_frontiers()
+        self.clear_cached_pages()
+        flat = self._ftl.pages.reshape(-1)
+        flat[:written] = PAGE_IN_USE_CODE
+        if dirty_pages > 0:
+            flat[rng.choice(written, dirty_pages, replace=False)] = PAGE_DIRTY_CODE
+        valid_ppn = np.flatnonzero(flat[:written] == PAGE_IN_USE_CODE)
+
+        if self.page_mapping:
+            # the logical pages are written in order
+            self._ftl.l2p[:valid_pages] = valid_ppn
+            self._ftl.p2l[valid_ppn] = np.arange(valid_pages)
+
+        # STEP 2: overwrites
+        remaining = np.empty(0, dtype=np.int64)
+        if overwrites > 0:
+            if self.page_mapping:
+                lbas = rng.randint(0, valid_pages, size=overwrites)
+
+                # the overwrites appended to the free space can be vectorized
+                fast = min(overwrites, limit - written)
+                sequence = lbas[:fast]
+                new_ppn = written + np.arange(fast)
+
+                # the last copy of every logical page wins, all the previous copies are dirty
+                last_lbas, reverse_index = np.unique(sequence[::-1], return_index=True)
+                last_ppn = new_ppn[fast - 1 - reverse_index]
+                flat[new_ppn] = PAGE_DIRTY_CODE
+                flat[last_ppn] = PAGE_IN_USE_CODE
+                flat[self._ftl.l2p[last_lbas]] = PAGE_DIRTY_CODE
+                self._ftl.p2l[self._ftl.l2p[last_lbas]] = -1
+                self._ftl.l2p[last_lbas] = last_ppn
+                self._ftl.p2l[last_ppn] = last_lbas
+                written += fast
+
+                remaining = lbas[fast:]
+            else:
+                remaining = valid_ppn[rng.randint(0, valid_pages, size=overwrites)]
+
+        # the write frontier is the last written block (if not full)
+        if self.page_mapping and written % ppb > 0:
+            self._open_block = written // ppb
+
+        self._ftl.rebuild_indexes()
+
+        # the overwrites to be simulated
+        if remaining.size > 0:
+            self.host_write_pages(remaining // ppb, remaining % ppb)
+
+        if reset_stats:
+            self.reset_stats()
+
+    # SNAPSHOTS
+    def get_state_attributes(self):
+        """
+
+        :return: the names of the internal attributes defining the disk state, collected from every class
+                 (see _STATE_ATTRIBUTES).
+        """
+        names = list()
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('_STATE_ATTRIBUTES', ()):
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def save_state(self, path):
+        """
+        Save the full state of the disk in a compressed numpy file (.npz).
+
+        :param path: the file path.
+        :return:
+        """
+        self.flush_write_buffer()
+        data = {'ftl_' + name: array for name, array in self._ftl.get_arrays().items()}
+        data.update(self._get_state_attribute_arrays())
+        np.savez_compressed(self._get_state_path(path), **data)
+
+    def load_state(self, path):
+        """
+        Restore a state saved by save_state. The disk must have the same geometry, but it can have a different
+        write policy or garbage collector: the attributes not saved in the file are left untouched.
+
+        :param path: the file path (the extension is added if missing, as in save_state).
+        :return:
+        """
+        path = self._get_state_path(path)
+        with np.load(path) as data:
+            self._check_state_geometry(data)
+            self._ftl.set_arrays({name[4:]: data[name] for name in data.files if name.startswith('ftl_')})
+        self._load_state_attributes(path)
+        self.clear_cached_pages()
+
+    def checkpoint(self):
+        """
+        Save the state of a disk with a memory mapped FTL in its directory (see ftl_path).
+
+        :return:
+        """
+        if self._ftl.path is None:
+            raise ValueError("Checkpoint not available: the FTL is not memory mapped.")
+
+        self.flush_write_buffer()
+        self._ftl.flush()
+        np.savez(str(self._get_checkpoint_path()), **self._get_state_attribute_arrays(mapped=False))
+
+    def _get_checkpoint_path(self):
+        """
+
+        :return: the path of the attributes file of a checkpoint.
+        """
+        return self._ftl.path.joinpath('attributes.npz')
+
+    @staticmethod
+    def _get_state_path(path):
+        """
+
+        :param path: the file path of a saved state.
+        :return: the file path as a string, with the .npz extension (see save_state).
+        """
+        path = str(path)
+        if not path.endswith('.npz'):
+            path += '.npz'
+        return path
+
+    def _get_state_attribute_arrays(self, mapped=True):
+        """
+
+        :param mapped: if False the arrays memory mapped in the FTL directory are skipped (see FTLState.allocate).
+        :return: a dictionary of arrays with the geometry and the internal attributes (see save_state).
+        """
+        data = {'geometry': np.array([self.total_blocks, self.pages_per_block, self.host_blocks])}
+        for name in self.get_state_attributes():
+            data['attr' + name] = np.array(getattr(self, name))
+        for name, array in self.get_write_policy_state().items():
+            if mapped or not self._ftl.is_mapped(array):
+                data['wp_' + name] = np.asarray(array)
+        for name, array in self._ftl.get_dirty_buckets_state().items():
+            if mapped or not self._ftl.is_mapped(array):
+                data['gc_' + name] = array
+        return data
+
+    def _check_state_geometry(self, data):
+        """
+
+        :param data: the saved arrays.
+        :return:
+        """
+        if data['geometry'].tolist() != [self.total_blocks, self.pages_per_block, self.host_blocks]:
+            raise ValueError("The saved state has a different geometry.")
+
+    def _load_state_attributes(self, path):
+        """
+        Restore the internal attributes saved in a file: the attributes not saved are left untouched.
+
+        :param path: the file path.
+        :return:
+        """
+        with np.load(str(path)) as data:
+            self._check_state_geometry(data)
+            for name in self.get_state_attributes():
+                if 'attr' + name in data.files:
+                    setattr(self, name, data['attr' + name].item())
+            self.set_write_policy_state({name[3:]: data[name] for name in data.files if name.startswith('wp_')})
+            if 'gc_dirty_next' in data.files:
+                # the order of the garbage collector victims with the same number of dirty pages
+                self._ftl.set_dirty_buckets_state({name[3:]: data[name] for name in data.files
+                                                   if name.startswith('gc_')})
+        self.reset_timeline()
@@ -0,0 +1,171 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the host queue: up to queue_depth host requests are outstanding.
+"""
+
+# IMPORTS
+from array import array
+from heapq import heappush, heappop
+import numpy as np
+from simulator.NAND.Components.ComponentHostRequests import ComponentHostRequests
+from simulator.NAND.common import compute_mean
+from simulator.NAND.common import get_quantized_decimal as qd
+
+
+class ComponentHostQueue(ComponentHostRequests):
+    """
+    The requests overlap on the dies, so this component needs the parallel timeline (see ComponentTimeline).
+    """
+
+    # CONSTRUCTOR
+    def __init__(self, *args, queue_depth=1, **kwargs):
+        """
+
+        :param queue_depth: the maximum number of outstanding host requests (see self.queue_depth).
+        :return:
+        """
+        if queue_depth < 1:
+            raise ValueError("Invalid queue depth: at least one outstanding request needed.")
+
+        # ATTRIBUTES
+        self.queue_depth = queue_depth
+        """ The maximum number of outstanding host requests (see submit_host_request).
+            This is an integer value greater than zero (ie: 1 to 256).
+        """
+
+        self._outstanding = list()
+        """ The completion times of the outstanding host requests (a min-heap).
+        """
+
+        self._last_submit = 0
+        """ The submission time of the last host request.
+        """
+
+        self._request_latencies = array('q')
+        """ The latency of every host request since the last reset [microseconds].
+        """
+
+        self._latency_sum = 0
+        """ The sum of the latencies of the host requests [microseconds].
+        """
+
+        self._latency_max = 0
+        """ The highest latency of the host requests [microseconds].
+        """
+
+        super().__init__(*args, **kwargs)
+
+    # METHODS
+    def get_queue_description(self):
+        """
+
+        :return: the description of the host queue and of the request latencies.
+        """
+        return "Queue depth: {}, requests: {}, latency mean: {} max: {} [us]\n" \
+               "".format(self.queue_depth, len(self._request_latencies), qd(self.mean_latency()), self._latency_max)
+
+    def get_queue_stats(self):
+        """
+
+        :return: the counters of the host queue as a list of tuples (name, value): requests (completed host
+                 requests), latency_sum and latency_max [microseconds].
+        """
+        return [('requests', len(self._request_latencies)), ('latency_sum', self._latency_sum),
+                ('latency_max', self._latency_max)]
+
+    def mean_latency(self):
+        """
+
+        :return: the mean latency of the host requests [microseconds].
+        """
+        return compute_mean(self._latency_sum, len(self._request_latencies))
+
+    def get_request_latencies(self):
+        """
+
+        :return: a numpy array with the latency of every host request since the last reset [microseconds].
+        """
+        return np.frombuffer(self._request_latencies, dtype=np.int64) if self._request_latencies \
+            else np.zeros(0, dtype=np.int64)
+
+    def reset_stats(self):
+        """
+
+        :return:
+        """
+        self._request_latencies = array('q')
+        self._latency_sum = 0
+        self._latency_max = 0
+        super().reset_stats()
+
+    def reset_timeline(self):
+        """
+
+        :return:
+        """
+        self._outstanding = list()
+        self._last_submit = self._elapsed_time
+        super().reset_timeline()
+
+    def begin_host_request(self, arrival=None):
+        """
+
+        :param arrival: the arrival time of the request [microseconds], None if it's always ready.
+        :return: the submission time.
+        """
+        return self.submit_host_request(arrival)
+
+    def end_host_request(self, start=0, operation='write'):
+        """
+
+        :param start: the submission time of the request.
+        :param operation: the operation type.
+        :return: the latency of the request.
+        """
+        return self.complete_host_request(start)
+
+    def submit_host_request(self, arrival=None):
+        """
+        Wait for a free slot in the host queue and submit a request.
+
+        :param arrival: the arrival time of the request [microseconds], None if it's always ready.
+        :return: the submission time.
+        """
+        submit = self._last_submit
+        if arrival is not None and arrival > submit:
+            submit = arrival
+
+        # the completed requests leave the queue, then wait for a free slot
+        outstanding = self._outstanding
+        while outstanding and outstanding[0] <= submit:
+            heappop(outstanding)
+        if len(outstanding) >= self.queue_depth:
+            submit = max(submit, heappop(outstanding))
+
+        self._last_submit = submit
+        if submit > self._issue_time:
+            self._issue_time = submit
+        self._request_end = submit
+        return submit
+
+    def complete_host_request(self, submit=0):
+        """
+        Record the completion of the current request: the completion of its last operation.
+
+        :param submit: the submission time of the request (see submit_host_request).
+        :return: the latency of the request.
+        """
+        end = self._request_end
+        heappush(self._outstanding, end)
+        if end > self._elapsed_time:
+            self._elapsed_time = end
+
+        latency = end - submit
+        self._request_latencies.append(latency)
+        self._latency_sum += latency
+        if latency > self._latency_max:
+            self._latency_max = latency
+        return latency
@@ -0,0 +1,97 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the base class of the components measuring the latency of the host requests.
+"""
+
+# IMPORTS
+import numpy as np
+from simulator.NAND.NANDInterface import NANDInterface
+from simulator.NAND.common import OPERATION_STATUS_TO_CODE, check_block, check_page
+
+
+class ComponentHostRequests(NANDInterface):
+    """
+    Every host operation is a request, from before its first operation (see begin_host_request) to after its last
+    one (see end_host_request).
+    """
+
+    # METHODS
+    @check_block
+    @check_page
+    def host_write_page(self, block=0, page=0, gc_was_forced=False, stream=None, arrival=None):
+        """
+
+        :param block:
+        :param page:
+        :param stream: an optional stream ID supplied by the host (see BaseNANDDisk._host_stream).
+        :param arrival: the arrival time of the request, only with a host queue (see ComponentHostQueue).
+        :return:
+        """
+        self.check_host_block(block=block)
+        start = self.begin_host_request(arrival)
+        res, status = self.execute_host_write(block=block, page=page, gc_was_forced=gc_was_forced, stream=stream)
+        self.end_host_request(start, 'write')
+        return res, status
+
+    @check_block
+    @check_page
+    def host_read_page(self, block=0, page=0, arrival=None):
+        """
+
+        :param block:
+        :param page:
+        :param arrival: the arrival time of the request, only with a host queue (see ComponentHostQueue).
+        :return:
+        """
+        self.check_host_block(block=block)
+        start = self.begin_host_request(arrival)
+        res, status = self.execute_host_read(block=block, page=page)
+        self.end_host_request(start, 'read')
+        return res, status
+
+    def execute_host_writes(self, blocks, pages, streams, arrivals, stop_time=None):
+        """
+        The loop of host_write_pages, every write is a request.
+
+        :param blocks: the list of block indexes.
+        :param pages: the list of page indexes.
+        :param streams: the stream IDs, an iterable as long as blocks.
+        :param arrivals: the arrival times, an iterable as long as blocks.
+        :param stop_time: see BaseNANDDisk.host_write_pages.
+        :return: the uint8 array with the result code of every executed write.
+        """
+        codes = np.empty(len(blocks), dtype=np.uint8)
+        executed = 0
+        for block, page, stream, arrival in zip(blocks, pages, streams, arrivals):
+            start = self.begin_host_request(arrival)
+            res, status = self.execute_host_write(block=block, page=page, stream=stream)
+            self.end_host_request(start, 'write')
+            codes[executed] = OPERATION_STATUS_TO_CODE[status]
+            executed += 1
+
+            if stop_time is not None and self._elapsed_time >= stop_time:
+                break
+
+        return codes[:executed]
+
+    def begin_host_request(self, arrival=None):
+        """
+        The start of a host operation, when its latency is measured.
+
+        :param arrival: the arrival time of the request, only with a host queue.
+        :return: the start time of the request.
+        """
+        return self.begin_request()
+
+    def end_host_request(self, start=0, operation='write'):
+        """
+        The completion of a host operation (see begin_host_request).
+
+        :param start: the start time of the request.
+        :param operation: the operation type, 'write' or 'read'.
+        :return: the latency of the request.
+        """
+        return self.get_request_end() - start
@@ -0,0 +1,99 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This component records the latency of every host operation type in a histogram.
+"""
+
+# IMPORTS
+from simulator.NAND.Components.ComponentHostRequests import ComponentHostRequests
+from simulator.NAND.LatencyHistogram import LatencyHistogram, LATENCY_PERCENTILES
+
+
+class ComponentLatencyHistograms(ComponentHostRequests):
+    """
+    The latency of a host operation goes from its submission (see ComponentHostQueue), or from the start of its first
+    operation, to the completion of its last operation.
+    """
+
+    # CONSTRUCTOR
+    def __init__(self, *args, **kwargs):
+        """
+
+        :return:
+        """
+        # ATTRIBUTES
+        self._latency_histograms = {'write': LatencyHistogram(), 'read': LatencyHistogram(),
+                                    'gc': LatencyHistogram()}
+        """ The latency histogram of every host operation type (see LatencyHistogram). The gc histogram records the
+            pause of every garbage collector run (see run_gc).
+        """
+
+        super().__init__(*args, **kwargs)
+
+    # METHODS
+    def get_latency_description(self):
+        """
+
+        :return: the description of the latency histograms.
+        """
+        description = ""
+        for operation, histogram in self._latency_histograms.items():
+            description += "Latency {}: {} operations, ".format(operation, len(histogram)) + \
+                           ", ".join("{} {}".format(n, histogram.percentile(p)) for n, p in LATENCY_PERCENTILES) + \
+                           ", max {} [us]\n".format(histogram.max)
+        return description
+
+    def get_latency_stats(self):
+        """
+
+        :return: the percentiles and the maximum of the latency of every host operation type and of the garbage
+                 collector pauses as a list of tuples (name, value), ie: write_p99 [microseconds] (see
+                 LATENCY_PERCENTILES).
+        """
+        stats = list()
+        for operation, histogram in self._latency_histograms.items():
+            for n, p in LATENCY_PERCENTILES:
+                stats.append(('{}_{}'.format(operation, n), histogram.percentile(p)))
+            stats.append(('{}_max'.format(operation), histogram.max))
+        return stats
+
+    def reset_stats(self):
+        """
+
+        :return:
+        """
+        for histogram in self._latency_histograms.values():
+            histogram.reset()
+        super().reset_stats()
+
+    def end_host_request(self, start=0, operation='write'):
+        """
+
+        :param start: the start time of the request.
+        :param operation: the operation type (see self._latency_histograms).
+        :return: the latency of the request.
+        """
+        latency = super().end_host_request(start, operation)
+        self._latency_histograms[operation].record(latency)
+        return latency
+
+    def run_gc(self, force_run=False):
+        """
+        Run the garbage collector and record its pause: from the start of its first operation to the completion of
+        its last one.
+
+        :param force_run:
+        :return: True if the garbage collector was executed.
+        """
+        request_end = self.get_request_end()
+        start = self.begin_request()
+
+        execution = super().run_gc(force_run=force_run)
+        if execution:
+            self._latency_histograms['gc'].record(self.get_request_end() - start)
+
+        # the operations of the gc are a part of the current host request
+        self.resume_request(request_end)
+        return execution
@@ -0,0 +1,156 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This component puts the controller read cache (see ReadCache) in front of the flash memory.
+"""
+
+# IMPORTS
+from decimal import Decimal
+from simulator.NAND.NANDInterface import NANDInterface
+from simulator.NAND.ReadCache import ReadCache, READCACHE_LRU
+from simulator.NAND.common import OPERATION_SUCCESS
+from simulator.NAND.common import get_quantized_decimal as qd
+
+
+class ComponentReadCache(NANDInterface):
+    """
+    A host read of a cached page costs self.read_cache_hit_time instead of a flash read. The cached pages are dropped
+    by the host writes and trims of their data and by the erase of their block.
+    """
+
+    # CONSTRUCTOR
+    def __init__(self, *args, read_cache_pages=256, read_cache_policy=READCACHE_LRU, read_cache_hit_time=1,
+                 **kwargs):
+        """
+
+        :param read_cache_pages: the number of pages of the read cache.
+        :param read_cache_policy: the eviction policy of the read cache (see ReadCache).
+        :param read_cache_hit_time: the time of a read served by the read cache.
+        :return:
+        """
+        # ATTRIBUTES
+        self._read_cache = ReadCache(read_cache_pages, read_cache_policy)
+        """ The controller read cache (see ReadCache).
+        """
+
+        self.read_cache_hit_time = read_cache_hit_time
+        """ The time of a host read served by the read cache (DRAM) in [microseconds].
+            This is an integer value, zero if the DRAM latency is negligible.
+        """
+
+        super().__init__(*args, **kwargs)
+
+    # METHODS
+    def get_read_cache_description(self):
+        """
+
+        :return: the description of the read cache.
+        """
+        return "Read cache: {}, hits: {} ({} %), misses: {}, evictions: {}\n" \
+               "".format(self._read_cache.get_description(), self._read_cache.hits, qd(self.read_cache_hit_rate()),
+                         self._read_cache.misses, self._read_cache.evictions)
+
+    def get_read_cache_stats(self):
+        """
+
+        :return: the counters of the read cache as a list of tuples (name, value): cache_hit (host reads served by
+                 the cache), cache_miss (host reads of the flash memory) and cache_evict (evicted pages).
+        """
+        return [('cache_hit', self._read_cache.hits),
+                ('cache_miss', self._read_cache.misses),
+                ('cache_evict', self._read_cache.evictions)]
+
+    def read_cache_hit_rate(self):
+        """
+
+        :return: the percentage of the host reads (of the flash memory) served by the read cache.
+        """
+        # avoid divide by zero errors
+        if self._read_cache.hits + self._read_cache.misses <= 0:
+            return Decimal('0')
+
+        return Decimal(self._read_cache.hits * 100) / Decimal(self._read_cache.hits + self._read_cache.misses)
+
+    def reset_stats(self):
+        """
+
+        :return:
+        """
+        self._read_cache.reset_stats()
+        super().reset_stats()
+
+    def clear_cached_pages(self):
+        """
+
+        :return:
+        """
+        self._read_cache.clear()
+        super().clear_cached_pages()
+
+    def store_host_write(self, block=0, page=0, gc_was_forced=False, stream=None):
+        """
+        The cached copy of the old data is dropped.
+
+        :param block:
+        :param page:
+        :param gc_was_forced:
+        :param stream:
+        :return:
+        """
+        self.invalidate_read_cache(block=block, page=page)
+        return super().store_host_write(block=block, page=page, gc_was_forced=gc_was_forced, stream=stream)
+
+    def read_physical_page(self, block=0, page=0):
+        """
+        A cached page is served by the cache, otherwise it's cached after the flash read.
+
+        :param block:
+        :param page:
+        :return:
+        """
+        if self._read_cache.lookup(block, page):
+            self.charge_dram_access(self.read_cache_hit_time)
+            self._host_page_read_request += 1
+            return True, OPERATION_SUCCESS
+
+        res, status = super().read_physical_page(block=block, page=page)
+        if res:
+            self._read_cache.insert(block, page)
+        return res, status
+
+    def execute_host_trim(self, block=0, page=0):
+        """
+        The cached copy of the discarded data is dropped.
+
+        :param block:
+        :param page:
+        :return: True if the page was holding data.
+        """
+        self.invalidate_read_cache(block=block, page=page)
+        return super().execute_host_trim(block=block, page=page)
+
+    def invalidate_block_caches(self, block=0):
+        """
+
+        :param block:
+        :return:
+        """
+        self._read_cache.invalidate_block(block)
+        super().invalidate_block_caches(block=block)
+
+    def invalidate_read_cache(self, block=0, page=0):
+        """
+        Drop the cached copy of the data of a host address, ie: the host changes or discards the data.
+
+        :param block:
+        :param page:
+        :return: True if the page was cached.
+        """
+        if self.page_mapping:
+            ppn = int(self._ftl.l2p[block * self.pages_per_block + page])
+            if ppn < 0:
+                return False
+            block, page = divmod(ppn, self.pages_per_block)
+        return self._read_cache.invalidate(block, page)
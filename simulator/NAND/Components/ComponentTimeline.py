@@ -0,0 +1,221 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the parallel timing model: every die and every channel has its own timeline.
+"""
+
+# IMPORTS
+from simulator.NAND.NANDInterface import NANDInterface
+
+
+class ComponentTimeline(NANDInterface):
+    """
+    The operations on different dies overlap (see charge_operation). Without this component the operations are
+    serial: the time of an operation is added to the elapsed time (see BaseNANDDisk.charge_operation).
+    """
+
+    _STATE_ATTRIBUTES = ('_multiplane_operations', )
+    """ The internal attributes saved by save_state (see BaseNANDDisk._STATE_ATTRIBUTES).
+    """
+
+    # CONSTRUCTOR
+    def __init__(self, *args, **kwargs):
+        """
+
+        :return:
+        """
+        # ATTRIBUTES
+        self._multiplane_operations = 0
+        """ The number of operations executed together with the previous one as a multi-plane operation.
+        """
+
+        self._die_busy_until = None
+        """ The timeline of every die: the time when the die completes its last operation [microseconds].
+        """
+
+        self._channel_busy_until = None
+        """ The timeline of every channel: the time when the channel completes its last page transfer.
+        """
+
+        self._die_last_operation = None
+        """ The last operation of every die that can be extended to a multi-plane operation, a tuple (duration,
+            end, planes) where planes is the bitmap of the planes of the operation, None if the last operation
+            of the die is a single-plane one. None with a single plane per die (see charge_operation).
+        """
+
+        self._issue_time = 0
+        """ The operations are issued in order: an operation can't start before the start of the previous one.
+            This is the start time of the last operation [microseconds].
+        """
+
+        self._request_end = 0
+        """ The completion time of the last operation of the current host request.
+        """
+
+        super().__init__(*args, **kwargs)
+        self.reset_timeline()
+
+    # METHODS
+    def get_parallelism_description(self):
+        """
+
+        :return: the description of the channels and dies.
+        """
+        description = "Parallelism: {} channels x {} dies x {} planes, transfer time: {} [us]\n" \
+                      "".format(self.channels, self.dies_per_channel, self.planes_per_die, self.transfer_page_time)
+        if self._die_last_operation is not None:
+            description += "Multi-plane operations: {}\n".format(self._multiplane_operations)
+        return description
+
+    def get_multiplane_stats(self):
+        """
+
+        :return: the number of operations joined to a multi-plane operation as a list of tuples (name, value), empty
+                 with a single plane per die.
+        """
+        if self._die_last_operation is None:
+            return []
+
+        return [('multiplane', self._multiplane_operations)]
+
+    def reset_stats(self):
+        """
+
+        :return:
+        """
+        self._multiplane_operations = 0
+        super().reset_stats()
+
+    def charge_operation(self, block=0, duration=0, transfer=False, multiplane=False):
+        """
+        Account the time of a flash operation on the timeline of its die, after the page transfer on its channel.
+        A program or an erase can join the running operation of its die on other planes (a multi-plane operation).
+
+        :param block:
+        :param duration: the time of the operation on the die.
+        :param transfer: if True, a page is transferred on the channel (reads and writes).
+        :param multiplane: if True, the operation can be a part of a multi-plane operation (programs and erases).
+        :return:
+        """
+        if transfer:
+            duration += self.transfer_page_time
+
+        die = self.get_block_die(block)
+        if self._die_last_operation is not None and self.charge_multiplane_operation(block, die, duration, transfer,
+                                                                                      multiplane):
+            return
+
+        start = max(self._issue_time, self._die_busy_until[die])
+        self._issue_time = start
+        if transfer and self.transfer_page_time > 0:
+            # the channel is shared by its dies
+            channel = die % self.channels
+            start = max(start, self._channel_busy_until[channel])
+            self._channel_busy_until[channel] = start + self.transfer_page_time
+
+        end = start + duration
+        self._die_busy_until[die] = end
+        if self._die_last_operation is not None:
+            self._die_last_operation[die] = (duration, end, 1 << self.get_block_plane(block)) if multiplane else None
+        if end > self._elapsed_time:
+            self._elapsed_time = end
+        if end > self._request_end:
+            self._request_end = end
+
+    def charge_multiplane_operation(self, block, die, duration, transfer, multiplane):
+        """
+        Join an operation to the last operation of its die as a multi-plane operation, if possible (see
+        charge_operation).
+
+        :param block:
+        :param die: the die of the block.
+        :param duration: the time of the operation on the die (with the page transfer).
+        :param transfer: if True, a page is transferred on the channel.
+        :param multiplane: if True, the operation can be a part of a multi-plane operation.
+        :return: True if the operation was joined (and its time accounted).
+        """
+        last = self._die_last_operation[die]
+        if not multiplane or last is None or last[0] != duration:
+            return False
+
+        plane = 1 << self.get_block_plane(block)
+        if last[2] & plane:
+            # the plane is already busy in the operation
+            return False
+
+        # the operation is issued when its page can be transferred
+        start = self._issue_time
+        if transfer and self.transfer_page_time > 0:
+            start = max(start, self._channel_busy_until[die % self.channels])
+        if start >= last[1]:
+            # the last operation is completed: this is a new operation
+            return False
+
+        self._issue_time = start
+        if transfer and self.transfer_page_time > 0:
+            self._channel_busy_until[die % self.channels] = start + self.transfer_page_time
+
+        # the multi-plane operation completes with its last page
+        end = max(last[1], start + duration)
+        self._die_busy_until[die] = end
+        self._die_last_operation[die] = (duration, end, last[2] | plane)
+        self._multiplane_operations += 1
+        if end > self._elapsed_time:
+            self._elapsed_time = end
+        if end > self._request_end:
+            self._request_end = end
+        return True
+
+    def charge_dram_access(self, duration=0):
+        """
+        The DRAM is not on the timeline of the dies.
+
+        :param duration:
+        :return:
+        """
+        end = self._issue_time + duration
+        if end > self._elapsed_time:
+            self._elapsed_time = end
+        if end > self._request_end:
+            self._request_end = end
+
+    def reset_timeline(self):
+        """
+
+
+        :return:
+        """
+        self._die_busy_until = [self._elapsed_time] * self.total_dies
+        self._channel_busy_until = [self._elapsed_time] * self.channels
+        self._die_last_operation = [None] * self.total_dies if self.planes_per_die > 1 else None
+        self._issue_time = self._elapsed_time
+        self._request_end = self._elapsed_time
+        super().reset_timeline()
+
+    def begin_request(self):
+        """
+
+
+        :return: the start time, when its first operation can be issued.
+        """
+        self._request_end = self._issue_time
+        return self._issue_time
+
+    def get_request_end(self):
+        """
+
+        :return: the completion time of the last operation of the current request.
+        """
+        return self._request_end
+
+    def resume_request(self, end=0):
+        """
+
+
+        :param end: the completion time of the request before the pause.
+        :return:
+        """
+        if end > self._request_end:
+            self._request_end = end
@@ -0,0 +1,160 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This component puts the controller write buffer (see WriteBuffer) in front of the flash memory.
+"""
+
+# IMPORTS
+from decimal import Decimal
+from simulator.NAND.NANDInterface import NANDInterface
+from simulator.NAND.WriteBuffer import WriteBuffer, WRITEBUFFER_LRU
+from simulator.NAND.common import PAGE_DIRTY_CODE, OPERATION_SUCCESS, OPERATION_FAILED_DIRTY
+from simulator.NAND.common import get_quantized_decimal as qd
+
+
+class ComponentWriteBuffer(NANDInterface):
+    """
+    A host write is completed as soon as it's buffered, when the buffer is full all the buffered pages of the victim
+    block are written together by the write policy (see flush_block_updates).
+    """
+
+    # CONSTRUCTOR
+    def __init__(self, *args, write_buffer_pages=256, write_buffer_policy=WRITEBUFFER_LRU, **kwargs):
+        """
+
+        :param write_buffer_pages: the number of pages of the write buffer.
+        :param write_buffer_policy: the flush policy of the write buffer (see WriteBuffer).
+        :return:
+        """
+        # ATTRIBUTES
+        self._write_buffer = WriteBuffer(write_buffer_pages, write_buffer_policy)
+        """ The controller write buffer (see WriteBuffer), flushed before saving the state.
+        """
+
+        super().__init__(*args, **kwargs)
+
+    # METHODS
+    def get_write_buffer_description(self):
+        """
+
+        :return: the description of the write buffer.
+        """
+        return "Write buffer: {}, hits: {} ({} %), flushes: {} ({} [pages])\n" \
+               "".format(self._write_buffer.get_description(), self._write_buffer.hits,
+                         qd(self.write_buffer_hit_rate()), self._write_buffer.flushes,
+                         self._write_buffer.flushed_pages)
+
+    def get_write_buffer_stats(self):
+        """
+
+        :return: the counters of the write buffer as a list of tuples (name, value): buffer_hit (host writes
+                 absorbed), buffer_flush (block flushes) and buffer_flushed (pages flushed).
+        """
+        return [('buffer_hit', self._write_buffer.hits),
+                ('buffer_flush', self._write_buffer.flushes),
+                ('buffer_flushed', self._write_buffer.flushed_pages)]
+
+    def write_buffer_hit_rate(self):
+        """
+
+        :return: the percentage of host writes absorbed by the write buffer.
+        """
+        # avoid divide by zero errors
+        if self._host_page_write_request <= 0:
+            return Decimal('0')
+
+        return Decimal(self._write_buffer.hits * 100) / Decimal(self._host_page_write_request)
+
+    def reset_stats(self):
+        """
+
+        :return:
+        """
+        self._write_buffer.reset_stats()
+        super().reset_stats()
+
+    def clear_cached_pages(self):
+        """
+
+        :return:
+        """
+        self._write_buffer.clear()
+        super().clear_cached_pages()
+
+    def store_host_write(self, block=0, page=0, gc_was_forced=False, stream=None):
+        """
+        The host write through the write buffer: the page is buffered and, if the buffer is full, the block of the
+        victim page is flushed.
+
+        :param block:
+        :param page:
+        :param gc_was_forced:
+        :param stream:
+        :return:
+        """
+        # with physical addresses a dirty page cannot be written (as an unbuffered write)
+        if not self.page_mapping and (block, page) not in self._write_buffer and \
+                self._ftl.get_page(block, page) == PAGE_DIRTY_CODE:
+            return False, OPERATION_FAILED_DIRTY
+
+        if not self._write_buffer.put(block, page) and len(self._write_buffer) > self._write_buffer.capacity:
+            victim, pages = self._write_buffer.pop_victim()
+            self.flush_write_buffer_block(block=victim, pages=pages)
+
+        # update statistics
+        self._host_page_write_request += 1  # the host actually asked to write a page
+        return True, OPERATION_SUCCESS
+
+    def flush_write_buffer_block(self, block=0, pages=()):
+        """
+        Write the buffered pages of a block with the write policy (see flush_block_updates).
+        If there is no space left, the garbage collector is forced and the failed pages are written again.
+
+        :param block:
+        :param pages: the buffered pages of the block.
+        :return:
+        """
+        failed = self.flush_block_updates(block=block, pages=pages)
+        if failed:
+            # force a gc run and retry
+            self._page_write_failed -= len(failed)
+            self._gc_forced_count += 1
+            self.run_gc(force_run=True)
+            self.flush_block_updates(block=block, pages=failed)
+
+    def flush_write_buffer(self):
+        """
+        Write all the buffered pages to the flash memory, ie: before save_state and checkpoint.
+
+        :return:
+        """
+        while len(self._write_buffer) > 0:
+            block, pages = self._write_buffer.pop_victim()
+            self.flush_write_buffer_block(block=block, pages=pages)
+
+    def read_host_data(self, block=0, page=0):
+        """
+        The data still in the write buffer is read from the buffer.
+
+        :param block:
+        :param page:
+        :return:
+        """
+        if (block, page) in self._write_buffer:
+            self._host_page_read_request += 1
+            return True, OPERATION_SUCCESS
+
+        return super().read_host_data(block=block, page=page)
+
+    def execute_host_trim(self, block=0, page=0):
+        """
+        The data still in the write buffer is dropped.
+
+        :param block:
+        :param page:
+        :return: True if the page was holding data.
+        """
+        discarded = self._write_buffer.discard(block, page)
+        return super().execute_host_trim(block=block, page=page) or discarded
@@ -0,0 +1,963 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the array based state of the flash memory (the FTL): a page-state matrix with one byte per page plus
+per-block counter arrays.
+"""
+
+# IMPORTS
+from heapq import heapify, heappush, heappop
+from pathlib import Path
+import numpy as np
+from simulator.NAND.common import PAGE_EMPTY_CODE, PAGE_IN_USE_CODE, PAGE_DIRTY_CODE, PAGE_STATUS_TO_CODE, \
+    PAGE_CODE_TO_STATUS
+
+
+# FUNCTIONS
+def mask_to_words(mask):
+    """
+
+    :param mask: a one dimensional boolean array.
+    :return: an array of 64 bit words where the bit i of the word w is set if mask[w * 64 + i] is True.
+    """
+    words = np.zeros(-(-len(mask) // 64), dtype=np.uint64)
+    shifts = np.arange(64, dtype=np.uint64)
+
+    # in chunks of words, so the bits are never expanded for the whole mask
+    chunk = 1 << 26
+    for start in range(0, len(mask), chunk):
+        part = mask[start:start + chunk]
+        bits = np.zeros(-(-len(part) // 64) * 64, dtype=np.uint64)
+        bits[:len(part)] = part
+        words[start // 64:start // 64 + len(bits) // 64] = (bits.reshape(-1, 64) << shifts).sum(axis=1)
+    return words
+
+
+# BlockBitmap class
+class BlockBitmap(object):
+    """
+    A set of blocks as a hierarchical bitmap of 64 bit words: the bit b of the first level is set if the block b is
+    in the set, the bit w of the next level is set if the word w of the previous level is not zero.
+    Adding or removing a block and finding the first one cost O(log64(blocks)).
+    """
+
+    # CONSTRUCTOR
+    def __init__(self, size, mask=None):
+        """
+
+        :param size: the number of blocks.
+        :param mask: a boolean array with the blocks of the set, None for an empty set.
+        :return:
+        """
+        # ATTRIBUTES
+        self.size = size
+        """ The number of blocks.
+        """
+
+        self.levels = list()
+        """ The levels of the bitmap, from the blocks to a single word.
+        """
+
+        words = max(-(-size // 64), 1)
+        while True:
+            self.levels.append(np.zeros(words, dtype=np.uint64))
+            if words == 1:
+                break
+            words = -(-words // 64)
+
+        if mask is not None:
+            self.set_mask(mask)
+
+    # METHODS
+    def set_mask(self, mask):
+        """
+
+        :param mask: a boolean array with the blocks of the set.
+        :return:
+        """
+        self.levels[0][:] = mask_to_words(mask)
+        for k in range(1, len(self.levels)):
+            self.levels[k][:] = mask_to_words(self.levels[k - 1] != 0)
+
+    def add(self, block):
+        """
+
+        :param block:
+        :return:
+        """
+        for level in self.levels:
+            i = block >> 6
+            word = int(level[i])
+            level[i] = word | (1 << (block & 63))
+            if word:
+                # the upper levels already have the bit set
+                break
+            block = i
+
+    def discard(self, block):
+        """
+
+        :param block:
+        :return:
+        """
+        for level in self.levels:
+            i = block >> 6
+            word = int(level[i]) & ~(1 << (block & 63))
+            level[i] = word
+            if word:
+                break
+            block = i
+
+    def find_first(self, start=0):
+        """
+
+        :param start: the first block to be considered.
+        :return: the first block of the set not lower than start, -1 if there are no such blocks.
+        """
+        levels = self.levels
+
+        # up to the first level with a bit set after the position
+        k = 0
+        position = start
+        while k < len(levels):
+            i = position >> 6
+            if i >= len(levels[k]):
+                return -1
+            word = int(levels[k][i]) >> (position & 63) << (position & 63)
+            if word:
+                position = (i << 6) | ((word & -word).bit_length() - 1)
+                break
+            position = i + 1
+            k += 1
+        else:
+            return -1
+
+        # down to the block: the first bit set of every word
+        while k > 0:
+            k -= 1
+            word = int(levels[k][position])
+            position = (position << 6) | ((word & -word).bit_length() - 1)
+        return position
+
+
+# FTLState class
+class FTLState(object):
+    """
+    The full state of the flash memory. The counters are updated by the caller, as in the original dict based FTL
+    (see program_page, invalidate_page and mark_page).
+    """
+
+    # CONSTRUCTOR
+    def __init__(self, total_blocks=256, pages_per_block=128, path=None):
+        """
+
+        :param total_blocks: the number of blocks.
+        :param pages_per_block: the number of pages per block.
+        :param path: if not None, the directory of the memory mapped files backing the arrays (see self.path).
+        :return:
+        """
+        # ATTRIBUTES
+        self.total_blocks = total_blocks
+        """ The number of blocks tracked by this FTL.
+        """
+
+        self.pages_per_block = pages_per_block
+        """ The number of pages per single block.
+        """
+
+        self.path = None if path is None else Path(path)
+        """ If not None, the arrays are numpy.memmap of .npy files in this directory, restored if they have the same
+            geometry (see flush).
+        """
+
+        self.restored = False
+        """ True if the state was restored from the files in self.path.
+        """
+
+        self._mapped = dict()
+        """ The memory mapped arrays by name (see allocate).
+        """
+
+        if self.path is not None:
+            if not self.path.exists():
+                self.path.mkdir(parents=False)
+            self.restored = all(self._is_restorable(name, shape, dtype) for name, shape, dtype in (
+                ('pages', (total_blocks, pages_per_block), np.uint8),
+                ('empty', (total_blocks, ), np.int32),
+                ('dirty', (total_blocks, ), np.int32)))
+
+        self.pages = self.allocate('pages', (total_blocks, pages_per_block), np.uint8, PAGE_EMPTY_CODE)
+        """ The page-state matrix: one row per block, one column per page.
+            Every cell is a page status code (see PAGE_*_CODE in common).
+        """
+
+        self.empty = self.allocate('empty', (total_blocks, ), np.int32, pages_per_block)
+        """ Total number of empty pages for every block.
+        """
+
+        self.dirty = self.allocate('dirty', (total_blocks, ), np.int32, 0)
+        """ Total number of dirty pages for every block.
+        """
+
+        self.erase_count = self.allocate('erase_count', (total_blocks, ), np.int64, 0)
+        """ Total number of erase operations of every block (the wear of the block).
+        """
+
+        self.total_empty = total_blocks * pages_per_block
+        """ Total number of empty pages of the whole disk: always equal to the sum of self.empty.
+            It's incrementally updated by every operation changing the block counters.
+        """
+
+        self.total_dirty = 0
+        """ Total number of dirty pages of the whole disk: always equal to the sum of self.dirty.
+            It's incrementally updated by every operation changing the block counters.
+        """
+
+        self._all_pages_words = mask_to_words(np.ones(pages_per_block, dtype=bool))
+        """ The free-page words of a fully erased block.
+        """
+
+        self._clear_page_bits = ~(np.uint64(1) << np.arange(64, dtype=np.uint64))
+        """ For every bit of a word, the mask clearing only that bit.
+        """
+
+        self.free_pages = self.allocate('free_pages', (total_blocks, len(self._all_pages_words)), np.uint64, 0)
+        """ The free-page index: for every block a bitmap of 64 bit words where the bit p is set if the page p
+            is empty. The first empty page is found with a find-first-set instead of scanning the block.
+        """
+        if not self.restored:
+            self.free_pages[:] = self._all_pages_words
+
+        self.free_blocks = BlockBitmap(total_blocks, np.ones(total_blocks, dtype=bool))
+        """ The free-block pool: the fully erased blocks (all their pages are empty).
+        """
+
+        self.free_block_count = total_blocks
+        """ The number of fully erased blocks.
+        """
+
+        self.partial_blocks = BlockBitmap(total_blocks, np.ones(total_blocks, dtype=bool))
+        """ The blocks with at least one empty page.
+        """
+
+        self._die_pools = dict()
+        """ The free-block pool split by die, only for the numbers of dies used (see find_empty_block): for every
+            number of dies n a list of n pools, the block b is the entry b // n of the pool b % n.
+        """
+
+        self.dirty_next = None
+        """ The dirty-page buckets, only if enabled (see enable_dirty_buckets): the bucket d is a linked list of the
+            blocks with d dirty pages. For every block the next block of its bucket, -1 for the last one.
+        """
+
+        self.dirty_prev = None
+        """ For every block the previous block of its dirty-page bucket, -1 for the first one.
+        """
+
+        self.dirty_head = None
+        """ For every number of dirty pages the first block of its bucket, -1 if the bucket is empty.
+        """
+
+        self.dirty_tail = None
+        """ For every number of dirty pages the last block of its bucket, -1 if the bucket is empty.
+        """
+
+        self.max_dirty = 0
+        """ An upper bound of the highest non empty dirty-page bucket (see get_dirtiest_blocks).
+        """
+
+        self.last_modified = None
+        """ The last modification time of every block, only if the dirty-page buckets are enabled (every bucket is
+            sorted from the least recently modified block).
+        """
+
+        self.clock = None
+        """ A callable returning the current simulation time, used to set self.last_modified (always 0 if None).
+        """
+
+        self.free_heap = None
+        """ The wear index of the free blocks, only if enabled (see enable_wear_index): a min-heap of tuples
+            (erase count, block) with stale entries (see find_least_worn_empty_block).
+        """
+
+        self.wear_heap = None
+        """ The wear index of all the blocks, only if enabled (see enable_wear_index): a min-heap of tuples
+            (erase count, block), an entry is valid only if the block has the same erase count (see
+            get_least_worn_block).
+        """
+
+        self.max_erase_count = 0
+        """ The highest erase count of all the blocks, only if the wear index is enabled.
+        """
+
+        self.l2p = None
+        """ The logical to physical page table, only in page mapping mode (see enable_page_mapping).
+            For every logical page (LBA) the physical page number (block * pages_per_block + page), -1 if unmapped.
+        """
+
+        self.p2l = None
+        """ The physical to logical reverse map, only in page mapping mode (see enable_page_mapping).
+            For every physical page number the logical page stored there, -1 if the page holds no valid data.
+        """
+
+        if self.restored:
+            self.rebuild_indexes(counters=False)
+            if all(self._is_restorable(name, shape, np.int64) for name, shape in self._get_dirty_buckets_shapes()):
+                # the dirty-page buckets were enabled
+                self._allocate_dirty_buckets()
+
+    # PYTHON UTILITIES
+    def __getitem__(self, block):
+        """
+        Compatibility accessor with the original dict of dicts FTL: ftl[block][page] and
+        ftl[block]['empty'|'dirty'] are still available (both to read and to write).
+
+        :param block: the block index.
+        :return: a view on the given block.
+        """
+        if block < 0 or block >= self.total_blocks:
+            raise KeyError(block)
+        return FTLBlockView(self, block)
+
+    def __len__(self):
+        return self.total_blocks
+
+    # MEMORY MAPPED FILES
+    def _is_restorable(self, name, shape, dtype):
+        """
+
+        :return: True if self.path contains the file of the given array with the right shape and type.
+        """
+        fp = self.path.joinpath(name + '.npy')
+        if not fp.exists():
+            return False
+        array = np.load(str(fp), mmap_mode='r')
+        return array.shape == shape and array.dtype == dtype
+
+    def allocate(self, name, shape, dtype, value):
+        """
+        Allocate an array: in memory, or memory mapped in self.path (restored if self.restored).
+
+        :param name: the array name (and the file name).
+        :param shape:
+        :param dtype:
+        :param value: the initial value of every element.
+        :return: the array.
+        """
+        if self.path is None:
+            return np.full(shape, value, dtype=dtype)
+
+        fp = str(self.path.joinpath(name + '.npy'))
+        if self.restored and self._is_restorable(name, shape, dtype):
+            self._mapped[name] = np.load(fp, mmap_mode='r+')
+            return self._mapped[name]
+
+        array = np.lib.format.open_memmap(fp, mode='w+', dtype=dtype, shape=shape)
+        if value != 0:  # a new file is already zero filled
+            array.fill(value)
+        self._mapped[name] = array
+        return array
+
+    def is_mapped(self, array):
+        """
+
+        :param array:
+        :return: True if the array is memory mapped in self.path (it's already part of a checkpoint).
+        """
+        return self.path is not None and isinstance(array, np.memmap)
+
+    def flush(self):
+        """
+        Write to disk the memory mapped arrays (nothing to do for in memory arrays).
+
+        :return:
+        """
+        for array in self._mapped.values():
+            array.flush()
+
+    # BULK OPERATIONS
+    def clear(self):
+        """
+        Reset the whole FTL: every page is empty (and unmapped in page mapping mode). The erase counters are kept.
+
+        :return:
+        """
+        self.pages.fill(PAGE_EMPTY_CODE)
+        if self.l2p is not None:
+            self.l2p.fill(-1)
+            self.p2l.fill(-1)
+        self.rebuild_indexes()
+
+    def rebuild_indexes(self, counters=True):
+        """
+        Compute again the block counters, the totals, the free-page index and the block pools from the page-state
+        matrix. To be used after a bulk change of self.pages.
+
+        :param counters: if False the block counters are kept as they are (ie: loaded from a saved state) and only
+                         the totals and the indexes are computed.
+        :return:
+        """
+        # the page-state matrix is read in chunks of blocks, so a memory mapped FTL is never fully loaded
+        chunk = max(1, (1 << 24) // self.pages_per_block)
+        words = self.free_pages.shape[1]
+        for start in range(0, self.total_blocks, chunk):
+            pages = self.pages[start:start + chunk]
+            empty_pages = pages == PAGE_EMPTY_CODE
+            if counters:
+                self.empty[start:start + chunk] = empty_pages.sum(axis=1)
+                self.dirty[start:start + chunk] = (pages == PAGE_DIRTY_CODE).sum(axis=1)
+            # every row padded to whole words
+            bits = np.zeros((len(pages), words * 64), dtype=bool)
+            bits[:, :self.pages_per_block] = empty_pages
+            self.free_pages[start:start + chunk] = mask_to_words(bits.ravel()).reshape(len(pages), words)
+
+        self.total_empty = int(self.empty.sum())
+        self.total_dirty = int(self.dirty.sum())
+        free = self.empty == self.pages_per_block
+        self.free_blocks.set_mask(free)
+        self.free_block_count = int(free.sum())
+        self.partial_blocks.set_mask(self.empty > 0)
+        for dies, pools in self._die_pools.items():
+            for die, pool in enumerate(pools):
+                pool.set_mask(free[die::dies])
+        if self.dirty_next is not None:
+            self.enable_dirty_buckets()
+        if self.wear_heap is not None:
+            self.enable_wear_index()
+
+    # SNAPSHOT
+    def get_arrays(self):
+        """
+
+        :return: a dictionary with all the arrays defining the state (the indexes can be computed from them).
+        """
+        arrays = {'pages': self.pages, 'empty': self.empty, 'dirty': self.dirty, 'erase_count': self.erase_count}
+        if self.l2p is not None:
+            arrays['l2p'] = self.l2p
+            arrays['p2l'] = self.p2l
+        return arrays
+
+    def set_arrays(self, arrays):
+        """
+        Restore the state from the arrays returned by get_arrays, then rebuild the indexes.
+
+        :param arrays: a dictionary like object of arrays.
+        :return:
+        """
+        for name, array in self.get_arrays().items():
+            if name not in arrays or arrays[name].shape != array.shape:
+                raise ValueError("Invalid FTL state: missing or wrong '{}' array.".format(name))
+            array[...] = arrays[name]
+        self.rebuild_indexes(counters=False)
+
+    # DIRTY-PAGE BUCKETS
+    def _get_dirty_buckets_shapes(self):
+        """
+
+        :return: a list of tuples (name, shape) with the arrays of the dirty-page buckets (see get_dirty_buckets_state).
+        """
+        return [('dirty_next', (self.total_blocks, )), ('dirty_prev', (self.total_blocks, )),
+                ('dirty_head', (self.pages_per_block + 1, )), ('dirty_tail', (self.pages_per_block + 1, )),
+                ('last_modified', (self.total_blocks, ))]
+
+    def _allocate_dirty_buckets(self):
+        """
+        Allocate the arrays of the dirty-page buckets (restored if self.restored).
+
+        :return:
+        """
+        for name, shape in self._get_dirty_buckets_shapes():
+            setattr(self, name, self.allocate(name, shape, np.int64, 0 if name == 'last_modified' else -1))
+        self.max_dirty = self.pages_per_block
+
+    def enable_dirty_buckets(self, order=None):
+        """
+        Build the dirty-page buckets from the block counters. From now on they are updated by every operation
+        changing the dirty pages counters, together with the block modification times.
+
+        :param order: the order of the blocks in their buckets, None to sort them by modification time.
+        :return:
+        """
+        if self.dirty_next is None:
+            self._allocate_dirty_buckets()
+        if order is None:
+            order = np.argsort(self.last_modified, kind='mergesort')
+
+        # the dirty blocks grouped by number of dirty pages, keeping the given order inside a group
+        order = np.asarray(order, dtype=np.int64)
+        order = order[self.dirty[order] > 0]
+        order = order[np.argsort(self.dirty[order], kind='mergesort')]
+        dirty = self.dirty[order]
+
+        self.dirty_next.fill(-1)
+        self.dirty_prev.fill(-1)
+        self.dirty_head.fill(-1)
+        self.dirty_tail.fill(-1)
+        if len(order) > 0:
+            # a single list, broken where the number of dirty pages changes
+            self.dirty_next[order[:-1]] = order[1:]
+            self.dirty_prev[order[1:]] = order[:-1]
+            ends = np.flatnonzero(dirty[1:] != dirty[:-1])
+            self.dirty_next[order[ends]] = -1
+            self.dirty_prev[order[ends + 1]] = -1
+            firsts = np.concatenate(([0], ends + 1))
+            lasts = np.concatenate((ends, [len(order) - 1]))
+            self.dirty_head[dirty[firsts]] = order[firsts]
+            self.dirty_tail[dirty[lasts]] = order[lasts]
+        self.max_dirty = int(self.dirty.max()) if self.total_blocks > 0 else 0
+
+    def get_dirty_buckets_state(self):
+        """
+        The blocks with the same number of dirty pages are ordered by modification time, but the blocks modified at
+        the same time keep the order of their modifications: it can't be computed again from the arrays.
+
+        :return: a dictionary with the arrays of the dirty-page buckets and the block modification times
+                 (see set_dirty_buckets_state), empty if the buckets are not enabled.
+        """
+        if self.dirty_next is None:
+            return dict()
+        return {name: getattr(self, name) for name, _ in self._get_dirty_buckets_shapes()}
+
+    def set_dirty_buckets_state(self, state):
+        """
+        Enable the dirty-page buckets restoring the state saved by get_dirty_buckets_state, ie: after set_arrays.
+
+        :param state: a dictionary like object of arrays.
+        :return:
+        """
+        if self.dirty_next is None:
+            self._allocate_dirty_buckets()
+        for name, shape in self._get_dirty_buckets_shapes():
+            if name not in state or state[name].shape != shape:
+                raise ValueError("Invalid dirty-page buckets state: missing or wrong '{}' array.".format(name))
+            getattr(self, name)[:] = state[name]
+        self.max_dirty = self.pages_per_block
+
+    def iter_dirty_bucket(self, dirty):
+        """
+        The dirty-page buckets must be enabled.
+
+        :param dirty: the number of dirty pages.
+        :return: an iterator on the blocks with the given number of dirty pages, from the least recently modified.
+        """
+        block = int(self.dirty_head[dirty])
+        while block >= 0:
+            yield block
+            block = int(self.dirty_next[block])
+
+    def _move_dirty_bucket(self, block, old_dirty, new_dirty):
+        """
+        Move a block to the end of the bucket of its new number of dirty pages.
+
+        :param block:
+        :param old_dirty: the previous number of dirty pages of the block.
+        :param new_dirty: the current number of dirty pages of the block.
+        :return:
+        """
+        block = int(block)
+        self.last_modified[block] = self.clock() if self.clock is not None else 0
+        next_blocks, prev_blocks = self.dirty_next, self.dirty_prev
+        if old_dirty > 0:
+            if old_dirty == new_dirty and self.dirty_tail.item(old_dirty) == block:
+                # already the last one
+                return
+
+            # unlink
+            prev, next_ = prev_blocks.item(block), next_blocks.item(block)
+            if prev >= 0:
+                next_blocks[prev] = next_
+            else:
+                self.dirty_head[old_dirty] = next_
+            if next_ >= 0:
+                prev_blocks[next_] = prev
+            else:
+                self.dirty_tail[old_dirty] = prev
+
+        if new_dirty > 0:
+            # append
+            tail = self.dirty_tail.item(new_dirty)
+            prev_blocks[block] = tail
+            next_blocks[block] = -1
+            if tail >= 0:
+                next_blocks[tail] = block
+            else:
+                self.dirty_head[new_dirty] = block
+            self.dirty_tail[new_dirty] = block
+            if new_dirty > self.max_dirty:
+                self.max_dirty = new_dirty
+        elif old_dirty > 0:
+            next_blocks[block] = -1
+            prev_blocks[block] = -1
+
+    def get_dirtiest_blocks(self, count=1, min_dirty=1):
+        """
+        The dirtiest blocks, from the highest number of dirty pages. Blocks with the same number of dirty pages are
+        returned from the least recently changed one. The dirty-page buckets must be enabled.
+
+        :param count: the maximum number of blocks, None for all of them.
+        :param min_dirty: the minimum number of dirty pages of a block.
+        :return: the list of blocks.
+        """
+        # lower the bound to the highest non empty bucket
+        while self.max_dirty > 0 and self.dirty_head[self.max_dirty] < 0:
+            self.max_dirty -= 1
+
+        blocks = list()
+        for d in range(self.max_dirty, max(min_dirty, 1) - 1, -1):
+            for block in self.iter_dirty_bucket(d):
+                if count is not None and len(blocks) >= count:
+                    return blocks
+                blocks.append(block)
+        return blocks
+
+    # WEAR INDEX
+    def enable_wear_index(self):
+        """
+        Build the wear index (the heaps of the blocks ordered by erase count). From now on it's updated by every
+        erase, so the least worn blocks are found without scanning the whole disk.
+
+        :return:
+        """
+        counts = self.erase_count.tolist()
+        self.free_heap = [(c, b) for b, c in enumerate(counts) if self.empty[b] == self.pages_per_block]
+        heapify(self.free_heap)
+        self.wear_heap = [(c, b) for b, c in enumerate(counts)]
+        heapify(self.wear_heap)
+        self.max_erase_count = max(counts) if counts else 0
+
+    def find_least_worn_empty_block(self):
+        """
+        The wear index must be enabled.
+
+        :return: the fully erased block with the lowest erase count, -1 if there are no fully erased blocks.
+        """
+        heap = self.free_heap
+        if len(heap) > 4 * self.total_blocks:
+            # too many stale entries
+            self.enable_wear_index()
+            heap = self.free_heap
+
+        while heap:
+            count, block = heap[0]
+            if self.empty[block] == self.pages_per_block and self.erase_count[block] == count:
+                return block
+            heappop(heap)
+        return -1
+
+    def get_least_worn_block(self):
+        """
+        The wear index must be enabled.
+
+        :return: the block with the lowest erase count (fully erased or not).
+        """
+        heap = self.wear_heap
+        if len(heap) > 4 * self.total_blocks:
+            # too many stale entries
+            self.enable_wear_index()
+            heap = self.wear_heap
+
+        while self.erase_count[heap[0][1]] != heap[0][0]:
+            heappop(heap)
+        return heap[0][1]
+
+    def get_erase_count_stats(self):
+        """
+
+        :return: a tuple with the highest, the lowest and the standard deviation of the erase counts.
+        """
+        return int(self.erase_count.max()), int(self.erase_count.min()), float(self.erase_count.std())
+
+    # PAGE MAPPING
+    def enable_page_mapping(self, logical_pages):
+        """
+        Allocate the logical to physical table and the reverse map. All logical pages are unmapped
+        (unless the state is restored from memory mapped files).
+
+        :param logical_pages: the number of logical pages addressable by the host.
+        :return:
+        """
+        self.l2p = self.allocate('l2p', (logical_pages, ), np.int64, -1)
+        self.p2l = self.allocate('p2l', (self.total_blocks * self.pages_per_block, ), np.int64, -1)
+
+    def map_page(self, lba, block, page):
+        """
+        Map a logical page to a physical page.
+
+        :param lba: the logical page.
+        :param block:
+        :param page:
+        :return:
+        """
+        ppn = block * self.pages_per_block + page
+        self.l2p[lba] = ppn
+        self.p2l[ppn] = lba
+
+    def unmap_page(self, lba):
+        """
+        Remove the mapping of a logical page.
+
+        :param lba: the logical page.
+        :return: the physical page number previously mapped, -1 if the page was not mapped.
+        """
+        ppn = int(self.l2p[lba])
+        if ppn >= 0:
+            self.l2p[lba] = -1
+            self.p2l[ppn] = -1
+        return ppn
+
+    def get_mapped_pages(self, block):
+        """
+
+        :param block:
+        :return: the array of the pages of the block holding valid logical data (from the reverse map).
+        """
+        start = block * self.pages_per_block
+        return np.flatnonzero(self.p2l[start:start + self.pages_per_block] >= 0)
+
+    # PAGE OPERATIONS
+    def get_page(self, block, page):
+        """
+
+        :param block:
+        :param page:
+        :return: the status code of the page.
+        """
+        return self.pages[block, page]
+
+    def program_page(self, block, page):
+        """
+        An empty page is written: it becomes in use and the block loses one empty page.
+
+        :param block:
+        :param page:
+        :return:
+        """
+        self.pages[block, page] = PAGE_IN_USE_CODE
+        self.free_pages[block, page >> 6] &= self._clear_page_bits[page & 63]
+        self.total_empty -= 1
+
+        e = self.empty[block]
+        self.empty[block] = e - 1
+        if e == self.pages_per_block or e == 1:
+            # the block is no longer fully erased or it has no more empty pages
+            self._update_block_pools(block, e, e - 1)
+
+        if self.dirty_next is not None:
+            # the block is modified: move it to the end of its bucket
+            d = self.dirty[block]
+            self._move_dirty_bucket(block, d, d)
+
+    def invalidate_page(self, block, page):
+        """
+        An in use page is invalidated: it becomes dirty and the block gains one dirty page.
+        The page must be in use (it's not tracked by the free-page index).
+
+        :param block:
+        :param page:
+        :return:
+        """
+        self.pages[block, page] = PAGE_DIRTY_CODE
+        d = self.dirty[block]
+        self.dirty[block] = d + 1
+        self.total_dirty += 1
+        if self.dirty_next is not None:
+            self._move_dirty_bucket(block, d, d + 1)
+
+    def mark_page(self, block, page, code):
+        """
+        Change the status of a page WITHOUT updating the block counters.
+
+        :param block:
+        :param page:
+        :param code: the new status code.
+        :return:
+        """
+        self.pages[block, page] = code
+        if code == PAGE_EMPTY_CODE:
+            self.free_pages[block, page >> 6] |= ~self._clear_page_bits[page & 63]
+        else:
+            self.free_pages[block, page >> 6] &= self._clear_page_bits[page & 63]
+
+    def find_empty_page(self, block):
+        """
+
+        :param block:
+        :return: the index of the first empty page of the block, -1 if there are no empty pages.
+        """
+        if self.pages_per_block <= 64:
+            # find first set: isolate the lowest bit set (-1 if there are none)
+            free = self.free_pages.item(block, 0)
+            return (free & -free).bit_length() - 1
+
+        for w, free in enumerate(self.free_pages[block].tolist()):
+            if free:
+                return (w << 6) | ((free & -free).bit_length() - 1)
+        return -1
+
+    # BLOCK OPERATIONS
+    def find_empty_block(self, die=-1, dies=1):
+        """
+
+        :param die: if not negative, the blocks b with b % dies == die are preferred (the blocks of a die).
+        :param dies: the number of dies.
+        :return: the index of the first fully erased block, -1 if there are no fully erased blocks.
+        """
+        if die >= 0:
+            if dies not in self._die_pools:
+                free = self.empty == self.pages_per_block
+                self._die_pools[dies] = [BlockBitmap(len(free[d::dies]), free[d::dies]) for d in range(dies)]
+            b = self._die_pools[dies][die].find_first()
+            if b >= 0:
+                return b * dies + die
+        return self.free_blocks.find_first()
+
+    def find_block_with_empty_pages(self, exclude=()):
+        """
+
+        :param exclude: the blocks to be skipped.
+        :return: the index of the first block with at least one empty page, -1 if there are no such blocks.
+        """
+        b = self.partial_blocks.find_first()
+        while b >= 0 and b in exclude:
+            b = self.partial_blocks.find_first(b + 1)
+        return b
+
+    def _update_block_pools(self, block, old_empty, new_empty):
+        """
+        Keep the free-block pool and the partial blocks bitmap updated after a change of the empty pages counter.
+
+        :param block:
+        :param old_empty: the previous number of empty pages of the block.
+        :param new_empty: the current number of empty pages of the block.
+        :return:
+        """
+        block = int(block)
+        if (old_empty == self.pages_per_block) != (new_empty == self.pages_per_block):
+            if new_empty == self.pages_per_block:
+                self.free_blocks.add(block)
+                for dies, pools in self._die_pools.items():
+                    pools[block % dies].add(block // dies)
+                self.free_block_count += 1
+                if self.free_heap is not None:
+                    heappush(self.free_heap, (int(self.erase_count[block]), block))
+            else:
+                self.free_blocks.discard(block)
+                for dies, pools in self._die_pools.items():
+                    pools[block % dies].discard(block // dies)
+                self.free_block_count -= 1
+
+        if (old_empty > 0) != (new_empty > 0):
+            if new_empty > 0:
+                self.partial_blocks.add(block)
+            else:
+                self.partial_blocks.discard(block)
+
+    def erase_block(self, block):
+        """
+        All the pages of the block are set to empty, the counters are reset.
+
+        :param block:
+        :return:
+        """
+        self.erase_count[block] += 1
+        e = int(self.empty[block])
+        self._update_block_pools(block, e, self.pages_per_block)
+        self.total_empty += self.pages_per_block - e
+        if self.wear_heap is not None:
+            count = int(self.erase_count[block])
+            heappush(self.wear_heap, (count, int(block)))
+            if count > self.max_erase_count:
+                self.max_erase_count = count
+            if e == self.pages_per_block:
+                # already in the free-block pool: a new entry with the new erase count
+                heappush(self.free_heap, (count, int(block)))
+        d = int(self.dirty[block])
+        self.total_dirty -= d
+        if self.dirty_next is not None:
+            self._move_dirty_bucket(block, d, 0)
+
+        self.pages[block].fill(PAGE_EMPTY_CODE)
+        self.free_pages[block] = self._all_pages_words
+        if self.p2l is not None:
+            self.p2l[block * self.pages_per_block:(block + 1) * self.pages_per_block] = -1
+        self.empty[block] = self.pages_per_block
+        self.dirty[block] = 0
+
+    def set_empty_count(self, block, value):
+        """
+
+        :param block:
+        :param value: the new number of empty pages of the block.
+        :return:
+        """
+        e = int(self.empty[block])
+        self._update_block_pools(block, e, value)
+        self.total_empty += value - e
+        self.empty[block] = value
+
+    def set_dirty_count(self, block, value):
+        """
+
+        :param block:
+        :param value: the new number of dirty pages of the block.
+        :return:
+        """
+        d = int(self.dirty[block])
+        self.total_dirty += value - d
+        self.dirty[block] = value
+        if self.dirty_next is not None:
+            self._move_dirty_bucket(block, d, value)
+
+    # STATISTICS
+    def number_of_empty_pages(self):
+        """
+
+        :return: the total number of empty pages, as counted by the block counters.
+        """
+        return self.total_empty
+
+    def number_of_dirty_pages(self):
+        """
+
+        :return: the total number of dirty pages, as counted by the block counters.
+        """
+        return self.total_dirty
+
+    def number_of_in_use_pages(self):
+        """
+
+        :return: the total number of pages neither empty nor dirty, as counted by the block counters.
+        """
+        return self.total_blocks * self.pages_per_block - self.total_empty - self.total_dirty
+
+
+# FTLBlockView class
+class FTLBlockView(object):
+    """
+    A single block of the FTL with the legacy dict interface:
+        block[page]:    the page status (PAGE_EMPTY, PAGE_IN_USE or PAGE_DIRTY);
+        block['empty']: total number of empty pages in the given block;
+        block['dirty']: total number of dirty pages in the given block.
+    """
+    __slots__ = ('_ftl', '_block')
+
+    def __init__(self, ftl, block):
+        self._ftl = ftl
+        self._block = block
+
+    def __getitem__(self, key):
+        if key == 'empty':
+            return int(self._ftl.empty[self._block])
+        if key == 'dirty':
+            return int(self._ftl.dirty[self._block])
+        return PAGE_CODE_TO_STATUS[self._ftl.pages[self._block, key]]
+
+    def __setitem__(self, key, value):
+        if key == 'empty':
+            self._ftl.set_empty_count(self._block, value)
+        elif key == 'dirty':
+            self._ftl.set_dirty_count(self._block, value)
+        else:
+            self._ftl.mark_page(self._block, key, PAGE_STATUS_TO_CODE[value])
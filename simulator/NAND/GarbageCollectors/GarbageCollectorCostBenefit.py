@@ -0,0 +1,62 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the cost-benefit Garbage Collector: the victims are the blocks with the best ratio between the space
+gained and the cost of the cleaning, weighted by the age of the data (the time since the last change of the block).
+"""
+
+# IMPORTS
+from heapq import heapify, heappush, heappop
+from simulator.NAND.GarbageCollectors.GarbageCollectorGreedy import GarbageCollectorGreedy
+
+
+class GarbageCollectorCostBenefit(GarbageCollectorGreedy):
+    """
+    The same conditions of the greedy garbage collector, but the victims are chosen by the cost-benefit score
+    (see get_gc_score) among the heads of the dirty-page buckets of the FTL.
+    """
+
+    # METHODS
+    def get_gc_name(self):
+        return "cost-benefit ({}, {}, {})".format(self.gc_param_mintime, self.gc_param_dirtiness,
+                                                  self.gc_param_victims)
+
+    def get_gc_score(self, block=0):
+        """
+        The cost-benefit score: (1 - u) * age / (1 + u), where u is the fraction of valid pages of the block.
+
+        :param block:
+        :return: the score, the higher the better.
+        """
+        valid = self.pages_per_block - int(self._ftl.empty[block]) - int(self._ftl.dirty[block])
+        age = self._elapsed_time - int(self._ftl.last_modified[block]) + 1
+        return (self.pages_per_block - valid) * age / (self.pages_per_block + valid)
+
+    def get_gc_victims(self, count=1, min_dirty=1):
+        """
+
+        :param count: the maximum number of blocks, None for all of them.
+        :param min_dirty: the minimum number of dirty pages of a block.
+        :return: the list of blocks to be cleaned, the best score first.
+        """
+        if self._ftl.dirty_next is None:
+            # first run: build the buckets
+            self._ftl.enable_dirty_buckets()
+
+        # the heads of the buckets, the next block of a bucket is scored when its head is taken
+        heads = self._ftl.dirty_head.tolist()
+        candidates = [(-self.get_gc_score(block=b), b) for b in heads[max(min_dirty, 1):] if b >= 0]
+        heapify(candidates)
+
+        victims = list()
+        while candidates and (count is None or len(victims) < count):
+            score, b = heappop(candidates)
+            victims.append(b)
+
+            b = int(self._ftl.dirty_next[b])
+            if b >= 0:
+                heappush(candidates, (-self.get_gc_score(block=b), b))
+
+        return victims
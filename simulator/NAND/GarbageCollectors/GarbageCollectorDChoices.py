@@ -0,0 +1,79 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the d-choices Garbage Collector: a randomized greedy garbage collector.
+"""
+
+# IMPORTS
+from random import Random
+from simulator.NAND.GarbageCollectors.GarbageCollectorGreedy import GarbageCollectorGreedy
+
+
+class GarbageCollectorDChoices(GarbageCollectorGreedy):
+    """
+    The same conditions of the greedy garbage collector, but the victims are the dirtiest of gc_param_choices random
+    blocks.
+    """
+
+    def __init__(self, mintime=500000, dirtiness='0.4', victims=1, choices=8, seed=None):
+        # ATTRIBUTES
+        # PARAMETERS
+        self.gc_param_choices = choices
+        """ The number of random blocks sampled to choose a single victim.
+            Is an integer value greater than zero.
+        """
+
+        # GARBAGE COLLECTOR INTERNAL STATE
+        self._gc_random = Random()
+        """ The random generator of the samples.
+        """
+
+        self.gc_param_seed = seed
+        """ The seed of the random generator (setting it restarts the generator), None for a random seed.
+        """
+
+        super().__init__(mintime, dirtiness, victims)
+
+    # PROPERTIES
+    @property
+    def gc_param_seed(self):
+        return self._gc_param_seed
+
+    @gc_param_seed.setter
+    def gc_param_seed(self, value):
+        self._gc_param_seed = value
+        self._gc_random.seed(value)
+
+    # METHODS
+    def get_gc_name(self):
+        return "d-choices ({}, {}, {}, {})".format(self.gc_param_mintime, self.gc_param_dirtiness,
+                                                   self.gc_param_victims, self.gc_param_choices)
+
+    def get_gc_victims(self, count=1, min_dirty=1):
+        """
+
+        :param count: the maximum number of blocks, None for the number of blocks.
+        :param min_dirty: the minimum number of dirty pages of a block.
+        :return: the list of blocks to be cleaned, the dirtiest first (at most one for every sample).
+        """
+        dirty = self._ftl.dirty
+        randrange = self._gc_random.randrange
+
+        victims = list()
+        for _ in range(self.total_blocks if count is None else count):
+            # the dirtiest block of the sample
+            best, best_dirty = -1, max(min_dirty, 1) - 1
+            for _ in range(self.gc_param_choices):
+                b = randrange(self.total_blocks)
+                d = dirty[b]
+                if d > best_dirty and b not in victims:
+                    best, best_dirty = b, d
+
+            if best >= 0:
+                victims.append(best)
+
+        # dirtiest first
+        victims.sort(key=lambda v: -dirty[v])
+        return victims
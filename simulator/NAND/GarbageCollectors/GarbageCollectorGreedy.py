@@ -0,0 +1,75 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the greedy Garbage Collector: it cleans the dirtiest blocks first. The victims are taken from the
+dirty-page buckets of the FTL (see FTLState.enable_dirty_buckets), so a gc run never scans the whole disk.
+"""
+
+# IMPORTS
+from simulator.NAND.GarbageCollectors.GarbageCollectorSimple import GarbageCollectorSimple
+
+
+class GarbageCollectorGreedy(GarbageCollectorSimple):
+    """
+    The same conditions of the simple garbage collector (minimum time between runs and minimum percentage of dirty
+    pages in a block), but only the dirtiest blocks are cleaned: at most gc_param_victims blocks per run.
+    """
+
+    def __init__(self, mintime=500000, dirtiness='0.4', victims=1):
+        # ATTRIBUTES
+        # PARAMETERS
+        self.gc_param_victims = victims
+        """ Maximum number of blocks cleaned by a single run of the garbage collector.
+            Is an integer value greater than zero, None to clean all the blocks over the dirtiness threshold.
+        """
+
+        super().__init__(mintime, dirtiness)
+
+    # METHODS
+    def get_gc_name(self):
+        return "greedy ({}, {}, {})".format(self.gc_param_mintime, self.gc_param_dirtiness, self.gc_param_victims)
+
+    def check_gc_run(self, force_run=False):
+        """
+
+        :return:
+        """
+        # a forced run doesn't wait: a write is failing
+        return force_run or super().check_gc_run(force_run=force_run)
+
+    def get_gc_victims(self, count=1, min_dirty=1):
+        """
+
+        :param count: the maximum number of blocks, None for all of them.
+        :param min_dirty: the minimum number of dirty pages of a block.
+        :return: the list of blocks to be cleaned, the dirtiest first.
+        """
+        if self._ftl.dirty_next is None:
+            # first run: build the buckets
+            self._ftl.enable_dirty_buckets()
+
+        return self._ftl.get_dirtiest_blocks(count=count, min_dirty=min_dirty)
+
+    def run_gc(self, force_run=False):
+        """
+
+        :return:
+        """
+        # check the overall conditions to execute the gc
+        if not self.check_gc_run(force_run=force_run):
+            return False
+
+        # if the force is set, we need at least a dirty page in a block
+        min_dirty = 1 if force_run else self.get_gc_dirty_threshold()
+
+        # the victims are chosen before cleaning them, as the cleaning changes the buckets
+        execution = False
+        for b in self.get_gc_victims(count=self.gc_param_victims, min_dirty=min_dirty):
+            if self.execute_gc_block(block=b):
+                execution = True
+
+        if execution:
+            self._last_run = self._elapsed_time
+        return execution
@@ -15,6 +15,20 @@ class GarbageCollectorInterface(NANDInterface, metaclass=ABCMeta):
     """
     To be written ...
     """
+
+    # GARBAGE COLLECTOR SCHEDULING
+    # run_gc is called before a host operation only if the simulation time reached _gc_next_run or the number of
+    # free blocks is less than _gc_low_watermark (or if the gc is forced by a failed write).
+    # With these defaults the gc is evaluated before every host operation: an event driven garbage collector
+    # overrides them (see GarbageCollectorWatermark).
+    _gc_next_run = 0
+    """ The next simulation time when the garbage collector must be evaluated [microseconds].
+    """
+
+    _gc_low_watermark = 0
+    """ The garbage collector must be evaluated when the number of free blocks is less than this value.
+    """
+
     # METHODS
     @abstractclassmethod
     def check_gc_run(self, force_run=False):
@@ -32,6 +46,23 @@ class GarbageCollectorInterface(NANDInterface, metaclass=ABCMeta):
     def get_gc_name(self):
         return NotImplemented
 
+    def reset_gc_schedule(self):
+        """
+        Restart the scheduling of the garbage collector from the time zero, ie: when the elapsed time is reset (see
+        BaseNANDDisk.reset_stats). Nothing to do by default.
+
+        :return:
+        """
+        pass
+
+    def get_gc_stats(self):
+        """
+
+        :return: the extra counters of the garbage collector as a list of tuples (name, value) (see
+                 BaseNANDDisk.get_extra_stats), empty by default.
+        """
+        return []
+
     def run_gc(self, force_run=False):
         """
 
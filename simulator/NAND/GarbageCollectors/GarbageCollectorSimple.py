@@ -8,7 +8,7 @@ only if a certain amount of time is passed after the last gc execution.
 """
 
 # IMPORTS
-from decimal import Decimal, getcontext
+from decimal import Decimal, getcontext, ROUND_CEILING
 from simulator.NAND.GarbageCollectors.GarbageCollectorInterface import GarbageCollectorInterface
 from simulator.NAND.common import check_block, DECIMAL_PRECISION, PAGE_IN_USE, PAGE_EMPTY
 
@@ -17,6 +17,11 @@ class GarbageCollectorSimple(GarbageCollectorInterface):
     """
     To be written ...
     """
+
+    _STATE_ATTRIBUTES = ('_last_run', )
+    """ The internal attributes saved by save_state (see BaseNANDDisk).
+    """
+
     def __init__(self, mintime=500000, dirtiness='0.4'):
         getcontext().prec = DECIMAL_PRECISION
 
@@ -28,7 +33,13 @@ class GarbageCollectorSimple(GarbageCollectorInterface):
             If this value is zero then the gc is always executed.
         """
 
-        self.gc_param_dirtiness = Decimal(dirtiness)  # 40 % (see simulation/simple_gc_test)
+        self._gc_dirty_threshold = None
+        """ The minimum number of dirty pages in a block to execute the garbage collector.
+            It's the integer equivalent of self.gc_param_dirtiness, computed when first needed (see
+            get_gc_dirty_threshold). None when not yet computed.
+        """
+
+        self.gc_param_dirtiness = dirtiness  # 40 % (see simulation/simple_gc_test)
         """ Minimum percentage of dirty pages in a block to execute the garbage collector.
             It's a Decimal value and must be greater than 0 and maximum equal to 1.
             If it's equal to 1 then a block is cleaned only if all pages are dirty.
@@ -42,10 +53,50 @@ class GarbageCollectorSimple(GarbageCollectorInterface):
 
         super().__init__()
 
+    # PROPERTIES
+    @property
+    def gc_param_dirtiness(self):
+        return self._gc_param_dirtiness
+
+    @gc_param_dirtiness.setter
+    def gc_param_dirtiness(self, value):
+        self._gc_param_dirtiness = Decimal(value)
+        self._gc_dirty_threshold = None  # to be computed again
+
     # METHODS
+    def get_gc_dirty_threshold(self):
+        """
+        The smallest number of dirty pages d such that d / pages_per_block >= gc_param_dirtiness.
+        This is computed once with the same Decimal arithmetic, so the gc check is just an integer comparison.
+
+        :return: the integer threshold.
+        """
+        if self._gc_dirty_threshold is None:
+            def over(d):
+                return Decimal(d) / Decimal(self.pages_per_block) >= self._gc_param_dirtiness
+
+            # start from the rounded up product and fix it if the Decimal division disagree
+            threshold = int(max(min((self._gc_param_dirtiness * self.pages_per_block).to_integral_value(
+                rounding=ROUND_CEILING), self.pages_per_block + 1), 0))
+            while threshold > 0 and over(threshold - 1):
+                threshold -= 1
+            while threshold <= self.pages_per_block and not over(threshold):
+                threshold += 1
+
+            self._gc_dirty_threshold = threshold
+
+        return self._gc_dirty_threshold
+
     def get_gc_name(self):
         return "simple ({}, {})".format(self.gc_param_mintime, self.gc_param_dirtiness)
 
+    def reset_gc_schedule(self):
+        """
+
+        :return:
+        """
+        self._last_run = 0
+
     def check_gc_run(self, force_run=False):
         """
 
@@ -64,11 +115,15 @@ class GarbageCollectorSimple(GarbageCollectorInterface):
         :return:
         """
         # if the force is set, we need at least a dirty page in a block
-        if force_run and self._ftl[block]['dirty'] > 0:
+        if force_run and self._ftl.dirty[block] > 0:
             return True
 
         # check the percentage of dirty pages of this block
-        if Decimal(self._ftl[block]['dirty']) / Decimal(self.pages_per_block) >= self.gc_param_dirtiness:
+        threshold = self._gc_dirty_threshold
+        if threshold is None:
+            threshold = self.get_gc_dirty_threshold()
+
+        if self._ftl.dirty[block] >= threshold:
             return True
         return False
 
@@ -79,6 +134,10 @@ class GarbageCollectorSimple(GarbageCollectorInterface):
         :param block:
         :return:
         """
+        # page mapping: just move the valid pages to the write frontier
+        if self.page_mapping:
+            return self.relocate_block(block=block)
+
         # STEP 1: temporary copy the block data
         #         this is a read and only useful data are read
         temp_block = dict()
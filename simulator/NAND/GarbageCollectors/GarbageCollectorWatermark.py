@@ -0,0 +1,133 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the watermark Garbage Collector: an event driven garbage collector, evaluated only when the free-block
+pool goes under a low watermark or when its timer expires, instead of before every host operation.
+"""
+
+# IMPORTS
+from simulator.NAND.GarbageCollectors.GarbageCollectorGreedy import GarbageCollectorGreedy
+
+
+class GarbageCollectorWatermark(GarbageCollectorGreedy):
+    """
+    The garbage collector has two triggers:
+        foreground: when the free blocks are less than the low watermark, the dirtiest blocks are cleaned until the
+                    free blocks reach the high watermark (page mapping mode only);
+        background: every gc_param_interval microseconds at most gc_param_victims blocks over the dirtiness
+                    threshold are cleaned (as the greedy garbage collector).
+    """
+
+    _STATE_ATTRIBUTES = ('_gc_next_run', '_gc_low_watermark')
+    """ The internal attributes saved by save_state (see BaseNANDDisk).
+    """
+
+    def __init__(self, low_watermark=2, high_watermark=4, interval=500000, dirtiness='0.4', victims=1):
+        # ATTRIBUTES
+        # PARAMETERS
+        self.gc_param_low_watermark = low_watermark
+        """ The foreground gc starts when the number of free blocks is less than this value.
+            Is an integer value greater or equal zero, zero to disable the foreground gc.
+        """
+
+        self.gc_param_high_watermark = high_watermark
+        """ The foreground gc stops when the number of free blocks reaches this value.
+            Is an integer value greater or equal the low watermark.
+        """
+
+        # GARBAGE COLLECTOR INTERNAL STATE
+        self._gc_next_run = 0
+        """ The next run of the background gc (see GarbageCollectorInterface).
+            It's in microseconds (10^-6), infinite if the background gc is disabled.
+        """
+
+        self.gc_param_interval = interval
+        """ The time between two runs of the background gc (setting it restarts the timer).
+            It's in microseconds (10^-6). Is an integer value greater than zero, None to disable the background gc.
+        """
+
+        super().__init__(0, dirtiness, victims)
+
+    # PROPERTIES
+    @property
+    def gc_param_low_watermark(self):
+        return self._gc_param_low_watermark
+
+    @gc_param_low_watermark.setter
+    def gc_param_low_watermark(self, value):
+        self._gc_param_low_watermark = value
+        self._gc_low_watermark = value  # the scheduler trigger, disabled by run_gc in physical mode
+
+    @property
+    def gc_param_interval(self):
+        return self._gc_param_interval
+
+    @gc_param_interval.setter
+    def gc_param_interval(self, value):
+        self._gc_param_interval = value
+        self._gc_next_run = 0 if value is not None else float('inf')
+
+    # METHODS
+    def get_gc_name(self):
+        return "watermark ({}, {}, {}, {}, {})".format(self.gc_param_low_watermark, self.gc_param_high_watermark,
+                                                      self.gc_param_interval, self.gc_param_dirtiness,
+                                                      self.gc_param_victims)
+
+    def reset_gc_schedule(self):
+        """
+        The background gc timer starts again, as for a new disk.
+
+        :return:
+        """
+        super().reset_gc_schedule()
+        self._gc_next_run = 0 if self.gc_param_interval is not None else float('inf')
+
+    def check_gc_run(self, force_run=False):
+        """
+
+        :return:
+        """
+        # the foreground gc, the background one is scheduled by its timer
+        return force_run or (self.page_mapping and
+                             self._ftl.free_block_count - self.get_frontier_reserve() < self.gc_param_low_watermark)
+
+    def run_gc(self, force_run=False):
+        """
+
+        :return:
+        """
+        execution = False
+        reserve = self.get_frontier_reserve()
+
+        # FOREGROUND: up to the high watermark
+        if self.check_gc_run(force_run=force_run):
+            while self._ftl.free_block_count - reserve < self.gc_param_high_watermark or force_run:
+                # every victim can free at most one block, the victims are chosen before cleaning them
+                needed = max(self.gc_param_high_watermark - self._ftl.free_block_count + reserve, 1)
+                cleaned = False
+                for b in self.get_gc_victims(count=needed, min_dirty=1):
+                    if self.execute_gc_block(block=b):
+                        cleaned = True
+
+                if not cleaned:
+                    # no more dirty blocks to be cleaned
+                    break
+                execution = True
+                force_run = False  # a forced run cleans at least one block, then it's a normal foreground run
+
+        # BACKGROUND: the timer expired
+        if self._elapsed_time >= self._gc_next_run:
+            for b in self.get_gc_victims(count=self.gc_param_victims, min_dirty=self.get_gc_dirty_threshold()):
+                if self.execute_gc_block(block=b):
+                    execution = True
+            self._gc_next_run = self._elapsed_time + self.gc_param_interval
+
+        if not self.page_mapping:
+            # no watermarks in physical mode
+            self._gc_low_watermark = 0
+        else:
+            self._gc_low_watermark = self.gc_param_low_watermark + reserve
+
+        return execution
@@ -0,0 +1,135 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is a log-bucketed latency histogram (HDR style).
+"""
+
+# IMPORTS
+from decimal import Decimal, ROUND_CEILING
+
+
+# PERCENTILES
+LATENCY_PERCENTILES = (('p50', '50'), ('p99', '99'), ('p999', '99.9'))
+""" The percentiles of the statistics (see BaseNANDDisk.get_latency_stats): a tuple (name, percentile).
+"""
+
+
+# LatencyHistogram class
+class LatencyHistogram(object):
+    """
+    The values lower than 2 ** (precision + 1) have their own bucket. Every other power of two range is split in
+    2 ** precision buckets, so a value is reported with a relative error lower than 2 ** -precision.
+    """
+
+    # CONSTRUCTOR
+    def __init__(self, precision=7):
+        """
+
+        :param precision: the number of bits of the sub-buckets of every power of two range.
+        :return:
+        """
+        if precision < 1:
+            raise ValueError("Invalid histogram precision: at least one bit needed.")
+
+        # ATTRIBUTES
+        self.precision = precision
+        """ The number of bits of the sub-buckets (see the class description). Is an integer value greater than zero.
+        """
+
+        self.count = 0
+        """ The number of recorded values.
+        """
+
+        self.total = 0
+        """ The sum of the recorded values.
+        """
+
+        self.max = 0
+        """ The highest recorded value.
+        """
+
+        self._exact = 2 << precision
+        """ The values lower than this one have their own bucket.
+        """
+
+        self._counts = [0] * self._exact
+        """ The number of values of every bucket, extended when needed (see record).
+        """
+
+    # METHODS
+    def __len__(self):
+        return self.count
+
+    def get_bucket(self, value):
+        """
+
+        :param value: a non negative integer.
+        :return: the index of the bucket of the value.
+        """
+        if value < self._exact:
+            return value
+
+        shift = value.bit_length() - self.precision - 1
+        return (shift << self.precision) + (value >> shift)
+
+    def get_bucket_limit(self, bucket):
+        """
+
+        :param bucket: the index of a bucket.
+        :return: the highest value of the bucket.
+        """
+        if bucket < self._exact:
+            return bucket
+
+        shift = (bucket >> self.precision) - 1
+        return ((bucket - (shift << self.precision) + 1) << shift) - 1
+
+    def record(self, value):
+        """
+        Record a value.
+
+        :param value: a non negative integer, ie: a latency [microseconds].
+        :return:
+        """
+        bucket = self.get_bucket(value)
+        if bucket >= len(self._counts):
+            self._counts.extend([0] * (bucket + 1 - len(self._counts)))
+        self._counts[bucket] += 1
+
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percentile='50'):
+        """
+
+        :param percentile: the percentile, a value between 0 and 100 (as a string, ie: '99.9').
+        :return: the highest value of the bucket of the percentile (no more than the highest recorded value), zero
+                 if there are no values.
+        """
+        if self.count <= 0:
+            return 0
+
+        # the rank of the value, at least the first one
+        rank = int((Decimal(percentile) * self.count / 100).to_integral_value(rounding=ROUND_CEILING))
+        rank = min(max(rank, 1), self.count)
+
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self.get_bucket_limit(bucket), self.max)
+        return self.max
+
+    def reset(self):
+        """
+
+        :return:
+        """
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self._counts = [0] * self._exact
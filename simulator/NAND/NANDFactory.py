@@ -8,29 +8,73 @@ Generates new NAND with custom Policies and Garbage Collectors
 
 # IMPORTS
 from decimal import Decimal
+from inspect import unwrap
 from simulator.NAND.BaseNANDDisk import BaseNANDDisk
+from simulator.NAND.WriteBuffer import WRITEBUFFER_LRU, WRITEBUFFER_FIFO
+from simulator.NAND.ReadCache import READCACHE_LRU, READCACHE_ARC
+from simulator.NAND.Components.ComponentReadCache import ComponentReadCache
+from simulator.NAND.Components.ComponentWriteBuffer import ComponentWriteBuffer
+from simulator.NAND.Components.ComponentLatencyHistograms import ComponentLatencyHistograms
+from simulator.NAND.Components.ComponentHostQueue import ComponentHostQueue
+from simulator.NAND.Components.ComponentTimeline import ComponentTimeline
+from simulator.NAND.common import WEARLEVELING_NONE, WEARLEVELING_DYNAMIC, WEARLEVELING_STATIC
 from simulator.NAND.WritePolicies.WritePolicyDefault import WritePolicyDefault
 from simulator.NAND.WritePolicies.WritePolicyInPlace import WritePolicyInPlace
 from simulator.NAND.WritePolicies.WritePolicyInPlaceNoErase import WritePolicyInPlaceNoErase
+from simulator.NAND.WritePolicies.WritePolicyLogStructured import WritePolicyLogStructured
+from simulator.NAND.WritePolicies.WritePolicyMultiStream import WritePolicyMultiStream
 from simulator.NAND.GarbageCollectors.GarbageCollectorNone import GarbageCollectorNone
 from simulator.NAND.GarbageCollectors.GarbageCollectorSimple import GarbageCollectorSimple
+from simulator.NAND.GarbageCollectors.GarbageCollectorGreedy import GarbageCollectorGreedy
+from simulator.NAND.GarbageCollectors.GarbageCollectorCostBenefit import GarbageCollectorCostBenefit
+from simulator.NAND.GarbageCollectors.GarbageCollectorWatermark import GarbageCollectorWatermark
+from simulator.NAND.GarbageCollectors.GarbageCollectorDChoices import GarbageCollectorDChoices
 
 # SETTINGS
 # WRITE POLICY
 WRITEPOLICY_DEFAULT = 'WP_DEFAULT'
 WRITEPOLICY_INPLACE = 'WP_IP'
 WRITEPOLICY_INPLACE_NOERASE = 'WP_IP_NE'
+WRITEPOLICY_LOGSTRUCTURED = 'WP_LS'
+WRITEPOLICY_MULTISTREAM = 'WP_MS'
 
 # GARBAGE COLLECTOR
 GARBAGECOLLECTOR_NONE = 'GC_NONE'
 GARBAGECOLLECTOR_SIMPLE = 'GC_SIMPLE'
+GARBAGECOLLECTOR_GREEDY = 'GC_GREEDY'
+GARBAGECOLLECTOR_COSTBENEFIT = 'GC_COSTBENEFIT'
+GARBAGECOLLECTOR_WATERMARK = 'GC_WATERMARK'
+GARBAGECOLLECTOR_DCHOICES = 'GC_DCHOICES'
+
+# COMPONENTS
+COMPONENT_READCACHE = 'C_RC'
+COMPONENT_WRITEBUFFER = 'C_WB'
+COMPONENT_LATENCYHISTOGRAMS = 'C_LH'
+COMPONENT_HOSTQUEUE = 'C_QD'
+COMPONENT_TIMELINE = 'C_TL'
+
+# The component mixins come before BaseNANDDisk, in this order: a component extends the methods of the next ones.
+COMPONENTS = ((COMPONENT_READCACHE, ComponentReadCache, "RC"), (COMPONENT_WRITEBUFFER, ComponentWriteBuffer, "WB"),
+              (COMPONENT_LATENCYHISTOGRAMS, ComponentLatencyHistograms, "LH"),
+              (COMPONENT_HOSTQUEUE, ComponentHostQueue, "QD"), (COMPONENT_TIMELINE, ComponentTimeline, "TL"))
+
+# HOST API
+# The methods called by the host: their parameters are always validated, even in a trusted class.
+HOST_API = ('host_write_page', 'host_read_page', 'host_trim_page')
 
 
 # FUNCTIONS
-def get_class(writepolicy=WRITEPOLICY_DEFAULT, garbagecollector=GARBAGECOLLECTOR_NONE):
+def get_class(writepolicy=WRITEPOLICY_DEFAULT, garbagecollector=GARBAGECOLLECTOR_NONE, trusted=False,
+              components=()):
     """
 
     :param writepolicy:
+    :param garbagecollector:
+    :param trusted: if True the block\page validation (check_block and check_page decorators) is removed from
+                    every internal method: only the HOST_API methods are still validated.
+                    The internal calls are issued by the disk itself, so their parameters are valid by construction:
+                    set it to True for the long simulations, once the write policy and the garbage collector work.
+    :param components: the COMPONENT_* of the disk. The host queue needs the timeline.
     :return:
     """
     classname = "NANDDisk"
@@ -44,6 +88,12 @@ def get_class(writepolicy=WRITEPOLICY_DEFAULT, garbagecollector=GARBAGECOLLECTOR
     elif writepolicy == WRITEPOLICY_INPLACE_NOERASE:
         wp = WritePolicyInPlaceNoErase
         classname += "WPIPNE"
+    elif writepolicy == WRITEPOLICY_LOGSTRUCTURED:
+        wp = WritePolicyLogStructured
+        classname += "WPLS"
+    elif writepolicy == WRITEPOLICY_MULTISTREAM:
+        wp = WritePolicyMultiStream
+        classname += "WPMS"
     elif writepolicy != WRITEPOLICY_DEFAULT:
         raise ValueError("Invalid write policy")
 
@@ -51,28 +101,133 @@ def get_class(writepolicy=WRITEPOLICY_DEFAULT, garbagecollector=GARBAGECOLLECTOR
     if garbagecollector == GARBAGECOLLECTOR_SIMPLE:
         gc = GarbageCollectorSimple
         classname += "GCS"
+    elif garbagecollector == GARBAGECOLLECTOR_GREEDY:
+        gc = GarbageCollectorGreedy
+        classname += "GCG"
+    elif garbagecollector == GARBAGECOLLECTOR_COSTBENEFIT:
+        gc = GarbageCollectorCostBenefit
+        classname += "GCCB"
+    elif garbagecollector == GARBAGECOLLECTOR_WATERMARK:
+        gc = GarbageCollectorWatermark
+        classname += "GCW"
+    elif garbagecollector == GARBAGECOLLECTOR_DCHOICES:
+        gc = GarbageCollectorDChoices
+        classname += "GCDC"
     elif garbagecollector != GARBAGECOLLECTOR_NONE:
         raise ValueError("Invalid garbage collector")
 
+    # GET THE COMPONENTS
+    bases = tuple()
+    for name, component, suffix in COMPONENTS:
+        if name in components:
+            bases += (component, )
+            classname += suffix
+    if COMPONENT_HOSTQUEUE in components and COMPONENT_TIMELINE not in components:
+        raise ValueError("The host queue needs the timeline component")
+    bases += (BaseNANDDisk, wp, gc)
+
     # ASSEMBLE THE CLASS
-    return type(classname, (BaseNANDDisk, wp, gc), {})
+    cls = type(classname, bases, {})
+
+    if trusted:
+        # override every validated method with the original one, but the host API
+        attributes = dict()
+        for name in dir(cls):
+            method = getattr(cls, name)
+            if name not in HOST_API and hasattr(method, '__wrapped__'):
+                attributes[name] = unwrap(method)
+
+        cls = type(classname, bases, attributes)
+
+    return cls
 
 
 def get_instance(writepolicy=WRITEPOLICY_DEFAULT, garbagecollector=GARBAGECOLLECTOR_NONE,
                  total_blocks=256, pages_per_block=128, page_size=4096,
-                 write_page_time=40, read_page_time=20, erase_block_time=1500, gc_params=None):
+                 write_page_time=40, read_page_time=20, erase_block_time=1500, gc_params=None, trusted=False,
+                 over_provisioning=None, ftl_path=None, wp_params=None, write_buffer_pages=0,
+                 write_buffer_policy=WRITEBUFFER_LRU, wear_leveling=WEARLEVELING_NONE, wear_leveling_threshold=32,
+                 channels=1, dies=1, planes=1, transfer_page_time=0, queue_depth=None,
+                 latency_histograms=False, read_cache_pages=0, read_cache_policy=READCACHE_LRU,
+                 read_cache_hit_time=1):
     """
 
     :param writepolicy:
+    :param trusted: see get_class.
+    :param over_provisioning: if not None, the disk works in page mapping mode with this fraction of spare blocks
+                              (see BaseNANDDisk). In page mapping mode the write policy only chooses the write
+                              frontier (see WritePolicyInterface.get_write_frontier).
+    :param ftl_path: if not None, the directory of the memory mapped FTL (see BaseNANDDisk).
+    :param wp_params: the write policy parameters, ie: {'streams': 2, 'classifier': StreamClassifierHost()} for the
+                      multi-stream policy.
+    :param write_buffer_pages: if greater than zero, the size of the write buffer in pages (see
+                               ComponentWriteBuffer).
+    :param write_buffer_policy: the flush policy of the write buffer, WRITEBUFFER_LRU or WRITEBUFFER_FIFO.
+    :param wear_leveling: the wear leveling mode, WEARLEVELING_NONE, WEARLEVELING_DYNAMIC or WEARLEVELING_STATIC
+                          (see BaseNANDDisk).
+    :param wear_leveling_threshold: the erase count gap of the static wear leveling.
+    :param channels: the number of channels, every one with the given number of dies (see BaseNANDDisk). With more
+                     dies or planes, or with a transfer time, the operations follow the parallel timeline (see
+                     ComponentTimeline).
+    :param dies: the number of dies of every channel.
+    :param planes: the number of planes of every die (the programs and the erases can be multi-plane operations).
+    :param transfer_page_time: the time to transfer a page on a channel.
+    :param queue_depth: if not None, the host requests are queued with this queue depth (see ComponentHostQueue).
+    :param latency_histograms: if True, record the latency histograms of the host operations (see
+                               ComponentLatencyHistograms).
+    :param read_cache_pages: if greater than zero, the size of the read cache in pages (see ComponentReadCache).
+    :param read_cache_policy: the eviction policy of the read cache, READCACHE_LRU or READCACHE_ARC.
+    :param read_cache_hit_time: the time of a read served by the read cache.
     :return:
     """
+    # the components and their parameters
+    components = list()
+    params = dict()
+    if read_cache_pages > 0:
+        components.append(COMPONENT_READCACHE)
+        params.update(read_cache_pages=read_cache_pages, read_cache_policy=read_cache_policy,
+                      read_cache_hit_time=read_cache_hit_time)
+    if write_buffer_pages > 0:
+        components.append(COMPONENT_WRITEBUFFER)
+        params.update(write_buffer_pages=write_buffer_pages, write_buffer_policy=write_buffer_policy)
+    if latency_histograms:
+        components.append(COMPONENT_LATENCYHISTOGRAMS)
+    if queue_depth is not None:
+        components.append(COMPONENT_HOSTQUEUE)
+        params.update(queue_depth=queue_depth)
+    if channels * dies > 1 or planes > 1 or transfer_page_time > 0 or queue_depth is not None:
+        components.append(COMPONENT_TIMELINE)
+
     # create the instance
-    obj = get_class(writepolicy, garbagecollector)(  # here the parameters to the constructor
-        total_blocks, pages_per_block, page_size, write_page_time, read_page_time, erase_block_time)
+    obj = get_class(writepolicy, garbagecollector, trusted, components)(  # here the parameters to the constructor
+        total_blocks, pages_per_block, page_size, write_page_time, read_page_time, erase_block_time,
+        over_provisioning, ftl_path, wear_leveling, wear_leveling_threshold, channels, dies, planes,
+        transfer_page_time, **params)
+
+    # set the Write Policy parameters
+    if writepolicy == WRITEPOLICY_MULTISTREAM and wp_params is not None:
+        obj.wp_param_streams = wp_params['streams']
+        if 'classifier' in wp_params:
+            obj.wp_param_classifier = wp_params['classifier']
 
     # set the Garbage Collector parameters
-    if garbagecollector == GARBAGECOLLECTOR_SIMPLE and gc_params is not None:
+    if garbagecollector in (GARBAGECOLLECTOR_SIMPLE, GARBAGECOLLECTOR_GREEDY, GARBAGECOLLECTOR_COSTBENEFIT,
+                            GARBAGECOLLECTOR_DCHOICES) and gc_params is not None:
         obj.gc_param_mintime = gc_params['mintime']
         obj.gc_param_dirtiness = Decimal(gc_params['dirtiness'])
+    if garbagecollector in (GARBAGECOLLECTOR_GREEDY, GARBAGECOLLECTOR_COSTBENEFIT, GARBAGECOLLECTOR_DCHOICES) \
+            and gc_params is not None and 'victims' in gc_params:
+        obj.gc_param_victims = gc_params['victims']
+    if garbagecollector == GARBAGECOLLECTOR_DCHOICES and gc_params is not None:
+        obj.gc_param_choices = gc_params['choices']
+        if 'seed' in gc_params:
+            obj.gc_param_seed = gc_params['seed']
+    if garbagecollector == GARBAGECOLLECTOR_WATERMARK and gc_params is not None:
+        obj.gc_param_low_watermark = gc_params['low']
+        obj.gc_param_high_watermark = gc_params['high']
+        obj.gc_param_interval = gc_params['interval']
+        obj.gc_param_dirtiness = Decimal(gc_params['dirtiness'])
+        if 'victims' in gc_params:
+            obj.gc_param_victims = gc_params['victims']
 
     return obj
@@ -28,6 +28,10 @@ class NANDInterface(metaclass=ABCMeta):
         self.write_page_time = None
         self.read_page_time = None
         self.erase_block_time = None
+        self.page_mapping = None
+        self.over_provisioning = None
+        self.host_blocks = None
+        self.spare_blocks = None
         self._elapsed_time = None
         self._host_page_write_request = None
         self._page_write_executed = None
@@ -89,6 +93,10 @@ class NANDInterface(metaclass=ABCMeta):
         return NotImplemented
 
     # RAW DISK OPERATIONS
+    @abstractclassmethod
+    def charge_operation(self, block=0, duration=0, transfer=False, multiplane=False):
+        return NotImplemented
+
     @abstractclassmethod
     def raw_write_page(self, block=0, page=0):
         return NotImplemented
@@ -0,0 +1,327 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the controller read cache (DRAM): the pages read from the flash memory are kept in memory, so the next reads
+of the same pages are served without a flash read.
+"""
+
+# IMPORTS
+from collections import OrderedDict
+
+
+# EVICTION POLICIES
+READCACHE_LRU = 'LRU'
+""" When the cache is full, the least recently read page is evicted.
+"""
+
+READCACHE_ARC = 'ARC'
+""" Adaptive Replacement Cache (Megiddo and Modha, 2003): the cache is split between the pages read once (recency) and
+    the pages read more than once (frequency), the split follows the hits on the recently evicted pages (ghosts).
+    A scan of pages read once can't evict the pages read more than once.
+"""
+
+
+# ReadCache class
+class ReadCache(object):
+    """
+    The cached pages are physical addresses (block, page), dropped when their data changes (see invalidate) or their
+    block is erased (see invalidate_block). The time of a hit is charged by the disk (see ComponentReadCache).
+    """
+
+    # CONSTRUCTOR
+    def __init__(self, capacity=256, policy=READCACHE_LRU):
+        """
+
+        :param capacity: the number of pages of the cache.
+        :param policy: the eviction policy (see READCACHE_*).
+        :return:
+        """
+        if capacity < 1:
+            raise ValueError("Invalid read cache capacity: at least one page needed.")
+        if policy not in (READCACHE_LRU, READCACHE_ARC):
+            raise ValueError("Invalid read cache policy.")
+
+        # ATTRIBUTES
+        self.capacity = capacity
+        """ The number of pages of the cache. Is an integer value greater than zero.
+        """
+
+        self.policy = policy
+        """ The eviction policy (see READCACHE_*).
+        """
+
+        self.hits = 0
+        """ Number of reads served by the cache.
+        """
+
+        self.misses = 0
+        """ Number of reads of pages not in the cache.
+        """
+
+        self.evictions = 0
+        """ Number of pages evicted to make room for a new one.
+        """
+
+        self._recent = OrderedDict()
+        """ The cached pages read once since they were cached, in eviction order: the first one is the next victim.
+            With the LRU policy all the cached pages are here.
+        """
+
+        self._frequent = OrderedDict()
+        """ The cached pages read more than once, in eviction order (ARC only).
+        """
+
+        self._recent_ghosts = OrderedDict()
+        """ The addresses of the last pages evicted from self._recent (ARC only).
+        """
+
+        self._frequent_ghosts = OrderedDict()
+        """ The addresses of the last pages evicted from self._frequent (ARC only).
+        """
+
+        self._target = 0
+        """ The target size of self._recent, adapted by the hits on the ghosts (ARC only).
+        """
+
+        self._blocks = dict()
+        """ The cached pages of every block: block -> set of pages.
+        """
+
+        self._ghost_blocks = dict()
+        """ The ghost pages of every block: block -> set of pages (ARC only).
+        """
+
+    # METHODS
+    def __len__(self):
+        return len(self._recent) + len(self._frequent)
+
+    def __contains__(self, address):
+        return address in self._recent or address in self._frequent
+
+    def get_description(self):
+        """
+
+        :return: a short description of the cache.
+        """
+        return "{} pages ({})".format(self.capacity, self.policy)
+
+    def lookup(self, block, page):
+        """
+        Search a page read by the host: a hit refreshes the page.
+
+        :param block:
+        :param page:
+        :return: True if the page is cached (a hit).
+        """
+        address = (block, page)
+        if address in self._recent:
+            self.hits += 1
+            if self.policy == READCACHE_LRU:
+                self._recent.move_to_end(address)
+            else:
+                # the second read: the page is promoted to the frequent pages
+                del self._recent[address]
+                self._frequent[address] = True
+            return True
+
+        if address in self._frequent:
+            self.hits += 1
+            self._frequent.move_to_end(address)
+            return True
+
+        self.misses += 1
+        return False
+
+    def insert(self, block, page):
+        """
+        Cache a page read from the flash memory after a miss (see lookup). If the cache is full a page is evicted.
+
+        :param block:
+        :param page:
+        :return:
+        """
+        address = (block, page)
+        if address in self:
+            return
+
+        if self.policy == READCACHE_LRU:
+            if len(self._recent) >= self.capacity:
+                self.evict(self._recent)
+            self._recent[address] = True
+        else:
+            self.insert_arc(address)
+        self._blocks.setdefault(block, set()).add(page)
+
+    def insert_arc(self, address):
+        """
+        The ARC insertion of a missed page (see READCACHE_ARC).
+
+        :param address:
+        :return:
+        """
+        capacity = self.capacity
+        if address in self._recent_ghosts:
+            # the recent pages were evicted too early
+            self._target = min(capacity, self._target + max(len(self._frequent_ghosts) // len(self._recent_ghosts),
+                                                            1))
+            self.forget_ghost(self._recent_ghosts, address)
+            self.replace(False)
+            self._frequent[address] = True
+            return
+
+        if address in self._frequent_ghosts:
+            # the frequent pages were evicted too early
+            self._target = max(0, self._target - max(len(self._recent_ghosts) // len(self._frequent_ghosts), 1))
+            self.forget_ghost(self._frequent_ghosts, address)
+            self.replace(True)
+            self._frequent[address] = True
+            return
+
+        recent = len(self._recent) + len(self._recent_ghosts)
+        total = recent + len(self._frequent) + len(self._frequent_ghosts)
+        if recent >= capacity:
+            if len(self._recent) < capacity:
+                self.forget_ghost(self._recent_ghosts)
+                self.replace(False)
+            else:
+                self.evict(self._recent)
+        elif total >= capacity:
+            if total >= 2 * capacity:
+                self.forget_ghost(self._frequent_ghosts)
+            self.replace(False)
+        self._recent[address] = True
+
+    def replace(self, frequent_ghost):
+        """
+        Make room for a page if the cache is full: the victim is the first recent page if there are more recent
+        pages than the target, otherwise the first frequent page. The victim address becomes a ghost (ARC only).
+
+        :param frequent_ghost: True if the new page was a frequent ghost.
+        :return:
+        """
+        if len(self) < self.capacity:
+            return
+
+        recent = len(self._recent)
+        if recent > 0 and (not self._frequent or recent > self._target or
+                           (frequent_ghost and recent == self._target)):
+            self.add_ghost(self._recent_ghosts, self.evict(self._recent))
+        else:
+            self.add_ghost(self._frequent_ghosts, self.evict(self._frequent))
+
+    def add_ghost(self, ghosts, address):
+        """
+        Remember the address of an evicted page (ARC only).
+
+        :param ghosts: self._recent_ghosts or self._frequent_ghosts.
+        :param address:
+        :return:
+        """
+        ghosts[address] = True
+        self._ghost_blocks.setdefault(address[0], set()).add(address[1])
+
+    def forget_ghost(self, ghosts, address=None):
+        """
+        Remove a ghost address (ARC only).
+
+        :param ghosts: self._recent_ghosts or self._frequent_ghosts.
+        :param address: the address to remove, None for the first ghost.
+        :return:
+        """
+        if address is None:
+            address = ghosts.popitem(last=False)[0]
+        else:
+            del ghosts[address]
+        block, page = address
+        pages = self._ghost_blocks[block]
+        pages.discard(page)
+        if not pages:
+            del self._ghost_blocks[block]
+
+    def evict(self, pages):
+        """
+        Remove the first page of a list of cached pages.
+
+        :param pages: self._recent or self._frequent.
+        :return: the address of the evicted page.
+        """
+        address = pages.popitem(last=False)[0]
+        self.forget_block_page(*address)
+        self.evictions += 1
+        return address
+
+    def forget_block_page(self, block, page):
+        """
+        Remove a page from the pages of its block.
+
+        :param block:
+        :param page:
+        :return:
+        """
+        pages = self._blocks[block]
+        pages.discard(page)
+        if not pages:
+            del self._blocks[block]
+
+    def invalidate(self, block, page):
+        """
+        Drop a cached page, ie: the data of the page changed.
+
+        :param block:
+        :param page:
+        :return: True if the page was cached.
+        """
+        address = (block, page)
+        if address in self._recent_ghosts:
+            self.forget_ghost(self._recent_ghosts, address)
+        elif address in self._frequent_ghosts:
+            self.forget_ghost(self._frequent_ghosts, address)
+        if self._recent.pop(address, None) is None and self._frequent.pop(address, None) is None:
+            return False
+
+        self.forget_block_page(block, page)
+        return True
+
+    def invalidate_block(self, block):
+        """
+        Drop all the cached pages and the ghosts of a block, ie: the block was erased.
+
+        :param block:
+        :return: the number of dropped pages.
+        """
+        for page in self._ghost_blocks.pop(block, ()):
+            address = (block, page)
+            if self._recent_ghosts.pop(address, None) is None:
+                del self._frequent_ghosts[address]
+
+        pages = self._blocks.pop(block, ())
+        for page in pages:
+            address = (block, page)
+            if self._recent.pop(address, None) is None:
+                del self._frequent[address]
+        return len(pages)
+
+    def clear(self):
+        """
+        Discard all the cached pages (the counters are kept).
+
+        :return:
+        """
+        self._recent.clear()
+        self._frequent.clear()
+        self._recent_ghosts.clear()
+        self._frequent_ghosts.clear()
+        self._target = 0
+        self._blocks.clear()
+        self._ghost_blocks.clear()
+
+    def reset_stats(self):
+        """
+
+        :return:
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
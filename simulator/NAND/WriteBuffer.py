@@ -0,0 +1,173 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the controller write buffer (DRAM): the host writes are kept in memory and written to the flash memory
+later, one block at a time, so repeated updates of the same pages are absorbed.
+"""
+
+# IMPORTS
+from collections import OrderedDict
+
+
+# FLUSH POLICIES
+WRITEBUFFER_LRU = 'LRU'
+""" When the buffer is full, the block of the least recently written page is flushed.
+"""
+
+WRITEBUFFER_FIFO = 'FIFO'
+""" When the buffer is full, the block of the oldest buffered page is flushed (an update doesn't refresh a page).
+"""
+
+
+# WriteBuffer class
+class WriteBuffer(object):
+    """
+    The buffered pages are host addresses (block, page), the flush is executed by the disk (see
+    ComponentWriteBuffer.flush_write_buffer_block).
+    """
+
+    # CONSTRUCTOR
+    def __init__(self, capacity=256, policy=WRITEBUFFER_LRU):
+        """
+
+        :param capacity: the number of pages of the buffer.
+        :param policy: the flush policy (see WRITEBUFFER_*).
+        :return:
+        """
+        if capacity < 1:
+            raise ValueError("Invalid write buffer capacity: at least one page needed.")
+        if policy not in (WRITEBUFFER_LRU, WRITEBUFFER_FIFO):
+            raise ValueError("Invalid write buffer policy.")
+
+        # ATTRIBUTES
+        self.capacity = capacity
+        """ The number of pages of the buffer. Is an integer value greater than zero.
+        """
+
+        self.policy = policy
+        """ The flush policy (see WRITEBUFFER_*).
+        """
+
+        self.hits = 0
+        """ Number of host writes absorbed by the buffer (the page was already buffered).
+        """
+
+        self.flushes = 0
+        """ Number of block flushes.
+        """
+
+        self.flushed_pages = 0
+        """ Number of pages flushed.
+        """
+
+        self._pages = OrderedDict()
+        """ The buffered pages (block, page) in flush order: the first one is the next victim.
+        """
+
+        self._blocks = dict()
+        """ The buffered pages of every block: block -> set of pages.
+        """
+
+    # METHODS
+    def __len__(self):
+        return len(self._pages)
+
+    def __contains__(self, address):
+        return address in self._pages
+
+    def get_description(self):
+        """
+
+        :return: a short description of the buffer.
+        """
+        return "{} pages ({})".format(self.capacity, self.policy)
+
+    def is_full(self):
+        """
+
+        :return: True if there is no room for a new page.
+        """
+        return len(self._pages) >= self.capacity
+
+    def put(self, block, page):
+        """
+        Buffer a host write.
+
+        :param block:
+        :param page:
+        :return: True if the page was already buffered (the write is absorbed).
+        """
+        address = (block, page)
+        if address in self._pages:
+            self.hits += 1
+            if self.policy == WRITEBUFFER_LRU:
+                self._pages.move_to_end(address)
+            return True
+
+        self._pages[address] = True
+        self._blocks.setdefault(block, set()).add(page)
+        return False
+
+    def discard(self, block, page):
+        """
+        Drop a buffered page without flushing it, ie: the host discarded the data.
+
+        :param block:
+        :param page:
+        :return: True if the page was buffered.
+        """
+        address = (block, page)
+        if address not in self._pages:
+            return False
+
+        del self._pages[address]
+        pages = self._blocks[block]
+        pages.discard(page)
+        if not pages:
+            del self._blocks[block]
+        return True
+
+    def pop_victim(self):
+        """
+        Remove from the buffer all the pages of the block of the next victim page.
+
+        :return: a tuple (block, pages), pages is the sorted list of the buffered pages of the block.
+        """
+        block = next(iter(self._pages))[0]
+        return block, self.pop_block(block)
+
+    def pop_block(self, block):
+        """
+        Remove from the buffer all the pages of a block.
+
+        :param block:
+        :return: the sorted list of the buffered pages of the block, empty if there are none.
+        """
+        pages = sorted(self._blocks.pop(block, ()))
+        for page in pages:
+            del self._pages[(block, page)]
+
+        if pages:
+            self.flushes += 1
+            self.flushed_pages += len(pages)
+        return pages
+
+    def clear(self):
+        """
+        Discard all the buffered pages (the counters are kept).
+
+        :return:
+        """
+        self._pages.clear()
+        self._blocks.clear()
+
+    def reset_stats(self):
+        """
+
+        :return:
+        """
+        self.hits = 0
+        self.flushes = 0
+        self.flushed_pages = 0
@@ -0,0 +1,161 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+The stream classifiers of the multi-stream write policy: every write is routed to a stream (see
+WritePolicyMultiStream).
+"""
+
+# IMPORTS
+from abc import ABCMeta, abstractclassmethod
+import numpy as np
+
+
+class StreamClassifier(metaclass=ABCMeta):
+    """
+    A classifier is called for every write with the disk, the logical page and the relocation flag, and returns the
+    stream of the write (an integer between 0 and streams - 1).
+    """
+
+    def __init__(self):
+        # ATTRIBUTES
+        self.streams = 1
+        """ The number of streams, set by the write policy (see bind).
+        """
+
+    # METHODS
+    def bind(self, disk, streams):
+        """
+        Called by the write policy before the first write.
+
+        :param disk: the disk.
+        :param streams: the number of streams.
+        :return:
+        """
+        self.streams = streams
+
+    def get_state(self):
+        """
+        The state of the classifier (see WritePolicyMultiStream.get_write_policy_state).
+
+        :return: a dictionary of numpy arrays, empty by default.
+        """
+        return dict()
+
+    def set_state(self, state):
+        """
+        Restore the state saved by get_state, after bind.
+
+        :param state: a dictionary of numpy arrays, without the arrays not found in the saved state.
+        :return:
+        """
+        pass
+
+    @abstractclassmethod
+    def __call__(self, disk, lba, relocation):
+        return NotImplemented
+
+
+class StreamClassifierHost(StreamClassifier):
+    """
+    The stream is the stream ID supplied by the host (see BaseNANDDisk.host_write_page), stream 0 if not supplied.
+    A relocated page keeps the stream of its last host write.
+    """
+
+    def __init__(self):
+        # ATTRIBUTES
+        self._last_stream = None
+        """ The stream of the last host write of every logical page.
+        """
+
+        super().__init__()
+
+    # METHODS
+    def bind(self, disk, streams):
+        super().bind(disk, streams)
+        if self._last_stream is None or len(self._last_stream) != disk.host_blocks * disk.pages_per_block:
+            self._last_stream = disk._ftl.allocate('classifier_last_stream',
+                                                   (disk.host_blocks * disk.pages_per_block, ), np.uint8, 0)
+        else:
+            self._last_stream.fill(0)
+
+    def get_state(self):
+        return {'last_stream': self._last_stream}
+
+    def set_state(self, state):
+        if 'last_stream' in state:
+            self._last_stream[:] = state['last_stream']
+
+    def __call__(self, disk, lba, relocation):
+        if relocation:
+            return int(self._last_stream[lba])
+
+        stream = disk._host_stream
+        stream = 0 if stream is None else min(max(int(stream), 0), self.streams - 1)
+        self._last_stream[lba] = stream
+        return stream
+
+
+class StreamClassifierUpdateFrequency(StreamClassifier):
+    """
+    The stream is the temperature of the logical page: the number of host writes of the page n goes to the stream
+    floor(log2(n)) (the hotter pages to the last stream). A relocated page goes to the stream of its current
+    temperature.
+    """
+
+    def __init__(self, decay=None):
+        """
+
+        :param decay: if not None, every decay host writes all the counters are halved, so the temperature follows
+                      a changing workload.
+        """
+        # ATTRIBUTES
+        self.decay = decay
+        """ The number of host writes between two halvings of the counters, None to never halve them.
+        """
+
+        self._writes = None
+        """ The number of host writes of every logical page.
+        """
+
+        self._until_decay = decay
+        """ The host writes left before the next halving.
+        """
+
+        super().__init__()
+
+    # METHODS
+    def bind(self, disk, streams):
+        super().bind(disk, streams)
+        if self._writes is None or len(self._writes) != disk.host_blocks * disk.pages_per_block:
+            self._writes = disk._ftl.allocate('classifier_writes', (disk.host_blocks * disk.pages_per_block, ),
+                                              np.uint32, 0)
+        else:
+            self._writes.fill(0)
+
+    def get_state(self):
+        state = {'writes': self._writes}
+        if self.decay is not None:
+            state['until_decay'] = np.array(self._until_decay)
+        return state
+
+    def set_state(self, state):
+        if 'writes' in state:
+            self._writes[:] = state['writes']
+        if 'until_decay' in state and self.decay is not None:
+            self._until_decay = int(state['until_decay'])
+
+    def __call__(self, disk, lba, relocation):
+        writes = int(self._writes[lba])
+        if not relocation:
+            writes += 1
+            self._writes[lba] = writes
+
+            if self.decay is not None:
+                self._until_decay -= 1
+                if self._until_decay <= 0:
+                    self._writes >>= 1
+                    self._until_decay = self.decay
+
+        return min(max(writes, 1).bit_length() - 1, self.streams - 1)
@@ -9,7 +9,7 @@ just find the first available page in a different block.
 
 # IMPORTS
 from simulator.NAND.WritePolicies.WritePolicyInterface import WritePolicyInterface
-from simulator.NAND.common import check_block, check_page, PAGE_DIRTY, PAGE_IN_USE
+from simulator.NAND.common import check_block, check_page
 
 
 class WritePolicyDefault(WritePolicyInterface):
@@ -29,23 +29,21 @@ class WritePolicyDefault(WritePolicyInterface):
         :return:
         """
         # naive policy: just find the first available page in a different block
-        for b in range(0, self.total_blocks):
-            if b != block and self._ftl[b]['empty'] > 0:
-                # FOUND a block with empty pages
-                p = self.get_empty_page(block=b)
-
-                # change the status of the original page
-                self._ftl[block][page] = PAGE_DIRTY
-
-                # change the status of the new page
-                self._ftl[b][p] = PAGE_IN_USE
-
-                # we need to update the statistics
-                self._ftl[block]['dirty'] += 1  # we have one more dirty page in this block
-                self._ftl[b]['empty'] -= 1  # we lost one empty page in this block
-                self._elapsed_time += self.write_page_time  # time spent to write the data
-                self._page_write_executed += 1  # one page written
-                return True
+        b = self._ftl.find_block_with_empty_pages(exclude=(block, ))
+        if b >= 0:
+            # FOUND a block with empty pages
+            p = self.get_empty_page(block=b)
+
+            # change the status of the original page (we have one more dirty page in this block)
+            self._ftl.invalidate_page(block, page)
+
+            # change the status of the new page (we lost one empty page in this block)
+            self._ftl.program_page(b, p)
+
+            # we need to update the statistics
+            self.charge_operation(b, self.write_page_time, True, True)  # time spent to write the data
+            self._page_write_executed += 1  # one page written
+            return True
 
         # no empty page found
         return False
@@ -9,7 +9,8 @@ the garbage collector is run in place: as soon a block is full the block is modi
 
 # IMPORTS
 from simulator.NAND.WritePolicies.WritePolicyInterface import WritePolicyInterface
-from simulator.NAND.common import check_block, check_page, PAGE_EMPTY, PAGE_DIRTY, PAGE_IN_USE
+from simulator.NAND.common import check_block, check_page, PAGE_EMPTY, PAGE_IN_USE, PAGE_DIRTY_CODE, \
+    PAGE_EMPTY_CODE, PAGE_IN_USE_CODE
 
 
 class WritePolicyInPlace(WritePolicyInterface):
@@ -29,7 +30,7 @@ class WritePolicyInPlace(WritePolicyInterface):
         :return:
         """
         # change the status of the original page, so we don't need to read it
-        self._ftl[block][page] = PAGE_DIRTY
+        self._ftl.mark_page(block, page, PAGE_DIRTY_CODE)
 
         # STEP 1: temporary copy the block data (this also simulates the in-memory change)
         #         this is a read and only useful data are read
@@ -54,3 +55,43 @@ class WritePolicyInPlace(WritePolicyInterface):
 
         # cannot fail as the substitution is in place
         return True
+
+    def flush_block_updates(self, block=0, pages=()):
+        """
+        The buffered data changes of a block are merged in a single block rewrite: if they don't fit in the empty
+        pages of the block, the block is read, erased and written only once for all of them.
+
+        :param block:
+        :param pages: the sorted list of the pages of the block.
+        :return: the list of the pages not written because there is no space left.
+        """
+        if self.page_mapping:
+            return super().flush_block_updates(block=block, pages=pages)
+
+        statuses = {p: self._ftl.get_page(block, p) for p in pages}
+        updates = sum(1 for s in statuses.values() if s == PAGE_IN_USE_CODE)
+        writes = sum(1 for s in statuses.values() if s == PAGE_EMPTY_CODE)
+        if updates == 0 or updates <= self._ftl.empty[block] - writes:
+            # enough empty pages, the same as unbuffered writes
+            return super().flush_block_updates(block=block, pages=pages)
+
+        # STEP 1: temporary copy the block data, the buffered pages don't need to be read
+        temp_block = dict()
+        for p in range(0, self.pages_per_block):
+            if p in statuses:
+                # the new data, a dirty page cannot be written (as an unbuffered write)
+                temp_block[p] = PAGE_IN_USE if statuses[p] != PAGE_DIRTY_CODE else PAGE_EMPTY
+            else:
+                res, status = self.raw_read_page(block=block, page=p)
+                temp_block[p] = PAGE_IN_USE if res else PAGE_EMPTY
+
+        # STEP 2: erase
+        self.raw_erase_block(block=block)
+
+        # STEP 3: write the IN USE pages only
+        for p in range(0, self.pages_per_block):
+            if temp_block[p] == PAGE_IN_USE:
+                self.raw_write_page(block=block, page=p)
+
+        # cannot fail as the substitution is in place
+        return []
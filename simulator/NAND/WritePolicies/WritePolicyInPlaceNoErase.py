@@ -11,7 +11,7 @@ in a new free block (if available, otherwise the base policy is used). The previ
 
 # IMPORTS
 from simulator.NAND.WritePolicies.WritePolicyDefault import WritePolicyDefault
-from simulator.NAND.common import check_block, check_page, PAGE_EMPTY, PAGE_DIRTY, PAGE_IN_USE
+from simulator.NAND.common import check_block, check_page, PAGE_EMPTY, PAGE_IN_USE, PAGE_DIRTY_CODE
 
 
 class WritePolicyInPlaceNoErase(WritePolicyDefault):
@@ -35,7 +35,7 @@ class WritePolicyInPlaceNoErase(WritePolicyDefault):
 
         if res:
             # change the status of the original page, so we don't need to read it
-            self._ftl[block][page] = PAGE_DIRTY
+            self._ftl.mark_page(block, page, PAGE_DIRTY_CODE)
 
             # STEP 1: temporary copy the block data (this also simulates the in-memory change)
             #         this is a read and only useful data are read
@@ -46,8 +46,7 @@ class WritePolicyInPlaceNoErase(WritePolicyDefault):
                 res, status = self.raw_read_page(block=block, page=p)
                 if res:
                     temp_block[p] = PAGE_IN_USE  # the page is valid and in use
-                    self._ftl[block][p] = PAGE_DIRTY  # set the original page as dirty
-                    self._ftl[block]['dirty'] += 1  # new dirty page
+                    self._ftl.invalidate_page(block, p)  # set the original page as dirty (new dirty page)
                 else:
                     temp_block[p] = PAGE_EMPTY  # reset the page, even if is dirty, for the copy
 
@@ -8,7 +8,9 @@ This is the Abstract class interface for all Write Policy implementations.
 
 # IMPORTS
 from abc import ABCMeta, abstractclassmethod
+import numpy as np
 from simulator.NAND.NANDInterface import NANDInterface
+from simulator.NAND.common import check_block, check_page, OPERATION_FAILED_DISKFULL
 
 
 class WritePolicyInterface(NANDInterface, metaclass=ABCMeta):
@@ -23,3 +25,171 @@ class WritePolicyInterface(NANDInterface, metaclass=ABCMeta):
     @abstractclassmethod
     def full_block_write_policy(self, block=0, page=0):
         return NotImplemented
+
+    @check_block
+    @check_page
+    def update_page_write_policy(self, block=0, page=0):
+        """
+        A data change: the host writes an in use page. The new data is written in an empty page of the same block
+        and the current page is invalidated. If the block is full, the full_block_write_policy decides.
+
+        :param block:
+        :param page:
+        :return: True if the new data is written (all statistics updated), False if there is no space left.
+        """
+        # is the block full?
+        if self._ftl.empty[block] <= 0:
+            # yes, we need a policy to decide how to write
+            return self.full_block_write_policy(block=block, page=page)
+
+        # no, we still have space, we just need a new empty page on this block
+        # find and write the new page
+        newpage = self.get_empty_page(block=block)
+
+        # change the status of this page (we have one more dirty page in this block)
+        self._ftl.invalidate_page(block, page)
+
+        # change the status of the new page (we lost one empty page in this block)
+        self._ftl.program_page(block, newpage)
+
+        # we need to update the statistics
+        self.charge_operation(block, self.write_page_time, True, True)  # time spent to write the data
+        self._page_write_executed += 1  # one page written
+        return True
+
+    def flush_block_updates(self, block=0, pages=()):
+        """
+        Write the pages of a block flushed by the write buffer (see ComponentWriteBuffer.flush_write_buffer_block).
+        By default every page is written as an unbuffered host write.
+
+        :param block:
+        :param pages: the sorted list of the pages of the block.
+        :return: the list of the pages not written because there is no space left.
+        """
+        failed = list()
+        for page in pages:
+            if self.page_mapping:
+                res, status = self.raw_write_lba(lba=block * self.pages_per_block + page)
+            else:
+                res, status = self.raw_write_page(block=block, page=page)
+            if not res and status == OPERATION_FAILED_DISKFULL:
+                failed.append(page)
+        return failed
+
+    def discard_page_write_policy(self, block=0, page=0):
+        """
+        The host discards the data of an in use page, just before the page is invalidated (see
+        BaseNANDDisk.host_trim_page). Nothing to do by default.
+
+        :param block: the physical block.
+        :param page: the physical page.
+        :return:
+        """
+        pass
+
+    def get_write_frontier(self, lba=0, reserve=0, relocation=False):
+        """
+        The page where the data of a logical page is appended (see BaseNANDDisk.raw_write_lba).
+        With more than one plane every plane has its own open block and the writes go to the planes in turn.
+
+        :param lba: the logical page.
+        :param reserve: the number of free blocks that cannot be used to open a new block.
+        :param relocation: True if the write is a garbage collector relocation.
+        :return: a tuple (res, block, page), res is False if there is no space left.
+        """
+        if self.total_planes <= 1:
+            return self.get_frontier_page(reserve=reserve)
+
+        if self._plane_open_blocks is None:
+            self._plane_open_blocks = [-1] * self.total_planes
+
+        # the frontier of the next plane (with empty pages, if a fresh block can't be opened or for a relocation)
+        plane = (self._frontier_plane + 1) % self.total_planes
+        if relocation or self._ftl.free_block_count <= reserve:
+            for i in range(self.total_planes):
+                b = self._plane_open_blocks[(plane + i) % self.total_planes]
+                if b >= 0 and self._ftl.empty[b] > 0:
+                    plane = (plane + i) % self.total_planes
+                    break
+        self._frontier_plane = plane
+        self._open_block = self._plane_open_blocks[plane]
+        res, block, page = self.get_frontier_page(reserve=reserve, plane=plane)
+        self._plane_open_blocks[plane] = self._open_block if res and self._ftl.empty[block] > 1 else -1
+
+        # the single frontier of the disk is not used
+        self._open_block = -1
+        return res, block, page
+
+    def get_frontier_reserve(self):
+        """
+
+        :return: the number of free blocks that the host writes leave to the other write frontiers, zero by default:
+                 the relocations fill the open blocks of the striped frontier before opening a fresh one (see
+                 get_write_frontier).
+        """
+        return 0
+
+    def clear_write_frontiers(self):
+        """
+        Close every write frontier, ie: the FTL was cleared (see BaseNANDDisk.precondition).
+
+        :return:
+        """
+        self._open_block = -1
+        self._plane_open_blocks = None
+        self._frontier_plane = -1
+
+    def get_write_frontiers(self):
+        """
+
+        :return: the open block of every write frontier, -1 if the frontier has no open block.
+        """
+        if self._plane_open_blocks is not None:
+            return self._plane_open_blocks
+        return (self._open_block, )
+
+    def get_open_blocks(self):
+        """
+
+        :return: the blocks of the write frontiers (never relocated by the garbage collector).
+        """
+        return tuple(b for b in self.get_write_frontiers() if b >= 0)
+
+    def get_write_policy_state(self):
+        """
+        The state of the write policy that is not an integer attribute (see BaseNANDDisk.save_state): by default the
+        striped write frontier, ie: the open block of every plane (-1 if none) and the plane of the last write.
+
+        :return: a dictionary of numpy arrays, empty with a single write frontier.
+        """
+        if self._plane_open_blocks is None:
+            return dict()
+
+        return {'plane_open_blocks': np.array(self._plane_open_blocks, dtype=np.int64),
+                'frontier_plane': np.array([self._frontier_plane], dtype=np.int64)}
+
+    def set_write_policy_state(self, state):
+        """
+        Restore the state saved by get_write_policy_state (see BaseNANDDisk.load_state).
+
+        :param state: a dictionary of numpy arrays, without the arrays not found in the saved state.
+        :return:
+        """
+        if 'plane_open_blocks' not in state:
+            # saved before the first striped write (or with a single write frontier)
+            self._plane_open_blocks = None
+            self._frontier_plane = -1
+            return
+
+        if len(state['plane_open_blocks']) != self.total_planes:
+            raise ValueError("The saved state has a different number of planes.")
+        self._plane_open_blocks = [int(b) for b in state['plane_open_blocks']]
+        self._frontier_plane = int(state['frontier_plane'][0])
+
+    def get_write_policy_stats(self):
+        """
+
+        :return: the extra counters of the write policy as a list of tuples (name, value) (see
+                 BaseNANDDisk.get_extra_stats), empty by default.
+        """
+        return []
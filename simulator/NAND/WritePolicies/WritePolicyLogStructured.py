@@ -0,0 +1,64 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the log-structured policy: a data change is always appended to the write frontier (the open block),
+the block of the original page is never searched or rewritten.
+"""
+
+# IMPORTS
+from simulator.NAND.WritePolicies.WritePolicyInterface import WritePolicyInterface
+from simulator.NAND.common import check_block, check_page
+
+
+class WritePolicyLogStructured(WritePolicyInterface):
+    """
+    The new data of an in use page is written in the next page of the open block (see BaseNANDDisk.get_frontier_page)
+    and the original page is invalidated.
+    """
+    # METHODS
+    def get_write_policy_name(self):
+        return "log-structured"
+
+    @check_block
+    @check_page
+    def full_block_write_policy(self, block=0, page=0):
+        """
+
+        :param block:
+        :return:
+        """
+        # the same as any other data change
+        return self.update_page_write_policy(block=block, page=page)
+
+    @check_block
+    @check_page
+    def update_page_write_policy(self, block=0, page=0):
+        """
+
+        :param block:
+        :param page:
+        :return:
+        """
+        # append to the write frontier
+        res, b, p = self.get_frontier_page()
+        if not res:
+            # no fresh blocks: open the first block with empty pages
+            b = self._ftl.find_block_with_empty_pages()
+            if b < 0:
+                # no empty page found
+                return False
+            self._open_block = b
+            p = self._ftl.find_empty_page(b)
+
+        # change the status of the original page (we have one more dirty page in this block)
+        self._ftl.invalidate_page(block, page)
+
+        # change the status of the new page (we lost one empty page in the open block)
+        self._ftl.program_page(b, p)
+
+        # we need to update the statistics
+        self.charge_operation(b, self.write_page_time, True, True)  # time spent to write the data
+        self._page_write_executed += 1  # one page written
+        return True
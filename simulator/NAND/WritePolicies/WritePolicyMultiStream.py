@@ -0,0 +1,339 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+This is the multi-stream policy: a log-structured policy with one write frontier for every stream.
+"""
+
+# IMPORTS
+import numpy as np
+from simulator.NAND.WritePolicies.WritePolicyInterface import WritePolicyInterface
+from simulator.NAND.WritePolicies.StreamClassifier import StreamClassifierUpdateFrequency
+from simulator.NAND.common import check_block, check_page
+
+
+class WritePolicyMultiStream(WritePolicyInterface):
+    """
+    A classifier routes every write to a stream (see StreamClassifier), every stream has its own open block.
+    In physical mode only the data changes are routed, as in the log-structured policy.
+    """
+
+    def __init__(self, streams=2, classifier=None):
+        # ATTRIBUTES
+        # PARAMETERS
+        self.wp_param_streams = streams
+        """ The number of streams (write frontiers). Is an integer value greater than zero.
+        """
+
+        self.wp_param_classifier = classifier if classifier is not None else StreamClassifierUpdateFrequency()
+        """ The stream classifier (see StreamClassifier).
+        """
+
+        # WRITE POLICY INTERNAL STATE
+        self._stream_open_blocks = None
+        """ The open block of every stream, -1 if the stream has no open block.
+            None until the first write (see init_streams).
+        """
+
+        self._block_stream = None
+        """ The stream that opened every block, -1 if the block was never opened by a stream.
+        """
+
+        self._block_erase_base = None
+        """ The erase counter of every block when it was opened by its stream.
+        """
+
+        self._page_keys = None
+        """ Physical mode only: for every physical page holding data moved by a data change, the address where the
+            host first wrote the data (block * pages_per_block + page), -1 if the data was never moved.
+        """
+
+        self._stream_host_write = None
+        """ Number of host writes routed to every stream.
+        """
+
+        self._stream_disk_write = None
+        """ Number of pages written by every stream (host writes and relocations).
+        """
+
+        self._stream_block_erased = None
+        """ Number of erases of the blocks previously opened by every stream (see get_write_policy_stats).
+        """
+
+        self._saved_streams = None
+        """ The streams state restored by set_write_policy_state, applied by init_streams (the number of streams and
+            the classifier can be set after the disk is restored). None if there is no state to be applied.
+        """
+
+        super().__init__()
+
+    # METHODS
+    def get_write_policy_name(self):
+        return "multi-stream ({})".format(self.wp_param_streams)
+
+    def init_streams(self):
+        """
+        Initialize the streams state and the classifier, before the first write.
+
+        :return:
+        """
+        state, self._saved_streams = self._saved_streams, None
+        self._stream_open_blocks = [-1] * self.wp_param_streams
+        if self._block_stream is None:
+            # restored from the FTL directory of a checkpoint, if any
+            self._block_stream = self._ftl.allocate('ms_block_stream', (self.total_blocks, ), np.int32, -1)
+            self._block_erase_base = self._ftl.allocate('ms_block_erase_base', (self.total_blocks, ), np.int64, 0)
+        elif state is None:
+            self._block_stream.fill(-1)
+            self._block_erase_base.fill(0)
+        if not self.page_mapping:
+            if self._page_keys is None:
+                self._page_keys = self._ftl.allocate('ms_page_keys', (self.total_pages, ), np.int64, -1)
+            elif state is None:
+                self._page_keys.fill(-1)
+        self._stream_host_write = [0] * self.wp_param_streams
+        self._stream_disk_write = [0] * self.wp_param_streams
+        self._stream_block_erased = [0] * self.wp_param_streams
+        self.wp_param_classifier.bind(self, self.wp_param_streams)
+
+        # the state of a restored disk
+        if state is not None:
+            if len(state['stream_open_blocks']) != self.wp_param_streams:
+                raise ValueError("The saved state has a different number of streams.")
+            self._stream_open_blocks = state['stream_open_blocks'].tolist()
+            if 'block_stream' in state:
+                # not in a checkpoint: memory mapped in the FTL directory
+                self._block_stream[:] = state['block_stream']
+                self._block_erase_base[:] = state['block_erase_base']
+            if 'page_keys' in state and self._page_keys is not None:
+                self._page_keys[:] = state['page_keys']
+            self._stream_host_write = state['stream_host_write'].tolist()
+            self._stream_disk_write = state['stream_disk_write'].tolist()
+            self._stream_block_erased = state['stream_block_erased'].tolist()
+            self.wp_param_classifier.set_state({name[len('classifier_'):]: array for name, array in state.items()
+                                                if name.startswith('classifier_')})
+
+    def get_stream_page(self, stream=0, reserve=0, fallback=False):
+        """
+        The next page of the write frontier of a stream.
+
+        :param stream:
+        :param reserve: the number of free blocks that cannot be used to open a new block.
+        :param fallback: if True and there are no fresh blocks, open the first block with empty pages that is not
+                         the open block of another stream.
+        :return: a tuple (res, block, page), res is False if there is no space left.
+        """
+        # the frontier of the stream
+        self._open_block = self._stream_open_blocks[stream]
+        res, block, page = self.get_frontier_page(reserve=reserve)
+        if not res and fallback:
+            block = self._ftl.find_block_with_empty_pages(exclude=self._stream_open_blocks)
+            if block >= 0:
+                res, page = True, self._ftl.find_empty_page(block)
+                self._open_block = block
+
+        if res and block != self._stream_open_blocks[stream]:
+            # a new block is opened: the erases since the previous opening belong to the previous stream
+            previous = self._block_stream[block]
+            if previous >= 0:
+                self._stream_block_erased[previous] += int(self._ftl.erase_count[block] -
+                                                           self._block_erase_base[block])
+            self._block_stream[block] = stream
+            self._block_erase_base[block] = self._ftl.erase_count[block]
+            self._stream_open_blocks[stream] = block
+
+        if res:
+            self._stream_disk_write[stream] += 1
+            if self._ftl.empty[block] <= 1:
+                # the block is full after this write: the frontier is closed, so the gc can clean the block
+                self._stream_open_blocks[stream] = -1
+
+        # the single frontier of the disk is not used
+        self._open_block = -1
+        return res, block, page
+
+    def get_available_stream(self, stream=0, reserve=0):
+        """
+
+        :param stream: the stream of the write.
+        :param reserve: the number of free blocks that cannot be used to open a new block.
+        :return: the stream itself if there are fresh blocks left, otherwise the next stream with empty pages in its
+                 open block (the stream itself if there are none).
+        """
+        if self._ftl.free_block_count <= reserve:
+            for i in range(self.wp_param_streams):
+                b = self._stream_open_blocks[(stream + i) % self.wp_param_streams]
+                if b >= 0 and self._ftl.empty[b] > 0:
+                    return (stream + i) % self.wp_param_streams
+        return stream
+
+    def get_write_frontier(self, lba=0, reserve=0, relocation=False):
+        """
+
+        :return:
+        """
+        if self._stream_open_blocks is None:
+            self.init_streams()
+
+        # the host writes leave a fresh block to every other stream
+        if not relocation:
+            reserve += self.get_frontier_reserve()
+
+        stream = self.get_available_stream(self.wp_param_classifier(self, lba, relocation), reserve=reserve)
+        res, block, page = self.get_stream_page(stream=stream, reserve=reserve)
+        if res and not relocation:
+            self._stream_host_write[stream] += 1
+        return res, block, page
+
+    def get_frontier_reserve(self):
+        """
+
+        :return:
+        """
+        return self.wp_param_streams - 1
+
+    def clear_write_frontiers(self):
+        """
+
+        :return:
+        """
+        super().clear_write_frontiers()
+        if self._stream_open_blocks is not None:
+            self._stream_open_blocks = [-1] * self.wp_param_streams
+
+    def get_write_frontiers(self):
+        """
+
+        :return:
+        """
+        if self._stream_open_blocks is None:
+            if self._saved_streams is None:
+                return (-1, ) * self.wp_param_streams
+            # restored: the open blocks of the saved state
+            self.init_streams()
+        return self._stream_open_blocks
+
+    @check_block
+    @check_page
+    def full_block_write_policy(self, block=0, page=0):
+        """
+
+        :param block:
+        :return:
+        """
+        # the same as any other data change
+        return self.update_page_write_policy(block=block, page=page)
+
+    @check_block
+    @check_page
+    def update_page_write_policy(self, block=0, page=0):
+        """
+
+        :param block:
+        :param page:
+        :return:
+        """
+        if self._stream_open_blocks is None:
+            self.init_streams()
+
+        # append to the write frontier of the stream
+        ppn = block * self.pages_per_block + page
+        key = int(self._page_keys[ppn])
+        if key < 0:
+            key = ppn
+        stream = self.get_available_stream(self.wp_param_classifier(self, key, False))
+        res, b, p = self.get_stream_page(stream=stream, fallback=True)
+        if not res:
+            # no empty page found
+            return False
+        self._stream_host_write[stream] += 1
+
+        # the data keeps its address
+        self._page_keys[ppn] = -1
+        self._page_keys[b * self.pages_per_block + p] = key
+
+        # change the status of the original page (we have one more dirty page in this block)
+        self._ftl.invalidate_page(block, page)
+
+        # change the status of the new page (we lost one empty page in the open block)
+        self._ftl.program_page(b, p)
+
+        # we need to update the statistics
+        self.charge_operation(b, self.write_page_time, True, True)  # time spent to write the data
+        self._page_write_executed += 1  # one page written
+        return True
+
+    def discard_page_write_policy(self, block=0, page=0):
+        """
+
+        :param block:
+        :param page:
+        :return:
+        """
+        if self._page_keys is not None:
+            self._page_keys[block * self.pages_per_block + page] = -1
+
+    def get_write_policy_state(self):
+        """
+        The open block and the counters of every stream, the stream of every block and the state of the classifier
+        (see StreamClassifier.get_state).
+
+        :return:
+        """
+        state = super().get_write_policy_state()
+        if self._stream_open_blocks is None:
+            # not used since the restore (or never used)
+            if self._saved_streams is not None:
+                state.update(self._saved_streams)
+            return state
+
+        state.update({'stream_open_blocks': np.array(self._stream_open_blocks, dtype=np.int64),
+                      'block_stream': self._block_stream,
+                      'block_erase_base': self._block_erase_base,
+                      'stream_host_write': np.array(self._stream_host_write, dtype=np.int64),
+                      'stream_disk_write': np.array(self._stream_disk_write, dtype=np.int64),
+                      'stream_block_erased': np.array(self._stream_block_erased, dtype=np.int64)})
+        if self._page_keys is not None:
+            state['page_keys'] = self._page_keys
+        for name, array in self.wp_param_classifier.get_state().items():
+            state['classifier_' + name] = array
+        return state
+
+    def set_write_policy_state(self, state):
+        """
+        The streams are restored before the next write (see init_streams). Without a saved streams state (ie: saved
+        by another write policy) the streams start again with no open blocks.
+
+        :param state:
+        :return:
+        """
+        super().set_write_policy_state(state)
+        self._stream_open_blocks = None
+        self._saved_streams = {name: array for name, array in state.items()
+                               if name.startswith('stream') or name.startswith('block') or
+                               name.startswith('classifier_') or name == 'page_keys'} \
+            if 'stream_open_blocks' in state else None
+
+    def get_write_policy_stats(self):
+        """
+        For every stream i: si_host_write (host writes), si_disk_write (pages written) and si_block_erased (erases
+        of the blocks opened by the stream).
+
+        :return:
+        """
+        if self._stream_open_blocks is None:
+            self.init_streams()
+
+        # the erases of the blocks currently opened by every stream
+        owned = self._block_stream >= 0
+        erased = np.bincount(self._block_stream[owned],
+                             weights=self._ftl.erase_count[owned] - self._block_erase_base[owned],
+                             minlength=self.wp_param_streams)
+
+        stats = list()
+        for s in range(self.wp_param_streams):
+            stats.append(('s{}_host_write'.format(s), self._stream_host_write[s]))
+            stats.append(('s{}_disk_write'.format(s), self._stream_disk_write[s]))
+            stats.append(('s{}_block_erased'.format(s), self._stream_block_erased[s] + int(erased[s])))
+        return stats
@@ -8,6 +8,7 @@ Common static values.
 
 # IMPORTS
 from decimal import Decimal
+from functools import wraps
 
 # COMMON GLOBAL VALUES
 
@@ -25,12 +26,38 @@ PAGE_EMPTY = "E"
 
 PAGE_STATUSES = (PAGE_IN_USE, PAGE_DIRTY, PAGE_EMPTY)
 
+# THE PAGE STATUS CODES
+# The compact representation of the page statuses used by the FTL state arrays (one uint8 per page).
+# The empty status must be zero, so a freshly allocated (or erased) block is just a block of zeros.
+PAGE_EMPTY_CODE = 0
+PAGE_IN_USE_CODE = 1
+PAGE_DIRTY_CODE = 2
+
+PAGE_STATUS_TO_CODE = {PAGE_EMPTY: PAGE_EMPTY_CODE, PAGE_IN_USE: PAGE_IN_USE_CODE, PAGE_DIRTY: PAGE_DIRTY_CODE}
+PAGE_CODE_TO_STATUS = (PAGE_EMPTY, PAGE_IN_USE, PAGE_DIRTY)  # indexed by the status code
+
 
 # read\write results
 OPERATION_SUCCESS = 'SUCCESS'
 OPERATION_FAILED_DISKFULL = 'FAIL_FULL'
 OPERATION_FAILED_DIRTY = 'FAIL_DIRTY'
 
+# read\write result codes
+# The compact representation of the results, used by the batch operations.
+OPERATION_SUCCESS_CODE = 0
+OPERATION_FAILED_DISKFULL_CODE = 1
+OPERATION_FAILED_DIRTY_CODE = 2
+
+OPERATION_STATUS_TO_CODE = {OPERATION_SUCCESS: OPERATION_SUCCESS_CODE,
+                            OPERATION_FAILED_DISKFULL: OPERATION_FAILED_DISKFULL_CODE,
+                            OPERATION_FAILED_DIRTY: OPERATION_FAILED_DIRTY_CODE}
+
+
+# wear leveling modes (see BaseNANDDisk)
+WEARLEVELING_NONE = 'WL_NONE'
+WEARLEVELING_DYNAMIC = 'WL_DYNAMIC'
+WEARLEVELING_STATIC = 'WL_STATIC'
+
 
 # COMMON USEFUL FUNCTIONS
 def bytes_to_mib(pbytes=0):
@@ -54,6 +81,78 @@ def pages_to_mib(pages=0, page_size_bytes=4096):
     return bytes_to_mib(pages * page_size_bytes)
 
 
+def microseconds_to_seconds(elapsed_time=0):
+    """
+    Convert a simulation time into seconds.
+
+    :param elapsed_time: the integer time in microseconds (10^-6 seconds).
+    :return: the Decimal time in seconds.
+    """
+    return Decimal(elapsed_time) / Decimal(10 ** 6)
+
+
+def compute_write_amplification(page_write_executed=0, host_page_write_request=0):
+    """
+    The write amplification factor: pages written by the disk over pages written by the host.
+
+    :param page_write_executed: the integer number of pages actually written by the disk.
+    :param host_page_write_request: the integer number of pages written as requested by the host.
+    :return: the Decimal write amplification, zero if the host didn't write anything.
+    """
+    # avoid divide by zero errors
+    if host_page_write_request <= 0:
+        return Decimal('0')
+
+    return Decimal(page_write_executed) / Decimal(host_page_write_request)
+
+
+def compute_mean(total=0, count=0):
+    """
+    The mean of a counter, ie: the mean latency of the host requests.
+
+    :param total: the integer sum of the values.
+    :param count: the integer number of values.
+    :return: the Decimal mean, zero if there are no values.
+    """
+    # avoid divide by zero errors
+    if count <= 0:
+        return Decimal('0')
+
+    return Decimal(total) / Decimal(count)
+
+
+def compute_iops(operations=0, elapsed_time=0):
+    """
+    The number of disk operations per second.
+
+    :param operations: the integer number of operations (pages read and written by the disk).
+    :param elapsed_time: the integer time in microseconds (10^-6 seconds).
+    :return: the Decimal IOPS, zero if no time is elapsed.
+    """
+    # avoid divide by zero errors
+    if elapsed_time <= 0:
+        return Decimal('0')
+
+    return Decimal(operations) / microseconds_to_seconds(elapsed_time)
+
+
+def compute_bandwidth(pages=0, elapsed_time=0, page_size_bytes=4096):
+    """
+    The bandwidth in MiB/s.
+
+    :param pages: the integer number of pages transferred.
+    :param elapsed_time: the integer time in microseconds (10^-6 seconds).
+    :param page_size_bytes: the integer size of a single page in Bytes. Default value is 4096 Bytes (4 KiB).
+    :return: the Decimal bandwidth, zero if no time is elapsed.
+    """
+    # avoid divide by zero errors
+    if elapsed_time <= 0:
+        return Decimal('0')
+
+    # in MiB
+    return pages_to_mib(pages, page_size_bytes) / Decimal(microseconds_to_seconds(elapsed_time))
+
+
 def get_quantized_decimal(dec=0):
     """
     Utility method to output Decimals with two decimal places.
@@ -76,7 +175,9 @@ def get_integer_decimal(dec=0):
 def check_block(f):
     """
     A wrapper to validate the block parameter for a BaseNANDDisk class.
+    The original function is available as __wrapped__ (see NANDFactory.get_class with trusted=True).
     """
+    @wraps(f)
     def wrapper(s, **kwargs):
         if 'block' in kwargs:
             block = kwargs['block']
@@ -91,7 +192,9 @@ def check_block(f):
 def check_page(f):
     """
     A wrapper to validate the page parameter for a BaseNANDDisk class.
+    The original function is available as __wrapped__ (see NANDFactory.get_class with trusted=True).
     """
+    @wraps(f)
     def wrapper(s, **kwargs):
         if 'page' in kwargs:
             page = kwargs['page']
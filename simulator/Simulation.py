@@ -11,10 +11,14 @@ from datetime import datetime
 from decimal import Decimal, getcontext
 from colorama import init, Fore, Style
 from pathlib import Path
-from scipy.stats import randint
+from scipy.stats import randint, zipf
 import numpy as np
-from simulator.NAND.common import DECIMAL_PRECISION, OPERATION_FAILED_DIRTY
+from simulator.NAND.common import DECIMAL_PRECISION, OPERATION_FAILED_DIRTY, OPERATION_FAILED_DIRTY_CODE, \
+    compute_iops, compute_bandwidth, \
+    compute_write_amplification, compute_mean
 from simulator.NAND.common import get_quantized_decimal as qd
+from simulator.NAND.common import get_integer_decimal as qz
+from simulator.NAND.LatencyHistogram import LATENCY_PERCENTILES
 
 
 # SIMULATION TYPES (THE DISTRIBUTION)
@@ -41,12 +45,12 @@ def check_init(f):
     """
     A wrapper to validate the simulation initialization.
     """
-    def wrapper(s, *args):
+    def wrapper(s, *args, **kwargs):
         if not s.init_ok:
             raise RuntimeError("Simulation not yet initialized")
 
         # seems fine, let's proceed
-        return f(s, *args)
+        return f(s, *args, **kwargs)
     return wrapper
 
 
@@ -58,9 +62,16 @@ class Simulation(object):
     # CONSTRUCTOR
 
     # METHODS
-    def __init__(self, simulation_name=None, sample_size=0, sampling=None, sampling_type=SIM_SAMPLING_HOST_WRITE):
+    def __init__(self, simulation_name=None, sample_size=0, sampling=None, sampling_type=SIM_SAMPLING_HOST_WRITE,
+                 trim_ratio=0, trim_size=1, read_ratio=0, read_skew=None, arrival_rate=None):
         """
 
+        :param trim_ratio: the fraction of the host operations that are trims (see self.sim_trim_ratio).
+        :param trim_size: the number of consecutive pages discarded by every trim.
+        :param read_ratio: the fraction of the host operations that are reads (see self.sim_read_ratio).
+        :param read_skew: if not None, the exponent of the Zipf distribution of the read pages (see
+                          self.sim_read_skew).
+        :param arrival_rate: if not None, the mean rate of the host operations (see self.sim_arrival_rate).
         :return:
         """
         # ATTRIBUTES
@@ -90,6 +101,40 @@ class Simulation(object):
         """ This parameter specifies the meaning of the self.sim_sampling parameter.
         """
 
+        self.sim_trim_ratio = Decimal(trim_ratio)
+        """ The fraction of the host operations that are trims of trim_size pages (see BaseNANDDisk.host_trim_range).
+            This is a value between 0 (no trims) and 1 (excluded).
+        """
+
+        self.sim_trim_size = trim_size
+        """ The number of consecutive pages discarded by every trim. Is an integer value greater than zero.
+        """
+
+        if self.sim_trim_ratio < 0 or self.sim_trim_ratio >= 1 or self.sim_trim_size < 1:
+            raise ValueError("Invalid trim ratio or trim size.")
+
+        self.sim_read_ratio = Decimal(read_ratio)
+        """ The fraction of the host operations that are page reads (see BaseNANDDisk.host_read_page).
+            This is a value between 0 (no reads) and 1 - self.sim_trim_ratio (excluded).
+        """
+
+        self.sim_read_skew = read_skew
+        """ The popularity of the read pages: None for uniform random reads, otherwise the exponent (greater than 1)
+            of a Zipf distribution over a random permutation of the host pages.
+        """
+
+        if self.sim_read_ratio < 0 or self.sim_trim_ratio + self.sim_read_ratio >= 1 or \
+                (self.sim_read_skew is not None and self.sim_read_skew <= 1):
+            raise ValueError("Invalid read ratio or read skew.")
+
+        self.sim_arrival_rate = arrival_rate
+        """ None for a closed loop host, otherwise the mean number of host operations per second of a Poisson arrival
+            process. Only for the disks with a host queue (see ComponentHostQueue).
+        """
+
+        if self.sim_arrival_rate is not None and self.sim_arrival_rate <= 0:
+            raise ValueError("Invalid arrival rate.")
+
         self.sim_type = SIM_UNIFORM_RANDOM_PAGE_WRITE
         """ The type of the simulation: distribution of the data, type of operation performed by the host.
             Currently fixed to "random uniform page write" as it is the only simulation available.
@@ -108,6 +153,32 @@ class Simulation(object):
         """ Randomly generated samples for every disk (as they may have different specs).
         """
 
+        self._trims = dict()
+        """ The indexes of the samples that are trims for every disk (see self.sim_trim_ratio), in ascending order.
+        """
+
+        self._reads = dict()
+        """ The indexes of the samples that are reads for every disk (see self.sim_read_ratio), in ascending order.
+        """
+
+        self._read_pages = dict()
+        """ For every disk with skewed reads, the logical page of every popularity rank (see self.sim_read_skew).
+        """
+
+        self._arrivals = dict()
+        """ The arrival time of every sample of every disk [microseconds], only with an arrival rate (see
+            self.sim_arrival_rate).
+        """
+
+        self._preconditions = dict()
+        """ The precondition recipe of every disk (None if the disk starts empty).
+        """
+
+        self._extra_stats = dict()
+        """ The names of the extra counters of every disk (see BaseNANDDisk.get_extra_stats) and of the values
+            derived from them (see compute_derived_stats): a tuple (counters, derived).
+        """
+
         self._drift_attempts = 3
         """ TO be used to handle retries.
         """
@@ -116,6 +187,10 @@ class Simulation(object):
         """ TO be used to handle retries.
         """
 
+        self._samples_attempts = dict()
+        """ TO be used to handle retries: the attempts left to the current step (see execute_simulation_steps).
+        """
+
         self.stats = dict()
         """ Store the statistics for each disk. Each disk has a dictionary of variables (es: iops, time, page written).
             Then every variable has a numpy array of the extracted data.
@@ -172,18 +247,26 @@ class Simulation(object):
         self.init_ok = True
 
     @check_init
-    def add_disk(self, name, disk):
+    def add_disk(self, name, disk, precondition=None):
         """
 
+        :param precondition: an optional dictionary with the parameters of disk.precondition (see
+                             BaseNANDDisk.precondition), ie: {'valid': 1, 'overwrites': 100000}.
+                             The disk is preconditioned at the beginning of the run, so the measures start near
+                             the steady state.
         :return:
         """
+        if self.sim_arrival_rate is not None and disk.queue_depth is None:
+            raise ValueError("An arrival rate needs a disk with a host queue.")
+
         self._disks[name] = disk
+        self._preconditions[name] = precondition
         self.stats[name] = {'samples': 1,  # integer (starts from 1 as there is the first empty row)
                             'extra': None,  # for internal use only
                             'time': np.array([0]),  # microseconds
-                            'iops': np.array([0]),
-                            'bandwidth': np.array([0]),  # MiB/s
-                            'amplification': np.array([0]),
+                            'iops': np.array([0]),  # computed by output_stats
+                            'bandwidth': np.array([0]),  # MiB/s, computed by output_stats
+                            'amplification': np.array([0]),  # computed by output_stats
                             'host_write': np.array([0]),  # pages
                             'host_read': np.array([0]),  # pages
                             'disk_write': np.array([0]),  # pages
@@ -192,6 +275,68 @@ class Simulation(object):
                             'failures': np.array([0]),  # pages
                             'dirty': np.array([0])}  # pages
 
+        # the extra counters of the write policy and of the garbage collector, ie: the streams statistics
+        # for every couple of counters <prefix>_host_write and <prefix>_disk_write the <prefix>_amplification is
+        # computed by output_stats, the same for the latency_mean of the couple requests and latency_sum and for the
+        # cache_hit_rate (a percentage) of the couple cache_hit and cache_miss
+        counters = [n for n, v in disk.get_extra_stats()]
+        derived = [n[:-len('host_write')] + 'amplification' for n in counters
+                   if n.endswith('_host_write') and n[:-len('host_write')] + 'disk_write' in counters]
+        if 'requests' in counters and 'latency_sum' in counters:
+            derived.append('latency_mean')
+        if 'cache_hit' in counters and 'cache_miss' in counters:
+            derived.append('cache_hit_rate')
+        self._extra_stats[name] = (counters, derived)
+        for n in counters + derived:
+            self.stats[name][n] = np.array([0])
+
+        # the pages discarded by the host, only if the workload has trims
+        if self.sim_trim_ratio > 0:
+            self.stats[name]['host_trim'] = np.array([0])  # pages
+
+    @check_init
+    def compute_derived_stats(self, name):
+        """
+        Compute the iops, bandwidth and amplification columns of a disk from the raw counters.
+        The first row is the initial empty row, so it's left to zero.
+
+        :param name: the disk name.
+        :return:
+        """
+        stats = self.stats[name]
+        page_size = self._disks[name].page_size
+        iops = [0]
+        bandwidth = [0]
+        amplification = [0]
+        for i in range(1, stats['samples']):
+            time = int(stats['time'][i])
+            host_write = int(stats['host_write'][i])
+            disk_write = int(stats['disk_write'][i])
+            iops.append(qz(compute_iops(disk_write + int(stats['disk_read'][i]), time)))
+            bandwidth.append(qd(compute_bandwidth(host_write + int(stats['host_read'][i]), time, page_size)))
+            amplification.append(qd(compute_write_amplification(disk_write, host_write)))
+
+        stats['iops'] = np.array(iops)
+        stats['bandwidth'] = np.array(bandwidth)
+        stats['amplification'] = np.array(amplification)
+
+        # the amplification of the extra counters, the mean latency and the read cache hit rate
+        for n in self._extra_stats[name][1]:
+            if n == 'latency_mean':
+                stats[n] = np.array([0] + [qd(compute_mean(int(stats['latency_sum'][i]), int(stats['requests'][i])))
+                                           for i in range(1, stats['samples'])])
+                continue
+            if n == 'cache_hit_rate':
+                stats[n] = np.array([0] + [qd(compute_mean(int(stats['cache_hit'][i]) * 100,
+                                                           int(stats['cache_hit'][i]) + int(stats['cache_miss'][i])))
+                                           for i in range(1, stats['samples'])])
+                continue
+
+            prefix = n[:-len('amplification')]
+            stats[n] = np.array([0] + [qd(compute_write_amplification(int(stats[prefix + 'disk_write'][i]),
+                                                                       int(stats[prefix + 'host_write'][i])))
+                                       for i in range(1, stats['samples'])])
+
     @check_init
     def output_stats(self):
         """
@@ -200,14 +345,25 @@ class Simulation(object):
         """
         # every disk has its own stats
         for d in self._disks:
+            # compute the derived stats from the raw counters
+            self.compute_derived_stats(d)
+
             # create the file path
             fp = self.sim_path.joinpath("raw_data_{}.csv".format(d))
 
+            # the extra columns, only if the disk has extra counters
+            extra = self._extra_stats[d][0] + self._extra_stats[d][1]
+            if self.sim_trim_ratio > 0:
+                extra = ['host_trim'] + extra
+
             # disk information
             with fp.open('wt') as f:
                 # first line
                 f.write("time,iops,bandwidth,amplification,host_write,host_read,disk_write,disk_read,"
-                        "block_erased,failures,dirty\n")
+                        "block_erased,failures,dirty")
+                for s in extra:
+                    f.write(",{}".format(s))
+                f.write("\n")
 
                 # data
                 for i in range(0, self.stats[d]['samples']):
@@ -217,11 +373,54 @@ class Simulation(object):
                         f.write("{},".format(self.stats[d][s][i]))
 
                     # last column
-                    f.write('{}\n'.format(self.stats[d]['dirty'][i]))
+                    f.write('{}'.format(self.stats[d]['dirty'][i]))
+                    for s in extra:
+                        f.write(",{}".format(self.stats[d][s][i]))
+                    f.write("\n")
 
             # status
             print("Updated file '{}'".format(fp))
 
+    @check_init
+    def output_queue_stats(self):
+        """
+        Output the throughput and the latency of the host requests of every disk with a host queue, one row per
+        disk (see ComponentHostQueue): the throughput against the queue depth. Call it after output_stats.
+
+        :return:
+        """
+        disks = [d for d in self._disks if self._disks[d].queue_depth is not None]
+        if not disks:
+            return
+
+        # create the file path
+        fp = self.sim_path.joinpath("queue_depth.csv")
+        percentiles = ['write_{}'.format(n) for n, p in LATENCY_PERCENTILES]
+
+        with fp.open('wt') as f:
+            f.write("disk,queue_depth,arrival_rate,time,requests,iops,bandwidth,latency_mean,latency_max")
+            for s in percentiles:
+                f.write(",{}".format(s))
+            f.write("\n")
+
+            for d in disks:
+                # the values at the end of the run
+                stats = self.stats[d]
+                time = int(stats['time'][-1])
+                requests = int(stats['requests'][-1])
+                host_pages = int(stats['host_write'][-1]) + int(stats['host_read'][-1])
+                f.write("{},{},{},{},{},{},{},{},{}".format(
+                    d, self._disks[d].queue_depth, self.sim_arrival_rate, time, requests,
+                    qz(compute_iops(requests, time)),
+                    qd(compute_bandwidth(host_pages, time, self._disks[d].page_size)),
+                    stats['latency_mean'][-1], stats['latency_max'][-1]))
+                for s in percentiles:
+                    f.write(",{}".format(stats[s][-1] if s in stats else ''))
+                f.write("\n")
+
+        # status
+        print("Updated file '{}'".format(fp))
+
     @check_init
     def output_disks(self, extra=""):
         """
@@ -251,9 +450,18 @@ class Simulation(object):
             try_again = True
 
             while try_again and attempts > 0:
+                # the trims and the reads before the write
+                self.execute_host_operations(d)
+                if self._samples_drift[d] >= len(self._samples[d][0]):
+                    # every sample is used (too many retries, trims or reads)
+                    self.generate_samples(d, self.sim_sample_size)
+                    continue
+
                 # execute
+                arrival = int(self._arrivals[d][self._samples_drift[d]]) if d in self._arrivals else None
                 res, status = self._disks[d].host_write_page(block=self._samples[d][0][self._samples_drift[d]],
-                                                             page=self._samples[d][1][self._samples_drift[d]])
+                                                             page=self._samples[d][1][self._samples_drift[d]],
+                                                             arrival=arrival)
 
                 # ok, increase the index
                 self._samples_drift[d] += 1
@@ -267,27 +475,170 @@ class Simulation(object):
                     try_again = False
 
     @check_init
-    def extract_and_store_stats(self, current_index):
+    def execute_simulation_steps(self, disk, steps, stop_time=None):
+        """
+        Execute a chunk of simulation steps on a single disk in batches (see BaseNANDDisk.host_write_pages).
+
+        :param disk: the disk name.
+        :param steps: the maximum number of steps to execute.
+        :param stop_time: if not None, stop at the end of the first step that reaches this disk elapsed time.
+        :return: the number of steps executed.
+        """
+        executed = 0
+        while executed < steps:
+            # every step needs at least one sample, a batch of writes ends with the next trim or read
+            self.execute_host_operations(disk)
+            start = self._samples_drift[disk]
+            if start >= len(self._samples[disk][0]):
+                # every sample is used (too many retries, trims or reads)
+                self.generate_samples(disk, steps - executed)
+                continue
+            end = start + steps - executed
+            for operations in (self._trims[disk], self._reads[disk]):
+                if operations.size > 0:
+                    following = np.searchsorted(operations, start)
+                    if following < operations.size:
+                        end = min(end, int(operations[following]))
+            arrivals = self._arrivals[disk][start:end] if disk in self._arrivals else None
+            codes, delta = self._disks[disk].host_write_pages(self._samples[disk][0][start:end],
+                                                              self._samples[disk][1][start:end],
+                                                              stop_time=stop_time, arrivals=arrivals)
+
+            # follow the steps
+            for c in codes.tolist():
+                # ok, increase the index
+                self._samples_drift[disk] += 1
+
+                # decrease the attempts
+                self._samples_attempts[disk] -= 1
+
+                # is a dirty write? retry, if we still have attempts!
+                if c != OPERATION_FAILED_DIRTY_CODE or self._samples_attempts[disk] <= 0:
+                    # step completed
+                    executed += 1
+                    self._samples_attempts[disk] = self._drift_attempts
+
+            # time to stop? (only at the end of a step)
+            if stop_time is not None and self._samples_attempts[disk] == self._drift_attempts and \
+                    self._disks[disk].elapsed_time() >= stop_time:
+                break
+
+        return executed
+
+    @check_init
+    def execute_host_operations(self, disk):
+        """
+        Execute the trims and the reads of the current samples of a disk, until the next write (see
+        self.sim_trim_ratio and self.sim_read_ratio).
+
+        :param disk: the disk name.
+        :return: the number of operations executed.
+        """
+        trims = self._trims[disk]
+        reads = self._reads[disk]
+        executed = 0
+        trim_index = int(np.searchsorted(trims, self._samples_drift[disk]))
+        read_index = int(np.searchsorted(reads, self._samples_drift[disk]))
+        while True:
+            i = self._samples_drift[disk]
+            if trim_index < trims.size and trims[trim_index] == i:
+                # the range starts from the page of the sample
+                start = int(self._samples[disk][0][i]) * self._disks[disk].pages_per_block + \
+                    int(self._samples[disk][1][i])
+                self._disks[disk].host_trim_range(start=start, count=self.sim_trim_size)
+                trim_index += 1
+            elif read_index < reads.size and reads[read_index] == i:
+                # a read of a page never written (or trimmed) fails, it's not retried
+                self._disks[disk].host_read_page(block=int(self._samples[disk][0][i]),
+                                                 page=int(self._samples[disk][1][i]),
+                                                 arrival=int(self._arrivals[disk][i]) if disk in self._arrivals
+                                                 else None)
+                read_index += 1
+            else:
+                return executed
+
+            # the operation is not a step
+            self._samples_drift[disk] += 1
+            executed += 1
+
+    @check_init
+    def run_disk(self, disk, progress=None):
         """
+        Execute the whole simulation on a single disk, gathering the statistics.
+        The results are the same of calling execute_one_simulation_step and extract_and_store_stats for every index.
 
+        :param disk: the disk name.
+        :param progress: an optional function called with the number of steps executed after every chunk.
         :return:
         """
-        def store_stat_disk(disk):
-            # FOR INTERNAL USE ONLY
-            stats = self._disks[disk].get_stats()
-            self.stats[disk]['samples'] += 1
-            self.stats[disk]['time'] = np.append(self.stats[disk]['time'], [stats[0]])
-            self.stats[disk]['iops'] = np.append(self.stats[disk]['iops'], [stats[1]])
-            self.stats[disk]['bandwidth'] = np.append(self.stats[disk]['bandwidth'], [stats[2]])
-            self.stats[disk]['amplification'] = np.append(self.stats[disk]['amplification'], [stats[3]])
-            self.stats[disk]['host_write'] = np.append(self.stats[disk]['host_write'], [stats[4]])
-            self.stats[disk]['host_read'] = np.append(self.stats[disk]['host_read'], [stats[5]])
-            self.stats[disk]['disk_write'] = np.append(self.stats[disk]['disk_write'], [stats[6]])
-            self.stats[disk]['disk_read'] = np.append(self.stats[disk]['disk_read'], [stats[7]])
-            self.stats[disk]['block_erased'] = np.append(self.stats[disk]['block_erased'], [stats[8]])
-            self.stats[disk]['failures'] = np.append(self.stats[disk]['failures'], [stats[9]])
-            self.stats[disk]['dirty'] = np.append(self.stats[disk]['dirty'], [stats[10]])
+        if self.sim_sampling_type == SIM_SAMPLING_HOST_WRITE:
+            # the statistics are stored after the step with index i, for every i > 0 multiple of self.sim_sampling
+            done = 0
+            for i in range(self.sim_sampling, self.sim_sample_size, self.sim_sampling):
+                done += self.execute_simulation_steps(disk, i + 1 - done)
+                self.store_disk_stats(disk)
+                if progress is not None:
+                    progress(done)
+
+            # the remaining steps
+            done += self.execute_simulation_steps(disk, self.sim_sample_size - done)
+            if progress is not None:
+                progress(done)
+
+            # final statistics
+            self.store_disk_stats(disk)
 
+        elif self.sim_sampling_type == SIM_SAMPLING_ELAPSED_TIME:
+            # the statistics are stored as soon as enough simulation time is elapsed from the last sample
+            done = 0
+            while done < self.sim_sample_size:
+                done += self.execute_simulation_steps(disk, self.sim_sample_size - done,
+                                                      self.stats[disk]['extra'] + self.sim_sampling)
+                sim_time = self._disks[disk].elapsed_time()
+                if sim_time - self.stats[disk]['extra'] >= self.sim_sampling:
+                    self.store_disk_stats(disk)
+                    self.stats[disk]['extra'] = sim_time
+                if progress is not None:
+                    progress(done)
+
+            # final statistics
+            sim_time = self._disks[disk].elapsed_time()
+            if sim_time - self.stats[disk]['extra'] > 0 or sim_time - self.stats[disk]['extra'] >= self.sim_sampling:
+                self.store_disk_stats(disk)
+                self.stats[disk]['extra'] = sim_time
+
+    @check_init
+    def store_disk_stats(self, disk):
+        """
+        Sample the statistics of a disk.
+
+        :param disk: the disk name.
+        :return:
+        """
+        # only the raw integer counters are collected here, the derived values
+        # (iops, bandwidth, amplification) are computed by output_stats
+        stats = self._disks[disk].get_stats()
+        self.stats[disk]['samples'] += 1
+        self.stats[disk]['time'] = np.append(self.stats[disk]['time'], [stats[0]])
+        self.stats[disk]['host_write'] = np.append(self.stats[disk]['host_write'], [stats[1]])
+        self.stats[disk]['host_read'] = np.append(self.stats[disk]['host_read'], [stats[2]])
+        self.stats[disk]['disk_write'] = np.append(self.stats[disk]['disk_write'], [stats[3]])
+        self.stats[disk]['disk_read'] = np.append(self.stats[disk]['disk_read'], [stats[4]])
+        self.stats[disk]['block_erased'] = np.append(self.stats[disk]['block_erased'], [stats[5]])
+        self.stats[disk]['failures'] = np.append(self.stats[disk]['failures'], [stats[6]])
+        self.stats[disk]['dirty'] = np.append(self.stats[disk]['dirty'], [stats[7]])
+        for n, value in zip(self._extra_stats[disk][0], stats[8:]):
+            self.stats[disk][n] = np.append(self.stats[disk][n], [value])
+        if self.sim_trim_ratio > 0:
+            self.stats[disk]['host_trim'] = np.append(self.stats[disk]['host_trim'],
+                                                      [self._disks[disk].number_of_trimmed_pages()])
+
+    @check_init
+    def extract_and_store_stats(self, current_index):
+        """
+
+        :return:
+        """
         # depending on the sampling type we need to perform different checks
         if self.sim_sampling_type == SIM_SAMPLING_HOST_WRITE:
             # for SIM_SAMPLING_HOST_WRITE is just a matter of current_index
@@ -295,7 +646,7 @@ class Simulation(object):
                     (current_index > 0 and current_index % self.sim_sampling == 0):
                 # for every disk read the data and store it in internal array for further SciPy manipulation
                 for d in self._disks:
-                    store_stat_disk(d)
+                    self.store_disk_stats(d)
 
                 return True
         elif self.sim_sampling_type == SIM_SAMPLING_ELAPSED_TIME:
@@ -310,7 +661,7 @@ class Simulation(object):
                 if (current_index >= self.sim_sample_size and sim_time - self.stats[d]['extra'] > 0)\
                         or sim_time - self.stats[d]['extra'] >= self.sim_sampling:
                     # get the stats
-                    store_stat_disk(d)
+                    self.store_disk_stats(d)
 
                     # save the new time
                     self.stats[d]['extra'] = sim_time
@@ -318,12 +669,74 @@ class Simulation(object):
 
         return False
 
+    def generate_samples(self, disk, writes):
+        """
+        Generate the random samples of a disk, appended to the current ones.
+
+        :param disk: the disk name.
+        :param writes: the number of writes (steps) to be covered.
+        :return:
+        """
+        d = self._disks[disk]
+        size = writes * self._drift_attempts
+        if self.sim_trim_ratio > 0 or self.sim_read_ratio > 0:
+            size = int(size / (1 - self.sim_trim_ratio - self.sim_read_ratio)) + 1
+        blocks = randint.rvs(0, d.host_blocks, size=size)
+        pages = randint.rvs(0, d.pages_per_block, size=size)
+
+        # the samples that are trims (the lowest draws) and reads
+        if self.sim_trim_ratio > 0 or self.sim_read_ratio > 0:
+            draws = np.random.random_sample(size)
+            trims = np.flatnonzero(draws < float(self.sim_trim_ratio))
+            reads = np.flatnonzero((draws >= float(self.sim_trim_ratio)) &
+                                   (draws < float(self.sim_trim_ratio + self.sim_read_ratio)))
+        else:
+            trims = np.empty(0, dtype=np.int64)
+            reads = np.empty(0, dtype=np.int64)
+
+        # the skewed reads: the popularity rank of every read is mapped to a page
+        if reads.size > 0 and self.sim_read_skew is not None:
+            host_pages = d.host_blocks * d.pages_per_block
+            ranks = (zipf.rvs(self.sim_read_skew, size=reads.size) - 1) % host_pages
+            if disk not in self._read_pages:
+                self._read_pages[disk] = np.random.permutation(host_pages)
+            lpn = self._read_pages[disk][ranks]
+            blocks[reads] = lpn // d.pages_per_block
+            pages[reads] = lpn % d.pages_per_block
+
+        # the arrival times: the exponential inter-arrival times of a Poisson process, from the last arrival
+        if self.sim_arrival_rate is not None:
+            first = int(self._arrivals[disk][-1]) if disk in self._arrivals else d.elapsed_time()
+            gaps = np.random.exponential(10 ** 6 / self.sim_arrival_rate, size=size)
+            arrivals = first + np.cumsum(gaps).astype(np.int64)
+            self._arrivals[disk] = arrivals if disk not in self._arrivals else \
+                np.concatenate((self._arrivals[disk], arrivals))
+
+        if disk not in self._samples:
+            self._samples[disk] = (blocks, pages)
+            self._trims[disk] = trims
+            self._reads[disk] = reads
+        else:
+            offset = len(self._samples[disk][0])
+            self._samples[disk] = (np.concatenate((self._samples[disk][0], blocks)),
+                                   np.concatenate((self._samples[disk][1], pages)))
+            self._trims[disk] = np.concatenate((self._trims[disk], trims + offset))
+            self._reads[disk] = np.concatenate((self._reads[disk], reads + offset))
+
     @check_init
     def run(self):
         """
 
         :return:
         """
+        # precondition the disks
+        for d in self._disks:
+            if self._preconditions[d] is not None:
+                print("Preconditioning '{}' ... ".format(d), end="", flush=True)
+                self._disks[d].precondition(**self._preconditions[d])
+                print(Fore.GREEN + "OK")
+                print(Style.RESET_ALL, end="")
+
         # output the disks information
         self.output_disks("_setup")
 
@@ -334,18 +747,15 @@ class Simulation(object):
 
         for d in self._disks:
             # as we have only one type of simulation we don't need any fancy code here
-            # just plain random data generation.
-            # every disk has a tuple where
-            #   the first element is the block index samples
-            #   the second element is the page index samples
-            # we generate a double amount of samples as we retry one time each first attempt in case of failures
-            self._samples[d] = (randint.rvs(0, self._disks[d].total_blocks,
-                                            size=self.sim_sample_size * self._drift_attempts),
-                                randint.rvs(0, self._disks[d].pages_per_block,
-                                            size=self.sim_sample_size * self._drift_attempts))
+            # just plain random data generation (new samples for every run).
+            self._samples.pop(d, None)
+            self._read_pages.pop(d, None)
+            self._arrivals.pop(d, None)
+            self.generate_samples(d, self.sim_sample_size)
 
             # set the initial drift to zero
             self._samples_drift[d] = 0
+            self._samples_attempts[d] = self._drift_attempts
 
             # in case of SIM_SAMPLING_ELAPSED_TIME we need to remember the last time we gathered the stats
             if self.sim_sampling_type == SIM_SAMPLING_ELAPSED_TIME:
@@ -355,32 +765,24 @@ class Simulation(object):
         print(Style.RESET_ALL, end="")
 
         # run the simulation and gather statistics
-        quantum_progress = int((1 * self.sim_sample_size) / 100)  # for the progress indicator
-        if quantum_progress <= 0:
-            quantum_progress = 1
-
+        # every disk is independent: the whole simulation is executed one disk at a time, in chunks
         print("RUNNING ... ", end="", flush=True)
         start_time = datetime.now()
-        for i in range(0, self.sim_sample_size):
-            # progress
-            if i % quantum_progress == 0:
+        total_steps = self.sim_sample_size * len(self._disks)
+        for n, d in enumerate(self._disks):
+            def progress(done):
+                # progress
                 elapsed_time = datetime.now() - start_time
-                print('\rRUNNING ... {} % \t Elapsed: {}'.format(qd(Decimal(i * 100 / self.sim_sample_size)),
-                                                                 elapsed_time),
-                      end="", flush=True)
+                print('\rRUNNING ... {} % \t Elapsed: {}'.format(
+                    qd(Decimal((n * self.sim_sample_size + done) * 100 / total_steps)), elapsed_time),
+                    end="", flush=True)
 
-            # execution
-            self.execute_one_simulation_step(i)
-
-            # extract statistics (if needed)
-            self.extract_and_store_stats(i)
+            # execution and statistics
+            self.run_disk(d, progress)
 
         # compute the total execution time
         final_elapsed_time = datetime.now() - start_time
 
-        # extract final statistics
-        self.extract_and_store_stats(self.sim_sample_size)
-
         print('\rRUNNING ... ', end="", flush=True)
         print(Fore.GREEN + "DONE", flush=True)
         print(Style.RESET_ALL, end="")
@@ -398,3 +800,4 @@ class Simulation(object):
 
         # output the stats
         self.output_stats()
+        self.output_queue_stats()
@@ -0,0 +1,106 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+The save/load and checkpoint round-trips: a restored disk goes on exactly as the original one.
+"""
+
+# IMPORTS
+import numpy as np
+import pytest
+from simulator.NAND.NANDFactory import get_instance, WRITEPOLICY_DEFAULT, WRITEPOLICY_MULTISTREAM, \
+    GARBAGECOLLECTOR_SIMPLE, GARBAGECOLLECTOR_COSTBENEFIT, GARBAGECOLLECTOR_WATERMARK
+from simulator.NAND.common import WEARLEVELING_STATIC
+
+
+# the disk configurations: (writepolicy, garbagecollector, parameters)
+CONFIGURATIONS = [
+    (WRITEPOLICY_DEFAULT, GARBAGECOLLECTOR_SIMPLE, {'gc_params': {'mintime': 0, 'dirtiness': '0.3'}}),
+    (WRITEPOLICY_DEFAULT, GARBAGECOLLECTOR_COSTBENEFIT,
+     {'over_provisioning': '0.25', 'gc_params': {'mintime': 0, 'dirtiness': '0.3', 'victims': 2}}),
+    (WRITEPOLICY_MULTISTREAM, GARBAGECOLLECTOR_WATERMARK,
+     {'over_provisioning': '0.25', 'wear_leveling': WEARLEVELING_STATIC, 'wear_leveling_threshold': 4,
+      'gc_params': {'low': 2, 'high': 4, 'interval': 5000, 'dirtiness': '0.3'}}),
+]
+
+
+# FUNCTIONS
+def new_disk(writepolicy, garbagecollector, params, ftl_path=None):
+    """
+
+    :return: a small disk.
+    """
+    return get_instance(writepolicy, garbagecollector, total_blocks=32, pages_per_block=16, ftl_path=ftl_path,
+                        **params)
+
+
+def run_writes(disk, seed, count):
+    """
+    Execute random host writes.
+
+    :return:
+    """
+    rng = np.random.RandomState(seed)
+    disk.host_write_pages(rng.randint(0, disk.host_blocks, count), rng.randint(0, disk.pages_per_block, count))
+
+
+def assert_same_disk(disk, reference):
+    """
+
+    :return:
+    """
+    assert disk.get_stats() == reference.get_stats()
+    for name, array in reference._ftl.get_arrays().items():
+        assert (disk._ftl.get_arrays()[name] == array).all()
+
+
+# TESTS
+@pytest.mark.parametrize('writepolicy, garbagecollector, params', CONFIGURATIONS)
+def test_save_load(tmp_path, writepolicy, garbagecollector, params):
+    disk = new_disk(writepolicy, garbagecollector, params)
+    run_writes(disk, 1, 3000)
+    disk.save_state(tmp_path / 'state')
+
+    restored = new_disk(writepolicy, garbagecollector, params)
+    restored.load_state(tmp_path / 'state')
+    assert_same_disk(restored, disk)
+
+    # the restored disk makes the same choices
+    run_writes(disk, 2, 3000)
+    run_writes(restored, 2, 3000)
+    assert_same_disk(restored, disk)
+
+
+def test_load_other_geometry(tmp_path):
+    disk = new_disk(WRITEPOLICY_DEFAULT, GARBAGECOLLECTOR_SIMPLE, {})
+    disk.save_state(tmp_path / 'state')
+
+    other = get_instance(WRITEPOLICY_DEFAULT, GARBAGECOLLECTOR_SIMPLE, total_blocks=64, pages_per_block=16)
+    with pytest.raises(ValueError):
+        other.load_state(tmp_path / 'state')
+
+
+@pytest.mark.parametrize('writepolicy, garbagecollector, params', CONFIGURATIONS)
+def test_checkpoint(tmp_path, writepolicy, garbagecollector, params):
+    reference = new_disk(writepolicy, garbagecollector, params)
+    run_writes(reference, 1, 3000)
+
+    disk = new_disk(writepolicy, garbagecollector, params, ftl_path=tmp_path)
+    run_writes(disk, 1, 3000)
+    disk.checkpoint()
+    del disk
+
+    # a disk on the same directory restarts from the checkpoint
+    restored = new_disk(writepolicy, garbagecollector, params, ftl_path=tmp_path)
+    assert_same_disk(restored, reference)
+
+    run_writes(reference, 2, 3000)
+    run_writes(restored, 2, 3000)
+    assert_same_disk(restored, reference)
+
+
+def test_checkpoint_without_mapping():
+    disk = new_disk(WRITEPOLICY_DEFAULT, GARBAGECOLLECTOR_SIMPLE, {})
+    with pytest.raises(ValueError):
+        disk.checkpoint()
@@ -0,0 +1,194 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+The array based FTL (see FTLState) against the original dict of dicts FTL on random operations.
+"""
+
+# IMPORTS
+from random import Random
+import pytest
+from simulator.NAND.FTLState import FTLState
+from simulator.NAND.NANDFactory import get_instance, WRITEPOLICY_DEFAULT, WRITEPOLICY_LOGSTRUCTURED, \
+    GARBAGECOLLECTOR_SIMPLE, GARBAGECOLLECTOR_GREEDY
+from simulator.NAND.common import PAGE_EMPTY, PAGE_IN_USE, PAGE_DIRTY, PAGE_STATUS_TO_CODE
+
+
+# DictFTL class
+class DictFTL(object):
+    """
+    The FTL of the baseline BaseNANDDisk: a dict of blocks, every block a dict of page statuses plus the empty and
+    dirty counters.
+    """
+
+    def __init__(self, total_blocks, pages_per_block):
+        self.pages_per_block = pages_per_block
+        self.ftl = dict()
+        for b in range(0, total_blocks):
+            self.ftl[b] = dict()
+            for p in range(0, pages_per_block):
+                self.ftl[b][p] = PAGE_EMPTY
+            self.ftl[b]['empty'] = pages_per_block
+            self.ftl[b]['dirty'] = 0
+
+    def program_page(self, block, page):
+        self.ftl[block][page] = PAGE_IN_USE
+        self.ftl[block]['empty'] -= 1
+
+    def invalidate_page(self, block, page):
+        self.ftl[block][page] = PAGE_DIRTY
+        self.ftl[block]['dirty'] += 1
+
+    def erase_block(self, block):
+        for p in range(0, self.pages_per_block):
+            self.ftl[block][p] = PAGE_EMPTY
+        self.ftl[block]['empty'] = self.pages_per_block
+        self.ftl[block]['dirty'] = 0
+
+    def find_empty_page(self, block):
+        for p in range(0, self.pages_per_block):
+            if self.ftl[block][p] == PAGE_EMPTY:
+                return p
+        return -1
+
+    def find_empty_block(self):
+        for b in self.ftl:
+            if self.ftl[b]['empty'] == self.pages_per_block:
+                return b
+        return -1
+
+    def find_block_with_empty_pages(self):
+        for b in self.ftl:
+            if self.ftl[b]['empty'] > 0:
+                return b
+        return -1
+
+    def pages_with_status(self, status):
+        return [(b, p) for b in self.ftl for p in range(0, self.pages_per_block) if self.ftl[b][p] == status]
+
+
+# FUNCTIONS
+def assert_same_state(ftl, reference):
+    """
+
+    :param ftl: the FTLState.
+    :param reference: the DictFTL.
+    :return:
+    """
+    for b, block in reference.ftl.items():
+        for p in range(0, reference.pages_per_block):
+            assert ftl.get_page(b, p) == PAGE_STATUS_TO_CODE[block[p]]
+            assert ftl[b][p] == block[p]
+        assert ftl[b]['empty'] == block['empty']
+        assert ftl[b]['dirty'] == block['dirty']
+        assert ftl.find_empty_page(b) == reference.find_empty_page(b)
+
+    assert ftl.number_of_empty_pages() == sum(block['empty'] for block in reference.ftl.values())
+    assert ftl.number_of_dirty_pages() == sum(block['dirty'] for block in reference.ftl.values())
+    assert ftl.find_empty_block() == reference.find_empty_block()
+    assert ftl.find_block_with_empty_pages() == reference.find_block_with_empty_pages()
+
+
+# TESTS
+@pytest.mark.parametrize('pages_per_block', [16, 64, 200])
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_random_operations(pages_per_block, seed):
+    rng = Random(seed)
+    ftl = FTLState(12, pages_per_block)
+    reference = DictFTL(12, pages_per_block)
+    ftl.enable_dirty_buckets()
+
+    for step in range(1500):
+        op = rng.random()
+        if op < 0.6:
+            # program a random empty page (or the first one, as get_empty_page)
+            empty = reference.pages_with_status(PAGE_EMPTY)
+            if not empty:
+                continue
+            b, p = rng.choice(empty)
+            if rng.random() < 0.5:
+                p = reference.find_empty_page(b)
+            ftl.program_page(b, p)
+            reference.program_page(b, p)
+        elif op < 0.9:
+            in_use = reference.pages_with_status(PAGE_IN_USE)
+            if not in_use:
+                continue
+            b, p = rng.choice(in_use)
+            ftl.invalidate_page(b, p)
+            reference.invalidate_page(b, p)
+        else:
+            b = rng.randrange(12)
+            ftl.erase_block(b)
+            reference.erase_block(b)
+
+        if step % 100 == 0:
+            assert_same_state(ftl, reference)
+
+    assert_same_state(ftl, reference)
+
+
+def test_dict_interface():
+    ftl = FTLState(4, 8)
+    reference = DictFTL(4, 8)
+
+    # the legacy accessors of the mixins: a page status and the counters are set separately
+    for target in (ftl, reference.ftl):
+        target[1][3] = PAGE_IN_USE
+        target[1]['empty'] = 7
+        target[1][3] = PAGE_DIRTY
+        target[1]['dirty'] = 1
+        target[2][0] = PAGE_IN_USE
+        target[2]['empty'] = 7
+
+    assert_same_state(ftl, reference)
+
+
+def test_rebuild_indexes():
+    rng = Random(7)
+    ftl = FTLState(10, 32)
+    for _ in range(200):
+        b, p = rng.randrange(10), rng.randrange(32)
+        if ftl.get_page(b, p) == PAGE_STATUS_TO_CODE[PAGE_EMPTY]:
+            ftl.program_page(b, p)
+            if rng.random() < 0.5:
+                ftl.invalidate_page(b, p)
+
+    arrays = {name: array.copy() for name, array in ftl.get_arrays().items()}
+    restored = FTLState(10, 32)
+    restored.pages[...] = arrays['pages']
+    restored.rebuild_indexes()
+
+    for name, array in arrays.items():
+        assert (restored.get_arrays()[name] == array).all()
+    assert restored.number_of_empty_pages() == ftl.number_of_empty_pages()
+    assert restored.number_of_dirty_pages() == ftl.number_of_dirty_pages()
+    for b in range(10):
+        assert restored.find_empty_page(b) == ftl.find_empty_page(b)
+    assert restored.find_empty_block() == ftl.find_empty_block()
+    assert restored.find_block_with_empty_pages() == ftl.find_block_with_empty_pages()
+
+
+@pytest.mark.parametrize('writepolicy, garbagecollector, over_provisioning', [
+    (WRITEPOLICY_DEFAULT, GARBAGECOLLECTOR_SIMPLE, None),
+    (WRITEPOLICY_LOGSTRUCTURED, GARBAGECOLLECTOR_GREEDY, None),
+    (WRITEPOLICY_DEFAULT, GARBAGECOLLECTOR_GREEDY, '0.25'),
+])
+def test_disk_counters(writepolicy, garbagecollector, over_provisioning):
+    rng = Random(11)
+    disk = get_instance(writepolicy, garbagecollector, total_blocks=16, pages_per_block=16,
+                        gc_params={'mintime': 0, 'dirtiness': '0.2'}, over_provisioning=over_provisioning)
+
+    for _ in range(3000):
+        disk.host_write_page(block=rng.randrange(disk.host_blocks), page=rng.randrange(16))
+
+    # the incremental counters match the page statuses
+    reference = DictFTL(16, 16)
+    reference.ftl = {b: {**{p: disk._ftl[b][p] for p in range(16)}, 'empty': 0, 'dirty': 0} for b in range(16)}
+    for block in reference.ftl.values():
+        block['empty'] = sum(1 for p in range(16) if block[p] == PAGE_EMPTY)
+        block['dirty'] = sum(1 for p in range(16) if block[p] == PAGE_DIRTY)
+    assert_same_state(disk._ftl, reference)
+    assert disk.number_of_empty_pages() + disk.number_of_dirty_pages() + disk.number_of_in_use_pages() == \
+        disk.total_pages
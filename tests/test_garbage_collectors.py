@@ -0,0 +1,112 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+The victims of the indexed garbage collectors against a full scan of the blocks.
+"""
+
+# IMPORTS
+from random import Random
+import pytest
+from simulator.NAND.NANDFactory import get_instance, WRITEPOLICY_DEFAULT, GARBAGECOLLECTOR_GREEDY, \
+    GARBAGECOLLECTOR_COSTBENEFIT, GARBAGECOLLECTOR_DCHOICES
+
+
+# FUNCTIONS
+def new_disk(garbagecollector, seed, full=False, gc_params=None):
+    """
+    A disk with random dirty pages, every block changed at a different time.
+
+    :param full: if True every page is written (all the blocks are closed).
+    :return:
+    """
+    rng = Random(seed)
+    disk = get_instance(WRITEPOLICY_DEFAULT, garbagecollector, total_blocks=24, pages_per_block=16,
+                        gc_params=gc_params)
+    ftl = disk._ftl
+    ftl.enable_dirty_buckets()
+
+    for _ in range(600):
+        disk._elapsed_time += rng.randrange(1, 100)
+        b = rng.randrange(disk.total_blocks)
+        p = ftl.find_empty_page(b)
+        if p >= 0 and (full or rng.random() < 0.7):
+            ftl.program_page(b, p)
+        else:
+            in_use = [p for p in range(disk.pages_per_block) if ftl.get_page(b, p) == 1]
+            if in_use:
+                ftl.invalidate_page(b, rng.choice(in_use))
+
+    if full:
+        for b in range(disk.total_blocks):
+            for p in range(disk.pages_per_block):
+                if ftl.get_page(b, p) == 0:
+                    disk._elapsed_time += 1
+                    ftl.program_page(b, p)
+
+    disk._elapsed_time += 1000
+    return disk
+
+
+# TESTS
+@pytest.mark.parametrize('seed', [1, 2, 3])
+@pytest.mark.parametrize('count, min_dirty', [(1, 1), (5, 1), (None, 1), (None, 6)])
+def test_greedy_victims(seed, count, min_dirty):
+    disk = new_disk(GARBAGECOLLECTOR_GREEDY, seed)
+    dirty = disk._ftl.dirty
+
+    # the dirtiest first, the least recently changed first among the same number of dirty pages
+    blocks = sorted((b for b in range(disk.total_blocks) if dirty[b] >= min_dirty),
+                    key=lambda b: (-dirty[b], disk._ftl.last_modified[b]))
+    assert disk.get_gc_victims(count=count, min_dirty=min_dirty) == blocks[:count]
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+@pytest.mark.parametrize('count, min_dirty', [(1, 1), (5, 1), (None, 6)])
+def test_cost_benefit_victims(seed, count, min_dirty):
+    disk = new_disk(GARBAGECOLLECTOR_COSTBENEFIT, seed, full=True)
+    scores = {b: disk.get_gc_score(block=b) for b in range(disk.total_blocks) if disk._ftl.dirty[b] >= min_dirty}
+
+    # with closed blocks the heads of the buckets are enough to find the best scores
+    victims = disk.get_gc_victims(count=count, min_dirty=min_dirty)
+    assert [scores[b] for b in victims] == sorted(scores.values(), reverse=True)[:count]
+    assert len(set(victims)) == len(victims)
+
+
+def test_cost_benefit_score():
+    disk = new_disk(GARBAGECOLLECTOR_COSTBENEFIT, 4, full=True)
+    ppb = disk.pages_per_block
+    for b in range(disk.total_blocks):
+        u = (ppb - int(disk._ftl.dirty[b])) / ppb
+        age = disk.elapsed_time() - int(disk._ftl.last_modified[b]) + 1
+        assert disk.get_gc_score(block=b) == pytest.approx((1 - u) * age / (1 + u))
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_dchoices_victims(seed):
+    gc_params = {'mintime': 0, 'dirtiness': '0.4', 'victims': 3, 'choices': 4, 'seed': seed}
+    disk = new_disk(GARBAGECOLLECTOR_DCHOICES, seed, gc_params=gc_params)
+    dirty = disk._ftl.dirty
+
+    victims = disk.get_gc_victims(count=3, min_dirty=2)
+    assert 0 < len(victims) <= 3
+    assert len(set(victims)) == len(victims)
+    assert all(dirty[b] >= 2 for b in victims)
+    assert [dirty[b] for b in victims] == sorted((dirty[b] for b in victims), reverse=True)
+
+    # the same seed gives the same victims
+    disk.gc_param_seed = seed
+    first = disk.get_gc_victims(count=3, min_dirty=2)
+    disk.gc_param_seed = seed
+    assert disk.get_gc_victims(count=3, min_dirty=2) == first
+
+
+def test_dchoices_many_choices():
+    gc_params = {'mintime': 0, 'dirtiness': '0.4', 'victims': 1, 'choices': 2000, 'seed': 5}
+    disk = new_disk(GARBAGECOLLECTOR_DCHOICES, 5, gc_params=gc_params)
+
+    # sampling every block, the victim is one of the dirtiest
+    victims = disk.get_gc_victims(count=1, min_dirty=1)
+    assert len(victims) == 1
+    assert disk._ftl.dirty[victims[0]] == disk._ftl.dirty.max()
@@ -0,0 +1,84 @@
+# This file is part of the WAF-Simulator by Nicholas Fiorentini (2015)
+# and is released under Creative Common Attribution 4.0 International (CC BY 4.0)
+# see README.txt or LICENSE.txt for details
+
+"""
+The percentiles of the latency histogram against the exact percentiles of the recorded values.
+"""
+
+# IMPORTS
+from decimal import Decimal, ROUND_CEILING
+import numpy as np
+import pytest
+from simulator.NAND.LatencyHistogram import LatencyHistogram, LATENCY_PERCENTILES
+from simulator.NAND.NANDFactory import get_instance, WRITEPOLICY_DEFAULT, GARBAGECOLLECTOR_NONE
+
+
+# FUNCTIONS
+def exact_percentile(values, percentile):
+    """
+
+    :return: the nearest-rank percentile of the values.
+    """
+    values = sorted(values)
+    rank = int((Decimal(percentile) * len(values) / 100).to_integral_value(rounding=ROUND_CEILING))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+# TESTS
+@pytest.mark.parametrize('precision', [3, 7])
+@pytest.mark.parametrize('seed', [1, 2])
+def test_percentiles(precision, seed):
+    rng = np.random.RandomState(seed)
+    values = np.concatenate((rng.randint(0, 100, 2000), rng.lognormal(8, 2, 5000).astype(np.int64))).tolist()
+    histogram = LatencyHistogram(precision)
+    for value in values:
+        histogram.record(value)
+
+    assert len(histogram) == len(values)
+    assert histogram.total == sum(values)
+    assert histogram.max == max(values)
+    for percentile in ('0', '1', '25', '50', '90', '99', '99.9', '99.99', '100'):
+        exact = exact_percentile(values, percentile)
+        value = histogram.percentile(percentile)
+        # the highest value of the bucket: never lower, with a bounded relative error
+        assert exact <= value <= histogram.max
+        assert value - exact <= exact / 2 ** precision
+        if exact < 2 << precision:
+            assert value == exact
+
+
+def test_empty_and_reset():
+    histogram = LatencyHistogram()
+    assert histogram.percentile('99') == 0
+
+    histogram.record(5)
+    histogram.record(10 ** 9)
+    assert histogram.percentile('50') == 5
+    assert histogram.percentile('100') == 10 ** 9
+
+    histogram.reset()
+    assert len(histogram) == 0
+    assert histogram.max == 0
+    assert histogram.percentile('50') == 0
+
+
+def test_invalid_precision():
+    with pytest.raises(ValueError):
+        LatencyHistogram(0)
+
+
+def test_disk_latency_stats():
+    disk = get_instance(WRITEPOLICY_DEFAULT, GARBAGECOLLECTOR_NONE, total_blocks=8, pages_per_block=16,
+                        latency_histograms=True)
+    for b in range(4):
+        for p in range(16):
+            disk.host_write_page(block=b, page=p)
+    disk.host_read_page(block=0, page=0)
+
+    # every write of an empty page and every read take a single flash operation
+    stats = dict(disk.get_latency_stats())
+    for name, _ in LATENCY_PERCENTILES:
+        assert stats['write_' + name] == disk.write_page_time
+        assert stats['read_' + name] == disk.read_page_time
+    assert stats['write_max'] == disk.write_page_time